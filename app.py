@@ -6,12 +6,34 @@ using a specialized agent pipeline.
 """
 import streamlit as st
 from core.research import ResearchAgent
+from core.llm import LLM
+from core.backends import LLMBackend, create_backend
+from core.run_cache import RunCache, run_key
+from core.run_result import RunResult, spill_idle, spill_settings_from_env
+from core.export import ExportCache, EXPORT_FORMATS, export_file_name, markdown_lines
+from core.history import RunHistory, history_from_env
+from core.watchlist import Watchlist, watchlist_from_env
+from core.render_cache import RenderCache
+from core.paper_index import PaperIndex, ALL_PLATFORMS
+from core.title_matcher import link_authors_to_insights
+from core.deadline import Deadline
+from core.tracing import Span, to_otlp
+from core.metrics import start_from_env as start_metrics_exporter
 import json
+import os
 from datetime import datetime
 import html
 import time
 import re
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
+
+# Wall-clock limit for one search + pipeline run; partial results are shown after it
+RUN_TIMEOUT_SECONDS = 240
+
+# Paper cards per page in the Papers tab
+PAPERS_PAGE_SIZES = [10, 25, 50]
+
+APP_CSS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "app.css")
 
 # MUST be first Streamlit command
 st.set_page_config(
@@ -21,709 +43,61 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Elegant Design
-st.markdown("""
-<style>
-@import url('https://fonts.googleapis.com/css2?family=Space+Grotesk:wght@400;500;600&display=swap');
-@import url('https://fonts.googleapis.com/icon?family=Material+Icons');
-:root { --p: #D94B2B; --bg: #FAF9F7; --bg2: #F3F1ED; --txt: #2C2B27; --hov: #EBE8E3; --brd: #E0DED9; }
-* { font-family: 'Space Grotesk', sans-serif !important; color: var(--txt); }
-.stApp { background: var(--bg) !important; }
-[data-testid="stSidebar"] { background: var(--bg2) !important; border-right: 1px solid var(--brd) !important; width: 300px !important; }
-h1, h2, h3 { font-weight: 600 !important; letter-spacing: -0.02em; }
-
-/* Hide Streamlit debug controls and header clutter */
-[data-testid="stToolbar"] { display: none !important; }
-div[data-testid="stDecoration"] { display: none !important; }
-#MainMenu { visibility: hidden !important; }
-footer { visibility: hidden !important; }
-.stDeployButton { display: none !important; }
-/* Hide Streamlit's hamburger menu and settings - but keep sidebar toggle functional */
-/* Only hide debug buttons, not the sidebar toggle */
-[data-testid="stHeader"] [data-testid="stToolbarActions"] { display: none !important; }
-[data-testid="stHeader"] button:not([data-testid*="sidebar"]) { display: none !important; }
-/* Ensure custom header is visible and properly spaced */
-.stApp > header {
-    display: none !important;
-}
-/* Main content area should start from top */
-[data-testid="stAppViewContainer"] {
-    padding-top: 0 !important;
-}
-
-/* Fix sidebar toggle button - hide text, show simple icon */
-/* Hide any text content in sidebar toggle buttons */
-button[data-testid="baseButton-header"] span,
-button[kind="header"] span {
-    font-size: 0 !important;
-    visibility: hidden !important;
-}
-/* Use Unicode hamburger menu icon instead of text */
-button[data-testid="baseButton-header"]::before,
-button[kind="header"]::before {
-    content: '☰' !important;
-    font-size: 24px !important;
-    display: inline-block !important;
-    line-height: 1 !important;
-    visibility: visible !important;
-}
-/* Ensure sidebar width is consistent */
-[data-testid="stSidebar"] {
-    min-width: 300px !important;
-    max-width: 300px !important;
-}
-/* Hide sidebar toggle button text that appears as "keyboard_double_arrow_left" */
-.css-1d391kg,
-.css-1lcbmhc,
-.css-1outpf7 {
-    display: none !important;
-}
-/* Style sidebar buttons consistently */
-[data-testid="stSidebar"] button {
-    border-radius: 8px !important;
-    transition: all 0.2s !important;
-}
-[data-testid="stSidebar"] button:hover {
-    background: var(--hov) !important;
-}
-button[kind="primary"] { background: var(--p) !important; border-radius: 10px !important; border: none !important; padding: 0.6rem 1.2rem !important; font-weight: 500 !important; transition: all 0.2s; }
-button[kind="primary"]:hover { background: #B63D23 !important; transform: scale(1.02); }
-div[data-testid="stMetric"] { border-radius: 12px !important; background: white !important; padding: 1rem !important; box-shadow: 0 1px 3px rgba(0,0,0,0.05) !important; transition: transform 0.2s; }
-div[data-testid="stMetric"]:hover { transform: translateY(-2px); background: var(--hov) !important; }
-.stTextInput > div > div > input { border-radius: 10px !important; border: 1px solid var(--brd) !important; }
-.stSlider > div > div > div { color: var(--p) !important; }
-div[data-testid="stAlert"] { border-radius: 10px !important; border-left: 4px solid var(--p) !important; }
-
-/* Enhanced insight cards */
-.insight-card {
-    background: white;
-    border: 2px solid #E0DED9;
-    border-radius: 16px;
-    padding: 1.5rem;
-    margin: 1rem 0;
-    box-shadow: 0 2px 8px rgba(0,0,0,0.08);
-}
-.insight-header {
-    font-size: 1.3em;
-    font-weight: 600;
-    color: #2C2B27;
-    margin-bottom: 1rem;
-    border-bottom: 2px solid #D94B2B;
-    padding-bottom: 0.5rem;
-}
-.insight-section {
-    margin: 1rem 0;
-    padding: 1rem;
-    background: #FAF9F7;
-    border-radius: 8px;
-}
-.insight-section-title {
-    font-weight: 600;
-    color: #D94B2B;
-    margin-bottom: 0.5rem;
-    text-transform: uppercase;
-    font-size: 0.85em;
-    letter-spacing: 0.5px;
-}
-.timeline-item {
-    padding: 1rem;
-    margin: 0.5rem 0;
-    background: white;
-    border-left: 4px solid #D94B2B;
-    border-radius: 8px;
-    box-shadow: 0 1px 3px rgba(0,0,0,0.05);
-}
-
-/* Paper card styles (AiResearcher style) */
-.paper-card-ar {
-    background: white;
-    border: 1px solid var(--brd);
-    border-radius: 12px;
-    padding: 1.2rem;
-    margin: 0.8rem 0;
-    box-shadow: 0 1px 3px rgba(0,0,0,0.05);
-    font-family: 'Space Grotesk', sans-serif;
-}
-
-.paper-badge-ar {
-    display: inline-block;
-    padding: 0.2rem 0.6rem;
-    border-radius: 6px;
-    font-size: 0.7rem;
-    font-weight: 600;
-    text-transform: uppercase;
-    letter-spacing: 0.5px;
-    margin-right: 0.5rem;
-    margin-bottom: 0.5rem;
-}
-
-.badge-arxiv-ar { background: #fef3c7; color: #92400e; border: 1px solid #fde68a; }
-.badge-pwc-ar { background: #dbeafe; color: #1e40af; border: 1px solid #bfdbfe; }
-.badge-hf-ar { background: #fee2e2; color: #991b1b; border: 1px solid #fecaca; }
-.badge-pubmed-ar { background: #e0e7ff; color: #3730a3; border: 1px solid #c7d2fe; }
-.badge-biorxiv-ar { background: #dcfce7; color: #166534; border: 1px solid #bbf7d0; }
-.badge-ssrn-ar { background: #fce7f3; color: #831843; border: 1px solid #fbcfe8; }
-.badge-core-ar { background: #f3e8ff; color: #6b21a8; border: 1px solid #e9d5ff; }
-
-/* Reasoning flow styles - updated for proper alignment with pastel colors */
-.reasoning-flow {
-    display: flex;
-    justify-content: space-between;
-    align-items: stretch;
-    margin: 1.5rem 0;
-    padding: 1rem;
-    background: #FAF9F7;
-    border-radius: 12px;
-    gap: 0.5rem;
-}
-.reasoning-node {
-    flex: 1;
-    text-align: center;
-    padding: 1rem;
-    background: #FAF9F7;
-    border: 2px solid #E0DED9;
-    border-radius: 10px;
-    font-size: 1em;
-    color: #2C2B27;
-    transition: all 0.2s;
-    min-height: 120px;
-    display: flex;
-    flex-direction: column;
-    justify-content: center;
-}
-.reasoning-node:first-child { margin-left: 0; }
-.reasoning-node:last-child { margin-right: 0; }
-.reasoning-arrow {
-    color: #5B574D;
-    font-size: 1.5em;
-    font-weight: bold;
-    display: flex;
-    align-items: center;
-    margin: 0 0.25rem;
-}
-
-/* Timeline styles */
-.timeline-container {
-    display: flex;
-    justify-content: space-between;
-    margin: 1rem 0;
-    padding: 1rem;
-    background: #FAF9F7;
-    border-radius: 12px;
-}
-.timeline-week {
-    flex: 1;
-    padding: 0.8rem;
-    margin: 0 0.5rem;
-    background: white;
-    border: 1px solid #E0DED9;
-    border-radius: 8px;
-    text-align: center;
-    font-size: 0.9em;
-}
-.timeline-deviation {
-    border: 2px solid #D94B2B;
-    background: #FFF5F3;
-}
-
-/* Roundtable styles */
-.roundtable-container {
-    display: grid;
-    grid-template-columns: 1fr 1fr 1fr;
-    grid-template-rows: auto auto auto;
-    gap: 1rem;
-    margin: 2rem 0;
-    padding: 2rem;
-    background: #FAF9F7;
-    border-radius: 16px;
-}
-.agent-node {
-    padding: 1rem;
-    background: white;
-    border: 2px solid #E0DED9;
-    border-radius: 12px;
-    text-align: center;
-    box-shadow: 0 2px 4px rgba(0,0,0,0.05);
-}
-.connection-line {
-    stroke: #D94B2B;
-    stroke-width: 2;
-    fill: none;
-}
-
-/* Badge styles */
-.mini-stat-badge {
-    display: inline-block;
-    background: #FAF9F7;
-    color: #2C2B27;
-    padding: 0.3rem 0.7rem;
-    border-radius: 8px;
-    font-size: 0.85em;
-    font-weight: 500;
-    border: 1px solid #E0DED9;
-    margin-right: 0.5rem;
-    transition: all 0.2s;
-}
-.mini-stat-badge:hover {
-    background: #EBE8E3;
-    transform: translateY(-1px);
-}
-.validation-badge {
-    display: inline-block;
-    padding: 0.3rem 0.8rem;
-    border-radius: 15px;
-    font-size: 0.85em;
-    font-weight: 600;
-    color: white;
-}
-
-/* Summary styles */
-.collective-summary {
-    background: white;
-    border: 2px solid #D94B2B;
-    border-radius: 16px;
-    padding: 1.5rem;
-    margin: 2rem 0;
-    box-shadow: 0 2px 8px rgba(0,0,0,0.08);
-}
-.meta-commentary {
-    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-    color: white;
-    padding: 1.5rem;
-    border-radius: 12px;
-    margin: 2rem 0;
-    text-align: center;
-}
-
-/* Dashboard Hero Section */
-.hero-section {
-    background: linear-gradient(135deg, #FAF9F7 0%, #F3F1ED 100%);
-    border-radius: 20px;
-    padding: 3rem 2rem;
-    margin: 2rem 0;
-    text-align: center;
-    border: 2px solid #E0DED9;
-}
-.hero-title {
-    font-size: 2.5em;
-    font-weight: 600;
-    color: #2C2B27;
-    margin-bottom: 1rem;
-    letter-spacing: -0.02em;
-}
-.hero-subtitle {
-    font-size: 1.2em;
-    color: #5B574D;
-    margin-bottom: 2rem;
-    line-height: 1.6;
-}
-.hero-cta {
-    display: inline-block;
-    margin: 0.5rem;
-    padding: 0.8rem 1.5rem;
-    background: #D94B2B;
-    color: white;
-    border-radius: 10px;
-    text-decoration: none;
-    font-weight: 500;
-    transition: all 0.2s;
-}
-.hero-cta:hover {
-    background: #B63D23;
-    transform: scale(1.05);
-}
-
-/* Pulsing animation for agent nodes */
-@keyframes pulse {
-    0%, 100% { opacity: 1; transform: scale(1); }
-    50% { opacity: 0.85; transform: scale(1.05); }
-}
-.agent-node-pulse {
-    animation: pulse 3s ease-in-out infinite;
-}
-.user-avatar-center {
-    position: absolute;
-    top: 50%;
-    left: 50%;
-    transform: translate(-50%, -50%);
-    width: 80px;
-    height: 80px;
-    background: linear-gradient(135deg, #D94B2B 0%, #B63D23 100%);
-    border-radius: 50%;
-    display: flex;
-    align-items: center;
-    justify-content: center;
-    font-size: 2em;
-    color: white;
-    box-shadow: 0 4px 12px rgba(217, 75, 43, 0.3);
-    z-index: 20;
-    border: 4px solid white;
-}
-
-/* Bottleneck comparison */
-.bottleneck-comparison {
-    display: grid;
-    grid-template-columns: 1fr 1fr;
-    gap: 2rem;
-    margin: 2rem 0;
-}
-.bottleneck-card {
-    background: white;
-    border: 2px solid #E0DED9;
-    border-radius: 16px;
-    padding: 2rem;
-    box-shadow: 0 2px 8px rgba(0,0,0,0.08);
-}
-.bottleneck-card.old-way {
-    border-color: #9CA3AF;
-}
-.bottleneck-card.new-way {
-    border-color: #D94B2B;
-    background: #FFF5F3;
-}
-.bottleneck-title {
-    font-size: 1.5em;
-    font-weight: 600;
-    margin-bottom: 1rem;
-    color: #2C2B27;
-}
-.bottleneck-item {
-    padding: 0.8rem 0;
-    border-bottom: 1px solid #E0DED9;
-}
-.bottleneck-item:last-child {
-    border-bottom: none;
-}
+# Prometheus exporter (METRICS_PORT); started once per process, reruns reuse it
+start_metrics_exporter()
 
-/* Metrics with context */
-.metric-card {
-    background: white;
-    border: 2px solid #E0DED9;
-    border-radius: 12px;
-    padding: 1.5rem;
-    margin: 1rem 0;
-    box-shadow: 0 2px 4px rgba(0,0,0,0.05);
-}
-.metric-value {
-    font-size: 2em;
-    font-weight: 600;
-    color: #D94B2B;
-    margin-bottom: 0.5rem;
-}
-.metric-label {
-    font-size: 1.1em;
-    font-weight: 500;
-    color: #2C2B27;
-    margin-bottom: 0.5rem;
-}
-.metric-context {
-    font-size: 0.9em;
-    color: #5B574D;
-    font-style: italic;
-}
 
-/* Pipeline timeline */
-.pipeline-timeline {
-    display: flex;
-    justify-content: space-between;
-    align-items: center;
-    margin: 2rem 0;
-    padding: 1.5rem;
-    background: #FAF9F7;
-    border-radius: 12px;
-}
-.pipeline-step {
-    flex: 1;
-    text-align: center;
-    padding: 1rem;
-    margin: 0 0.5rem;
-    background: white;
-    border: 2px solid #E0DED9;
-    border-radius: 10px;
-    transition: all 0.3s;
-}
-.pipeline-step.complete {
-    border-color: #10B981;
-    background: #D1FAE5;
-}
-.pipeline-step.pending {
-    border-color: #9CA3AF;
-    opacity: 0.6;
-}
-.pipeline-arrow {
-    color: #D94B2B;
-    font-size: 1.5em;
-    font-weight: bold;
-}
+@st.cache_resource
+def shared_backend() -> LLMBackend:
+    """LLM backend shared by all sessions (configured once per process)"""
+    return create_backend()
 
-/* Author cards */
-.author-card {
-    background: white;
-    border: 2px solid #E0DED9;
-    border-radius: 12px;
-    padding: 1.5rem;
-    margin: 1rem 0;
-    box-shadow: 0 2px 4px rgba(0,0,0,0.05);
-}
-.author-header {
-    display: flex;
-    justify-content: space-between;
-    align-items: center;
-    margin-bottom: 1rem;
-}
-.author-name {
-    font-size: 1.3em;
-    font-weight: 600;
-    color: #2C2B27;
-}
-.author-paper-count {
-    font-size: 0.9em;
-    color: #5B574D;
-}
-.author-theme {
-    display: inline-block;
-    padding: 0.3rem 0.8rem;
-    background: #F0F4F8;
-    color: #2C2B27;
-    border-radius: 20px;
-    font-size: 0.85em;
-    font-weight: 500;
-    margin: 0.5rem 0.5rem 0.5rem 0;
-    border: 1px solid #E0DED9;
-}
-.author-insight-link {
-    display: inline-block;
-    padding: 0.4rem 1rem;
-    background: #2C2B27;
-    color: white;
-    border-radius: 8px;
-    text-decoration: none;
-    font-size: 0.9em;
-    margin-top: 0.5rem;
-    transition: all 0.2s;
-}
-.author-insight-link:hover {
-    background: #5B574D;
-}
 
-/* Beyond Keywords */
-.keywords-section {
-    background: white;
-    border: 2px solid #E0DED9;
-    border-radius: 16px;
-    padding: 2rem;
-    margin: 2rem 0;
-}
-.concept-cluster {
-    display: inline-block;
-    padding: 0.5rem 1rem;
-    background: #FAF9F7;
-    color: #2C2B27;
-    border-radius: 20px;
-    margin: 0.5rem;
-    font-size: 0.9em;
-    border: 1px solid #E0DED9;
-}
-.field-summary {
-    background: #FAF9F7;
-    border-left: 3px solid #2C2B27;
-    padding: 1.5rem;
-    margin: 1.5rem 0;
-    border-radius: 8px;
-    line-height: 1.8;
-    color: #2C2B27;
-}
+@st.cache_resource
+def shared_run_cache() -> RunCache:
+    """Completed runs shared by all sessions; identical concurrent runs execute once"""
+    return RunCache()
 
-/* Collaboration flow */
-.collaboration-flow {
-    display: flex;
-    justify-content: space-between;
-    align-items: center;
-    margin: 2rem 0;
-    padding: 2rem;
-    background: #FAF9F7;
-    border-radius: 16px;
-}
-.flow-agent {
-    flex: 1;
-    text-align: center;
-    padding: 1.5rem;
-    margin: 0 0.5rem;
-    background: white;
-    border: 2px solid #E0DED9;
-    border-radius: 12px;
-    transition: all 0.2s;
-}
-.flow-agent:hover {
-    border-color: #2C2B27;
-    transform: translateY(-2px);
-    box-shadow: 0 4px 8px rgba(0,0,0,0.1);
-}
-.flow-arrow {
-    color: #5B574D;
-    font-size: 2em;
-    font-weight: bold;
-}
 
-/* Dialogue bubbles */
-.dialogue-bubble {
-    background: white;
-    border: 2px solid #E0DED9;
-    border-radius: 16px;
-    padding: 1.5rem;
-    margin: 1rem 0;
-    position: relative;
-    box-shadow: 0 2px 4px rgba(0,0,0,0.05);
-}
-.dialogue-agent {
-    font-weight: 600;
-    color: #2C2B27;
-    margin-bottom: 0.5rem;
-}
-.dialogue-text {
-    color: #2C2B27;
-    line-height: 1.6;
-}
+@st.cache_resource
+def shared_render_cache() -> RenderCache:
+    """Rendered HTML keyed by content, so reruns with unchanged data skip rebuilding it"""
+    return RenderCache()
 
-/* Use cases */
-.use-case-card {
-    background: white;
-    border: 2px solid #E0DED9;
-    border-radius: 12px;
-    padding: 2rem;
-    margin: 1rem 0;
-    text-align: center;
-    transition: all 0.2s;
-}
-.use-case-card:hover {
-    border-color: #2C2B27;
-    transform: translateY(-2px);
-    box-shadow: 0 4px 8px rgba(0,0,0,0.1);
-}
-.use-case-icon {
-    font-size: 3em;
-    margin-bottom: 1rem;
-}
-.use-case-title {
-    font-size: 1.3em;
-    font-weight: 600;
-    color: #2C2B27;
-    margin-bottom: 0.5rem;
-}
-.use-case-outcome {
-    color: #5B574D;
-    font-size: 0.9em;
-    font-style: italic;
-    margin-top: 1rem;
-}
 
-/* CTA Section */
-.cta-section {
-    background: #FAF9F7;
-    color: #2C2B27;
-    border-radius: 20px;
-    padding: 3rem 2rem;
-    margin: 3rem 0;
-    text-align: center;
-    border: 2px solid #E0DED9;
-}
-.cta-title {
-    font-size: 2em;
-    font-weight: 600;
-    margin-bottom: 1rem;
-}
-.cta-text {
-    font-size: 1.1em;
-    line-height: 1.8;
-    margin-bottom: 2rem;
-    opacity: 0.95;
-}
-.cta-buttons {
-    display: flex;
-    justify-content: center;
-    gap: 1rem;
-    flex-wrap: wrap;
-}
-.cta-button {
-    display: inline-block;
-    padding: 1rem 2rem;
-    background: white;
-    color: #2C2B27;
-    border-radius: 10px;
-    text-decoration: none;
-    font-weight: 600;
-    transition: all 0.2s;
-    border: 2px solid white;
-}
-.cta-button:hover {
-    background: #FAF9F7;
-    transform: scale(1.05);
-}
+@st.cache_resource
+def shared_history() -> Optional[RunHistory]:
+    """Persistent run history (RUN_HISTORY), opened once per process"""
+    return history_from_env()
 
-/* Pill-shaped tab styling - unified modern design */
-.stTabs [data-baseweb="tab"] {
-    border-radius: 10px !important;
-    padding: 0.5rem 1rem !important;
-    background-color: #FAF9F7 !important;
-    color: #2C2B27 !important;
-    margin-right: 0.5rem !important;
-    border: 1px solid #E0DED9 !important;
-    transition: all 0.2s ease !important;
-    font-weight: 500 !important;
-    font-size: 0.95em !important;
-    font-family: 'Space Grotesk', sans-serif !important;
-}
 
-.stTabs [data-baseweb="tab"]:hover {
-    background-color: #EDEBE6 !important;
-    border-color: #D94B2B !important;
-    transform: translateY(-1px) !important;
-}
+@st.cache_resource
+def shared_watchlist() -> Optional[Watchlist]:
+    """Topics refreshed in the background by the scheduler (WATCHLIST)"""
+    return watchlist_from_env()
 
-.stTabs [data-baseweb="tab"][aria-selected="true"] {
-    background-color: #D94B2B !important;
-    color: white !important;
-    font-weight: 600 !important;
-    border-color: #D94B2B !important;
-}
 
-/* Tab list container - remove default underline and add spacing */
-.stTabs [role="tablist"] {
-    gap: 0.5rem !important;
-    padding: 0.5rem 0 !important;
-    border-bottom: none !important;
-    margin-bottom: 1rem !important;
-}
+@st.cache_resource
+def shared_export_cache() -> ExportCache:
+    """Export files per run and format, generated on first download"""
+    return ExportCache(os.getenv("EXPORT_DIR", ""))
 
-/* Remove default underline indicator */
-.stTabs [role="tablist"]::after {
-    display: none !important;
-}
 
-/* Ensure tab container has proper spacing */
-.stTabs > div {
-    padding: 0 !important;
-}
+@st.cache_resource
+def app_css() -> str:
+    """Stylesheet contents, read once per process"""
+    with open(APP_CSS_PATH, "r", encoding="utf-8") as f:
+        return f.read()
 
-/* Style tab panels for consistency */
-.stTabs [role="tabpanel"] {
-    padding-top: 1rem !important;
-}
 
-/* Lighten button focus shadows for better visual balance */
-button:focus {
-    box-shadow: 0 0 0 0.2rem rgba(255, 165, 0, 0.4) !important;
-    outline: none !important;
-}
+# Pure HTML builders below are memoized on their argument content
+memoize_render = shared_render_cache().memoize
 
-button[kind="primary"]:focus {
-    box-shadow: 0 0 0 0.2rem rgba(217, 75, 43, 0.4) !important;
-    outline: none !important;
-}
-</style>
-""", unsafe_allow_html=True)
+# Elegant Design: static/app.css, inlined (read from disk once per process)
+st.markdown(f"<style>\n{app_css()}</style>", unsafe_allow_html=True)
 
 
+@memoize_render
 def create_enhanced_paper_card(paper, index: int = 0):
     """Create an informative paper card in AiResearcher style"""
     # Handle both Paper dataclass and EnhancedPaper
@@ -1045,6 +419,7 @@ def create_styled_content_box(content: str, box_type: str = "info") -> str:
     """
 
 
+@memoize_render
 def create_reasoning_flow(insight: Dict) -> str:
     """Generate HTML/CSS for horizontal reasoning flow diagram with AiResearcher pastel colors"""
     observation = insight.get('observation', '')
@@ -1190,6 +565,7 @@ def analyze_shared_timeline(insights: List[Dict]) -> Dict[str, Any]:
     return {"has_shared_timeline": False, "shared_steps": [], "deviations": {}}
 
 
+@memoize_render
 def create_timeline_visualization(insights: List[Dict]) -> str:
     """Create timeline visualization for shared experiment patterns"""
     timeline_analysis = analyze_shared_timeline(insights)
@@ -1219,12 +595,68 @@ def create_timeline_visualization(insights: List[Dict]) -> str:
     return timeline_html
 
 
+# Bar colours per span kind in the run timeline
+TRACE_COLORS = {"llm": "#D94B2B", "http": "#6B8FB8", "search": "#8FB0D6", "validation": "#9FC5A8"}
+
+
+@memoize_render
+def create_trace_timeline(spans: List[Dict], max_rows: int = 200) -> str:
+    """Create a flame-style timeline of a run's trace spans
+    
+    Args:
+        spans: Span dicts from ResearchAgent.get_trace()
+        max_rows: Maximum number of spans to draw
+    
+    Returns:
+        HTML string with one row per span, indented by nesting depth
+    """
+    if not spans:
+        return ""
+    
+    by_id = {s['span_id']: s for s in spans}
+    run_start = min(s['start'] for s in spans)
+    run_end = max(s['end'] or s['start'] for s in spans)
+    total = max(run_end - run_start, 1e-6)
+    
+    def depth(s: Dict) -> int:
+        d = 0
+        while s.get('parent_id') in by_id:
+            s = by_id[s['parent_id']]
+            d += 1
+        return d
+    
+    rows = []
+    for s in spans[:max_rows]:
+        left = (s['start'] - run_start) / total * 100
+        width = max(s['duration'] / total * 100, 0.3)
+        kind = s['name'].split('.')[0].split('_')[0]
+        color = TRACE_COLORS.get(kind, "#C9C4BA")
+        if s.get('status') == 'error':
+            color = "#B03A2E"
+        attrs = ", ".join(f"{k}={v}" for k, v in s.get('attributes', {}).items())
+        tooltip = html.escape(f"{s['name']} — {s['duration'] * 1000:.0f} ms" + (f" ({attrs})" if attrs else ""))
+        rows.append(f"""
+        <div style="display: flex; align-items: center; height: 20px; font-size: 0.78em;" title="{tooltip}">
+            <div style="width: 32%; padding-left: {depth(s) * 12}px; white-space: nowrap; overflow: hidden; text-overflow: ellipsis; color: #5B574D;">{html.escape(s['name'])}</div>
+            <div style="position: relative; flex: 1; height: 14px; background: #F3F1ED; border-radius: 3px;">
+                <div style="position: absolute; left: {left:.2f}%; width: {width:.2f}%; height: 100%; background: {color}; border-radius: 3px;"></div>
+            </div>
+            <div style="width: 70px; text-align: right; color: #5B574D;">{s['duration'] * 1000:.0f} ms</div>
+        </div>""")
+    
+    more = f'<div style="font-size: 0.8em; color: #5B574D; margin-top: 0.5rem;">… {len(spans) - max_rows} more spans not shown</div>' if len(spans) > max_rows else ""
+    return f"""<div style="background: white; border: 1px solid #E0DED9; border-radius: 12px; padding: 1rem;">
+        <div style="font-size: 0.85em; color: #5B574D; margin-bottom: 0.5rem;">Total {total:.2f}s · {len(spans)} spans · hover a row for attributes</div>
+        {''.join(rows)}{more}
+    </div>"""
+
+
 def generate_collective_summary(insights: List[Dict], research_intelligence: Any = None) -> str:
     """Generate collective insight summary from all insights"""
     if not insights:
         return ""
     
-    num_papers = len(st.session_state.get('papers', [])) if 'papers' in st.session_state else 0
+    num_papers = len(current_run().papers)
     validated_count = len([i for i in insights if i.get('validated', False)])
     
     # Extract themes from insights
@@ -1343,6 +775,7 @@ def generate_meta_commentary(conversation_log: List[Dict], insights: List[Dict])
     return commentary
 
 
+@memoize_render
 def create_roundtable_visualization(conversation_log: List[Dict], show_user: bool = False) -> str:
     """Generate HTML/CSS for roundtable visualization with agent nodes and connections"""
     if not conversation_log and not show_user:
@@ -1538,6 +971,9 @@ def create_bottleneck_comparison() -> str:
     return html_str
 
 
+ENGAGEMENT_SLOT = "<!--engagement-index-->"
+
+
 def create_metrics_with_context(papers: List, insights: List[Dict], conversation_log: List[Dict], tab_switches: int = 0) -> str:
     """
     Creates a metrics display section with contextual information.
@@ -1545,6 +981,17 @@ def create_metrics_with_context(papers: List, insights: List[Dict], conversation
     Calculates and displays key metrics including paper count, insight count,
     validation rates, and engagement metrics for the dashboard.
     """
+    # Calculate engagement index based on tab navigation
+    # Normalizes tab switches to a 0-100 scale for display
+    max_switches = 4
+    engagement_index = min(int((tab_switches / max_switches) * 100), 100) if tab_switches > 0 else 0
+    # The counter changes on every rerun, so it is filled in after the memoized part
+    return create_metrics_dashboard(papers, insights, conversation_log).replace(ENGAGEMENT_SLOT, f"{engagement_index}%")
+
+
+@memoize_render
+def create_metrics_dashboard(papers: List, insights: List[Dict], conversation_log: List[Dict]) -> str:
+    """Metrics section for a run, with ENGAGEMENT_SLOT in place of the engagement index"""
     num_papers = len(papers) if papers else 0
     num_insights = len(insights) if insights else 0
     validated_count = len([i for i in insights if i.get('validated', False)]) if insights else 0
@@ -1555,11 +1002,6 @@ def create_metrics_with_context(papers: List, insights: List[Dict], conversation
     # Calculate pipeline time
     pipeline_time = sum(log.get('duration', 0) for log in conversation_log) if conversation_log else 0
     
-    # Calculate engagement index based on tab navigation
-    # Normalizes tab switches to a 0-100 scale for display
-    max_switches = 4
-    engagement_index = min(int((tab_switches / max_switches) * 100), 100) if tab_switches > 0 else 0
-    
     html_str = f"""
     <div style="margin: 2rem 0;">
         <h2 style="margin-bottom: 1.5rem; color: #2C2B27;">Live Discovery Dashboard</h2>
@@ -1580,7 +1022,7 @@ def create_metrics_with_context(papers: List, insights: List[Dict], conversation
                 <div style="font-size: 0.85em; color: #5B574D; font-style: italic;">dialogue turns per insight</div>
             </div>
             <div style="background: white; border: 1px solid #E0DED9; border-radius: 12px; padding: 1.5rem; box-shadow: 0 1px 3px rgba(0,0,0,0.05);">
-                <div style="font-size: 2em; font-weight: 600; color: #2C2B27; margin-bottom: 0.5rem;">🤝 {engagement_index}%</div>
+                <div style="font-size: 2em; font-weight: 600; color: #2C2B27; margin-bottom: 0.5rem;">🤝 {ENGAGEMENT_SLOT}</div>
                 <div style="font-size: 1em; font-weight: 500; color: #2C2B27; margin-bottom: 0.5rem;">Human Engagement Index</div>
                 <div style="font-size: 0.85em; color: #5B574D; font-style: italic;">clicks, edits, approvals</div>
             </div>
@@ -1624,52 +1066,16 @@ def create_metrics_with_context(papers: List, insights: List[Dict], conversation
 
 
 def build_author_insight_mapping(papers: List, insights: List[Dict]) -> Dict[str, List[Dict]]:
-    """Build mapping from author names to linked insights"""
-    author_insights = {}
-    
-    if not papers or not insights:
-        return author_insights
-    
-    # Extract author names from papers and map to paper indices
-    author_papers = {}  # author_name -> [paper_indices]
-    for idx, paper in enumerate(papers):
-        # Handle both Paper dataclass and dict
-        if hasattr(paper, 'authors'):
-            authors = paper.authors
-        elif isinstance(paper, dict):
-            authors = paper.get('authors', [])
-        else:
-            continue
-        
-        for author in authors:
-            if author and author.strip():
-                if author not in author_papers:
-                    author_papers[author] = []
-                author_papers[author].append(idx)
-    
-    # Match insights to authors via paper titles/keywords
-    for insight in insights:
-        # Extract referenced papers from insight (via gap, observation, or validation_evidence)
-        insight_text = (
-            insight.get('gap', '') + ' ' +
-            insight.get('observation', '') + ' ' +
-            insight.get('validation_evidence', '')
-        ).lower()
-        
-        # Try to match paper titles in insight text
-        for author, paper_indices in author_papers.items():
-            for paper_idx in paper_indices:
-                paper = papers[paper_idx]
-                paper_title = paper.title if hasattr(paper, 'title') else paper.get('title', '')
-                if paper_title and paper_title.lower() in insight_text:
-                    if author not in author_insights:
-                        author_insights[author] = []
-                    if insight not in author_insights[author]:
-                        author_insights[author].append(insight)
-    
-    return author_insights
+    """
+    Build mapping from author names to linked insights (via paper titles cited in the insight).
+
+    Not memoized: the render cache is shared by all sessions, so it only holds
+    immutable HTML; this mapping is built inside the memoized authors section.
+    """
+    return link_authors_to_insights(papers, insights)
 
 
+@memoize_render
 def create_enhanced_authors_section(papers: List, insights: List[Dict], research_intelligence: Dict = None) -> str:
     """Create enhanced authors section with expandable cards"""
     if not research_intelligence or not research_intelligence.get('top_authors'):
@@ -1839,6 +1245,7 @@ def generate_emerging_subfields_cached(papers: List, research_intelligence: Dict
     return subfields
 
 
+@memoize_render
 def create_beyond_keywords_section(papers: List, research_intelligence: Dict = None, topic: str = "") -> str:
     """Create Beyond Keywords section with concept clusters, subfields, and field summary"""
     if not research_intelligence:
@@ -1904,6 +1311,7 @@ def create_beyond_keywords_section(papers: List, research_intelligence: Dict = N
     return html_str
 
 
+@memoize_render
 def create_collaboration_flow_section(conversation_log: List[Dict] = None) -> str:
     """
     Creates a collaboration flow visualization.
@@ -1964,6 +1372,7 @@ def create_collaboration_flow_section(conversation_log: List[Dict] = None) -> st
     return html_str
 
 
+@memoize_render
 def create_see_thinking_section(conversation_log: List[Dict] = None) -> str:
     """Create See Thinking section with conversation highlights"""
     html_str = """
@@ -2119,23 +1528,52 @@ with st.sidebar:
         st.session_state.use_multi_platform = use_multi_platform
         st.session_state.enabled_sources = enabled_sources
 
+    # Past runs reload from the history store without any search or LLM calls
+    history = shared_history()
+    past_runs = history.list_runs(limit=30) if history is not None else []
+    if past_runs:
+        st.divider()
+        st.subheader("🕘 Past Runs")
+        past_run = st.selectbox("Reload a previous analysis", past_runs, index=None,
+                                format_func=lambda summary: summary.label, placeholder="Choose a run...")
+        if st.button("📂 Load Run", disabled=past_run is None, use_container_width=True):
+            loaded = history.load(past_run.run_id)
+            if loaded:
+                st.session_state.run_result = loaded
+                st.session_state.last_topic = loaded.topic
+                st.session_state.run = False
+            else:
+                st.error("❌ This run could not be loaded from history.")
+
+    # Watched topics are refreshed by the scheduler process (python -m core.scheduler run)
+    # and their runs appear under Past Runs
+    watchlist = shared_watchlist()
+    if watchlist is not None:
+        st.divider()
+        st.subheader("👁️ Watchlist")
+        interval = st.selectbox("Refresh every", [6, 12, 24, 72, 168], index=2,
+                                format_func=lambda hours: f"{hours}h" if hours < 24 else f"{hours // 24}d")
+        if st.button("👁️ Watch Topic", use_container_width=True, disabled=not topic.strip()):
+            watchlist.add(topic, interval_hours=interval, num_papers=num_papers,
+                          sources=sorted(enabled_sources) if enabled_sources else None)
+        for watched in watchlist.topics():
+            due = time.strftime("%b %d %H:%M", time.localtime(watched.next_run))
+            st.caption(f"**{watched.topic}** · every {watched.interval_hours:g}h · next {due}")
+
+@memoize_render
+def build_markdown_report(insights: List[Dict], papers: List, topic: str, report_date: str) -> str:
+    """Markdown report of a run's insights and papers for the preview"""
+    return "\n".join(markdown_lines(insights, papers, topic, report_date))
+
+
 # Initialize session state
-if "papers" not in st.session_state:
-    st.session_state.papers = None
-if "insights" not in st.session_state:
-    st.session_state.insights = None
-if "conversation_log" not in st.session_state:
-    st.session_state.conversation_log = None
-if "agent" not in st.session_state:
-    st.session_state.agent = None
-if "enhanced_papers" not in st.session_state:
-    st.session_state.enhanced_papers = None
+# A completed run is one compact RunResult (shared with other sessions via the run cache)
+if "run_result" not in st.session_state:
+    st.session_state.run_result = None
 if "use_multi_platform" not in st.session_state:
     st.session_state.use_multi_platform = False
 if "enabled_sources" not in st.session_state:
     st.session_state.enabled_sources = None
-if "research_intelligence" not in st.session_state:
-    st.session_state.research_intelligence = None
 if "tab_switches" not in st.session_state:
     st.session_state.tab_switches = 0
 if "last_tab" not in st.session_state:
@@ -2143,6 +1581,19 @@ if "last_tab" not in st.session_state:
 if "last_topic" not in st.session_state:
     st.session_state.last_topic = "machine learning"
 
+EMPTY_RUN = RunResult("", [])
+
+
+def current_run() -> RunResult:
+    """This session's completed run (an empty one before the first run)"""
+    return st.session_state.run_result or EMPTY_RUN
+
+
+# Idle sessions' results move to disk when RUN_SPILL_DIR is set; they reload on next access
+spill_settings = spill_settings_from_env()
+if spill_settings:
+    spill_idle(*spill_settings)
+
 # Track tab switches for engagement index
 def track_tab_switch(tab_name: str):
     """Track tab switches for engagement index"""
@@ -2164,34 +1615,36 @@ tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
 if st.session_state.get("run", False):
     use_multi = st.session_state.get("use_multi_platform", False)
     enabled_sources = st.session_state.get("enabled_sources", None)
-    agent = ResearchAgent(use_multi_platform=use_multi, enabled_sources=enabled_sources)
-    st.session_state.agent = agent
-
-    # Search papers with progress
-    search_text = "🌐 Searching multiple platforms..." if use_multi else "📚 Searching papers..."
-    progress_bar = st.progress(0)
-    status_text = st.empty()
-    
-    with st.spinner(search_text):
-        status_text.text("Searching papers...")
-        papers = agent.search_papers(topic, num_papers, multi_platform=use_multi, enabled_sources=enabled_sources)
-        progress_bar.progress(1.0)
-        status_text.text(f"✓ Found {len(papers)} papers")
-        st.session_state.papers = papers
-        time.sleep(0.5)  # Brief pause to show completion
-        progress_bar.empty()
-        status_text.empty()
+    backend = shared_backend()
+    model = f"{backend.name}:{getattr(backend, 'model_name', '')}"
+    key = run_key(topic, num_papers, enabled_sources if use_multi else None, model)
+
+    def run_pipeline() -> RunResult:
+        """Search and 4-agent pipeline; the result is shared with identical requests"""
+        agent = ResearchAgent(use_multi_platform=use_multi, enabled_sources=enabled_sources,
+                              llm=LLM(backend=backend), pipelined_validation=True, validation_batch_size=3)
+        run_deadline = Deadline(RUN_TIMEOUT_SECONDS)
+
+        # Search papers with progress
+        search_text = "🌐 Searching multiple platforms..." if use_multi else "📚 Searching papers..."
+        progress_bar = st.progress(0)
+        status_text = st.empty()
+        
+        with st.spinner(search_text):
+            status_text.text("Searching papers...")
+            papers = agent.search_papers(topic, num_papers, multi_platform=use_multi, enabled_sources=enabled_sources,
+                                        deadline=run_deadline)
+            progress_bar.progress(1.0)
+            status_text.text(f"✓ Found {len(papers)} papers")
+            time.sleep(0.5)  # Brief pause to show completion
+            progress_bar.empty()
+            status_text.empty()
+        
+        # Enhanced papers if multi-platform was used (cached in agent)
+        enhanced_papers = agent.last_enhanced_papers if use_multi and agent.last_enhanced_papers else None
+        if not papers:
+            return RunResult(topic, papers, enhanced_papers)
         
-        # Store enhanced papers if multi-platform was used (cached in agent)
-        if use_multi and hasattr(agent, 'last_enhanced_papers') and agent.last_enhanced_papers:
-            st.session_state.enhanced_papers = agent.last_enhanced_papers
-        else:
-            st.session_state.enhanced_papers = None
-
-    if not papers:
-        st.error("❌ No papers found. Try a different topic.")
-        st.session_state.run = False
-    else:
         # Generate insights with 4-agent pipeline
         agent_progress = st.progress(0)
         agent_status = st.empty()
@@ -2200,30 +1653,55 @@ if st.session_state.get("run", False):
             agent_status.text("Initializing agents...")
             agent_progress.progress(0.1)
             
-            insights = agent.generate_insights(papers, topic)
+            insights = agent.generate_insights(papers, topic, deadline=run_deadline)
             agent_progress.progress(1.0)
             agent_status.text("✓ Pipeline complete!")
-            
-            st.session_state.insights = insights
-            st.session_state.conversation_log = agent.get_conversation_log()
-            st.session_state.research_intelligence = agent.get_research_intelligence()
-            st.session_state.last_topic = topic
+            result = RunResult(
+                topic, papers, enhanced_papers, insights,
+                conversation_log=agent.get_conversation_log(),
+                trace=agent.get_trace(),
+                research_intelligence=agent.get_research_intelligence(),
+                timed_out=run_deadline.expired(),
+                usage=agent.get_usage_summary(),
+            )
+            history = shared_history()
+            if history is not None:
+                history.save(result, model=model, sources=enabled_sources if use_multi else None)
             
             time.sleep(0.5)
             agent_progress.empty()
             agent_status.empty()
+        return result
+
+    # Partial (timed out) and empty runs are not shared
+    result, shared = shared_run_cache().get_or_compute(
+        key, run_pipeline,
+        cache_if=lambda r: bool(r.papers) and not r.timed_out,
+        on_wait=lambda: st.info("⏳ The same research is already running for another user - waiting for its results..."),
+    )
+    st.session_state.run_result = result
+
+    if not result.papers:
+        st.error("❌ No papers found. Try a different topic.")
+        st.session_state.run = False
+    else:
+        if result.timed_out:
+            st.warning(f"⏱️ Run hit the {RUN_TIMEOUT_SECONDS}s time limit - showing partial results. Some insights may be unvalidated.")
+        st.session_state.last_topic = topic
 
         st.session_state.run = False
         st.rerun()
 
 # TAB 1: Dashboard - Narrative Storytelling
-with tab1:
-    track_tab_switch("Dashboard")
-    
-    papers = st.session_state.papers or []
-    insights = st.session_state.insights or []
-    conversation_log = st.session_state.conversation_log or []
-    research_intelligence = st.session_state.research_intelligence
+@st.fragment
+def render_dashboard_tab():
+    """Dashboard tab; widgets inside rerun only this tab"""
+    
+    run = current_run()
+    papers = run.papers
+    insights = run.insights
+    conversation_log = run.conversation_log
+    research_intelligence = run.research_intelligence
     topic = st.session_state.get('last_topic', 'machine learning')
     
     # Always show hero section and bottleneck comparison
@@ -2260,63 +1738,85 @@ with tab1:
     # Section 9: CTA (always show)
     st.markdown(create_cta_section(), unsafe_allow_html=True)
 
+
+with tab1:
+    track_tab_switch("Dashboard")
+    render_dashboard_tab()
+
 # TAB 2: Papers
-with tab2:
-    track_tab_switch("Papers")
-    if st.session_state.papers:
-        papers = st.session_state.papers
-        enhanced_papers = st.session_state.get('enhanced_papers', None)
+def set_papers_page(page: int):
+    """Pagination button callback"""
+    st.session_state.papers_page = page
+
+
+@st.fragment
+def render_papers_tab():
+    """Papers tab; widgets inside rerun only this tab"""
+    run = current_run()
+    if run.papers:
+        papers = run.papers
+        enhanced_papers = run.enhanced_papers
         
         st.subheader(f"📚 {len(papers)} Papers Analyzed")
 
-        # Platform filter if multi-platform
-        selected_platform = "All"
-        if enhanced_papers:
-            platforms = set()
-            for ep in enhanced_papers:
-                if hasattr(ep, 'platform'):
-                    platforms.add(ep.platform)
-                elif isinstance(ep, dict):
-                    platforms.add(ep.get('platform', 'arXiv'))
-            
-            if platforms:
-                platforms_list = ["All"] + sorted(list(platforms))
-                selected_platform = st.selectbox("🔍 Filter by Platform", platforms_list)
-        
-        # Filter papers by platform if filter is set
-        papers_to_show = papers
-        enhanced_to_show = enhanced_papers
-        
-        if selected_platform != "All" and enhanced_papers:
-            filtered_indices = []
-            for i, ep in enumerate(enhanced_papers):
-                platform = ep.platform if hasattr(ep, 'platform') else (ep.get('platform', '') if isinstance(ep, dict) else '')
-                if platform == selected_platform:
-                    filtered_indices.append(i)
-            
-            papers_to_show = [papers[i] for i in filtered_indices if i < len(papers)]
-            enhanced_to_show = [enhanced_papers[i] for i in filtered_indices]
+        # Index built once per result set; filters and search only touch precomputed id lists
+        index = run.derived("paper_index", lambda: PaperIndex(papers, enhanced_papers))
+
+        filter_col, search_col, size_col = st.columns([1, 2, 1])
+        selected_platform = ALL_PLATFORMS
+        with filter_col:
+            # Platform filter if multi-platform
+            if enhanced_papers and len(index.platforms) > 1:
+                selected_platform = st.selectbox("🔍 Filter by Platform", index.platforms)
+        with search_col:
+            query = st.text_input("🔎 Search papers", placeholder="Title, author or abstract words")
+        with size_col:
+            page_size = st.selectbox("Per page", PAPERS_PAGE_SIZES, index=1)
+
+        matching = index.search(query, selected_platform)
+        # Back to the first page whenever the filter changes
+        filter_key = (selected_platform, query, page_size, len(papers))
+        if st.session_state.get("papers_filter") != filter_key:
+            st.session_state.papers_filter = filter_key
+            st.session_state.papers_page = 1
+        page_ids, pages = PaperIndex.page(matching, st.session_state.papers_page, page_size)
+
+        # Only the visible page is rendered and sent to the browser
+        for i in page_ids:
+            st.markdown(create_enhanced_paper_card(index.display_paper(i), i), unsafe_allow_html=True)
         
-        # Display papers with enhanced cards
-        for i, paper in enumerate(papers_to_show):
-            # Use enhanced paper if available
-            if enhanced_to_show and i < len(enhanced_to_show):
-                enhanced = enhanced_to_show[i]
-                st.markdown(create_enhanced_paper_card(enhanced, i), unsafe_allow_html=True)
+        if not matching:
+            if query:
+                st.info(f"No papers match \"{query}\"")
             else:
-                # Fallback to enhanced card format with basic paper data
-                st.markdown(create_enhanced_paper_card(paper, i), unsafe_allow_html=True)
-        
-        if not papers_to_show:
-            st.info(f"No papers found for platform: {selected_platform}")
+                st.info(f"No papers found for platform: {selected_platform}")
+        elif pages > 1:
+            prev_col, info_col, next_col = st.columns([1, 2, 1])
+            page = st.session_state.papers_page
+            with prev_col:
+                st.button("← Previous", disabled=page <= 1, use_container_width=True,
+                          on_click=set_papers_page, args=(page - 1,))
+            with info_col:
+                first = (page - 1) * page_size + 1
+                st.caption(f"Page {page} of {pages} · papers {first}-{first + len(page_ids) - 1} of {len(matching)}")
+            with next_col:
+                st.button("Next →", disabled=page >= pages, use_container_width=True,
+                          on_click=set_papers_page, args=(page + 1,))
     else:
         st.info("No papers loaded yet. Run the analysis first.")
 
+
+with tab2:
+    track_tab_switch("Papers")
+    render_papers_tab()
+
 # TAB 3: Research Insights
-with tab3:
-    track_tab_switch("Research Insights")
-    if st.session_state.insights:
-        insights = st.session_state.insights
+@st.fragment
+def render_insights_tab():
+    """Research Insights tab; widgets inside rerun only this tab"""
+    run = current_run()
+    if run.insights:
+        insights = run.insights
         st.subheader(f"💡 {len(insights)} Research Opportunities")
         
         # Shared Timeline Section (if applicable)
@@ -2648,7 +2148,7 @@ with tab3:
             
             collective_summary = generate_collective_summary(
                 insights, 
-                st.session_state.get('research_intelligence')
+                run.research_intelligence
             )
             
             if collective_summary:
@@ -2672,15 +2172,22 @@ with tab3:
     else:
         st.info("No insights generated yet. Run the analysis first.")
 
+
+with tab3:
+    track_tab_switch("Research Insights")
+    render_insights_tab()
+
 # TAB 4: Agent Conversation
-with tab4:
-    track_tab_switch("Agent Conversation")
-    if st.session_state.conversation_log:
+@st.fragment
+def render_conversation_tab():
+    """Agent Conversation tab; widgets inside rerun only this tab"""
+    run = current_run()
+    if run.conversation_log:
         st.subheader("🧠 Research Roundtable: Agent Conversation")
         st.markdown("*Watch how agents reason together in a Socratic dialogue*")
 
-        log = st.session_state.conversation_log
-        insights = st.session_state.get('insights', [])
+        log = run.conversation_log
+        insights = run.insights
         
         # Use global agent styles
         agent_styles = AGENT_STYLES
@@ -2752,11 +2259,15 @@ with tab4:
                     if 'agent_name_escaped' not in locals():
                         agent_name_escaped = html.escape(agent_name)
                     turn_info_escaped = html.escape(turn_info)
+                    tokens_html = ''
+                    if entry.get('tokens', {}).get('total_tokens'):
+                        tokens_html = f'<span style="color: #9CA3AF; font-size: 0.8em; margin-left: 1rem;">🔢 {entry["tokens"]["total_tokens"]:,} tokens</span>'
                     st.markdown(f"""
                     <div style="margin-bottom: 0.5rem;">
                         <span style="color: {style['color']}; font-weight: 600; font-size: 1.1em;">{style['icon']} {agent_name_escaped}</span>
                         <span style="color: #6B7280; font-size: 0.85em; margin-left: 1rem;">{turn_info_escaped}</span>
                         <span style="color: #9CA3AF; font-size: 0.8em; margin-left: 1rem;">⏱️ {entry.get('duration', 0):.1f}s</span>
+                        {tokens_html}
                     </div>
                     """, unsafe_allow_html=True)
                     
@@ -3004,6 +2515,11 @@ with tab4:
 
         # Summary - AiResearcher design (no purple gradient)
         total_duration = sum([e.get('duration', 0) for e in log])
+        total_tokens = sum(e.get('tokens', {}).get('total_tokens', 0) for e in log)
+        run_tokens = ((run.usage or {}).get('total') or {}).get('total_tokens', 0)
+        tokens_note = f" using {total_tokens:,} agent tokens" if total_tokens else ""
+        if run_tokens > total_tokens:
+            tokens_note = f" using {run_tokens:,} tokens ({total_tokens:,} by agents)"
         st.markdown(f"""
         <div style="
             background: #F5F9F6;
@@ -3015,190 +2531,63 @@ with tab4:
             box-shadow: 0 2px 8px rgba(0,0,0,0.08);
         ">
             <h3 style="color: #2C2B27; margin: 0; font-size: 1.2em; font-weight: 600;">✅ Roundtable Complete</h3>
-            <p style="color: #5B574D; margin: 0.5rem 0 0 0; font-size: 1em;">Pipeline completed successfully in {total_duration:.1f}s</p>
+            <p style="color: #5B574D; margin: 0.5rem 0 0 0; font-size: 1em;">Pipeline completed successfully in {total_duration:.1f}s{tokens_note}</p>
         </div>
         """, unsafe_allow_html=True)
+
+        # Run timeline: where the time went (network, queueing, LLM, parsing)
+        if run.trace:
+            with st.expander("⏱️ Run timeline", expanded=False):
+                render_html_block(create_trace_timeline(run.trace))
+                st.download_button(
+                    label="📥 Download trace (OpenTelemetry JSON)",
+                    data=lambda: json.dumps(to_otlp([Span.from_dict(s) for s in run.trace])),
+                    file_name=f"trace_{datetime.now().strftime('%Y%m%d_%H%M')}.json",
+                    mime="application/json",
+                    on_click="ignore"
+                )
     else:
         st.info("No conversation log available. Run the analysis first.")
 
+
+with tab4:
+    track_tab_switch("Agent Conversation")
+    render_conversation_tab()
+
 # TAB 5: Full Report
-with tab5:
-    track_tab_switch("Full Report")
-    if st.session_state.insights and st.session_state.papers:
+@st.fragment
+def render_report_tab():
+    """Full Report tab; widgets inside rerun only this tab"""
+    run = current_run()
+    if run.insights and run.papers:
         st.subheader("📄 Full Report")
 
-        insights = st.session_state.insights
-        papers = st.session_state.papers
+        insights = run.insights
+        papers = run.papers
         topic = st.session_state.get('last_topic', 'machine learning')
 
-        # Generate Markdown Report
-        report_lines = [
-            f"# Research Analysis Report",
-            f"\n**Topic:** {topic}",
-            f"**Date:** {datetime.now().strftime('%Y-%m-%d %H:%M')}",
-            f"**Papers Analyzed:** {len(papers)}",
-            f"**Insights Generated:** {len(insights)}",
-            f"\n---\n",
-            f"\n## 💡 Research Opportunities\n"
-        ]
-
-        for i, insight in enumerate(insights, 1):
-            overall = (
-                insight.get('novelty_score', 0) +
-                insight.get('feasibility_score', 0) +
-                insight.get('impact_score', 0)
-            ) / 3
+        # Preview Markdown (rebuilt only when the data or minute changes)
+        markdown_report = build_markdown_report(insights, papers, topic, datetime.now().strftime('%Y-%m-%d %H:%M'))
 
-            report_lines.append(f"\n### {i}. {insight.get('title', 'Untitled')} (Score: {overall:.1f}/10)\n")
-            
-            # 5-Layer Conceptual Reasoning Structure
-            observation = insight.get('observation', '')
-            hypothesis = insight.get('hypothesis', '')
-            expected_insight = insight.get('expected_insight', '')
-            
-            if observation or hypothesis:
-                report_lines.append(f"\n## Conceptual Reasoning Flow\n")
-                
-                if observation:
-                    report_lines.append(f"\n**1. Observation:**\n{observation}\n")
-                else:
-                    report_lines.append(f"\n**1. Observation (The Gap):**\n{insight.get('gap', 'N/A')}\n")
-                
-                if hypothesis:
-                    report_lines.append(f"\n**2. Hypothesis:**\n{hypothesis}\n")
-                
-                exp = insight.get('experiment_design', {})
-                if exp:
-                    report_lines.append(f"\n**3. Experiment Design:**")
-                    # Scientific methodology format
-                    if exp.get('objective'):
-                        report_lines.append(f"\n**Objective:** {exp.get('objective')}")
-                    if exp.get('independent_variable'):
-                        report_lines.append(f"\n**Independent Variable:** {exp.get('independent_variable')}")
-                    if exp.get('dependent_variables'):
-                        deps = exp.get('dependent_variables', [])
-                        if isinstance(deps, list):
-                            report_lines.append(f"\n**Dependent Variables:** {', '.join(deps)}")
-                        else:
-                            report_lines.append(f"\n**Dependent Variables:** {deps}")
-                    if exp.get('control_group'):
-                        report_lines.append(f"\n**Control Group:** {exp.get('control_group')}")
-                    if exp.get('experimental_procedure'):
-                        proc = exp.get('experimental_procedure', {})
-                        if isinstance(proc, dict):
-                            report_lines.append(f"\n**Experimental Procedure:**")
-                            for phase, desc in proc.items():
-                                report_lines.append(f"- **{phase}:** {desc}")
-                    if exp.get('expected_outcome'):
-                        report_lines.append(f"\n**Expected Outcome:** {exp.get('expected_outcome')}")
-                    if exp.get('fallback_plan'):
-                        report_lines.append(f"\n**Fallback Plan:** {exp.get('fallback_plan')}")
-                    if exp.get('deliverables'):
-                        dels = exp.get('deliverables', [])
-                        if isinstance(dels, list):
-                            report_lines.append(f"\n**Deliverables:** {', '.join(dels)}")
-                        else:
-                            report_lines.append(f"\n**Deliverables:** {dels}")
-                    # Legacy format
-                    if exp.get('week1') or exp.get('week2') or exp.get('week3'):
-                        report_lines.append(f"\n**Timeline:**")
-                        report_lines.append(f"- **Week 1:** {exp.get('week1', 'N/A')}")
-                        report_lines.append(f"- **Week 2:** {exp.get('week2', 'N/A')}")
-                        report_lines.append(f"- **Week 3:** {exp.get('week3', 'N/A')}")
-                        report_lines.append("")
-                
-                if expected_insight:
-                    report_lines.append(f"\n**4. Expected Insight:**\n{expected_insight}\n")
-                
-                # Validation
-                if insight.get('validation_evidence'):
-                    validation_status = "✓ VALIDATED" if insight.get('validated') else "⚠️ UNVALIDATED"
-                    report_lines.append(f"\n**5. Validation:** {validation_status} (Survival Score: {insight.get('survival_score', 0)}/10)")
-                    report_lines.append(f"\n**Validation Evidence:**\n{insight.get('validation_evidence')}\n")
-                    if insight.get('related_work'):
-                        report_lines.append(f"\n**Related Work:**")
-                        for work in insight.get('related_work', [])[:5]:
-                            report_lines.append(f"- {work}")
-                        report_lines.append("")
-            else:
-                # Fallback to old format (backward compatibility)
-                report_lines.append(f"\n**The Gap:**\n{insight.get('gap', 'N/A')}\n")
-                report_lines.append(f"\n**Skeptic's Challenge:**\n{insight.get('skeptic_challenge', 'N/A')}\n")
-
-                exp = insight.get('experiment_design', {})
-                if exp:
-                    report_lines.append(f"\n**3-Week Experiment:**")
-                    report_lines.append(f"- **Week 1:** {exp.get('week1', 'N/A')}")
-                    report_lines.append(f"- **Week 2:** {exp.get('week2', 'N/A')}")
-                    report_lines.append(f"- **Week 3:** {exp.get('week3', 'N/A')}\n")
-                
-                # Add validation information
-                if insight.get('validated'):
-                    report_lines.append(f"\n**Validation:** ✓ VALIDATED (Survival Score: {insight.get('survival_score', 0)}/10)")
-                    if insight.get('validation_evidence'):
-                        report_lines.append(f"\n**Validation Evidence:**\n{insight.get('validation_evidence')}\n")
-                else:
-                    report_lines.append(f"\n**Validation:** ⚠️ UNVALIDATED (Survival Score: {insight.get('survival_score', 0)}/10)")
-                    if insight.get('validation_evidence'):
-                        report_lines.append(f"\n**Validation Evidence:**\n{insight.get('validation_evidence')}\n")
-            
-            report_lines.append(f"\n**Impact:**\n{insight.get('impact', 'N/A')}\n")
-            report_lines.append(f"\n**Scores:**\n")
-            report_lines.append(f"- **Novelty:** {insight.get('novelty_score', 0)}/10")
-            report_lines.append(f"- **Feasibility:** {insight.get('feasibility_score', 0)}/10")
-            report_lines.append(f"- **Impact:** {insight.get('impact_score', 0)}/10")
-            report_lines.append("")
-
-        report_lines.append(f"\n---\n\n## 📚 Papers Analyzed\n")
-
-        for i, paper in enumerate(papers, 1):
-            report_lines.append(f"\n### {i}. {paper.title}")
-            report_lines.append(f"**Authors:** {', '.join(paper.authors[:3])}")
-            report_lines.append(f"**Year:** {paper.year}")
-            report_lines.append(f"**URL:** {paper.url}\n")
-
-        report_lines.append(f"\n---\n\n*Generated by AiResearcher - Multi-Agent Research System*")
-
-        markdown_report = "\n".join(report_lines)
-
-        # JSON Export
-        json_data = {
-            "topic": topic,
-            "date": datetime.now().isoformat(),
-            "papers": [
-                {
-                    "title": p.title,
-                    "authors": p.authors,
-                    "year": p.year,
-                    "url": p.url,
-                    "abstract": p.abstract[:500]
-                }
-                for p in papers
-            ],
-            "insights": insights,
-            "conversation_log": st.session_state.conversation_log
-        }
-
-        # Download buttons
-        col1, col2 = st.columns(2)
-
-        with col1:
-            st.download_button(
-                label="📄 Download Markdown Report",
-                data=markdown_report,
-                file_name=f"research_report_{datetime.now().strftime('%Y%m%d_%H%M')}.md",
-                mime="text/markdown",
-                use_container_width=True
-            )
-
-        with col2:
-            st.download_button(
-                label="📊 Download JSON Data",
-                data=json.dumps(json_data, indent=2),
-                file_name=f"research_data_{datetime.now().strftime('%Y%m%d_%H%M')}.json",
-                mime="application/json",
-                use_container_width=True
-            )
+        # Download buttons: exports are generated only when clicked, then cached per run
+        exports = shared_export_cache()
+        buttons = [
+            ("markdown", "📄 Download Markdown Report"),
+            ("json", "📊 Download JSON Data"),
+            ("jsonl", "🧾 Download JSON Lines"),
+            ("bundle", "📦 Download Bundle (papers, insights, trace · gzip)"),
+        ]
+        columns = st.columns(2) + st.columns(2)
+        for column, (fmt, label) in zip(columns, buttons):
+            with column:
+                st.download_button(
+                    label=label,
+                    data=lambda fmt=fmt: exports.read(run, fmt),
+                    file_name=export_file_name(fmt, datetime.now()),
+                    mime=EXPORT_FORMATS[fmt][1],
+                    on_click="ignore",
+                    use_container_width=True
+                )
 
         st.divider()
 
@@ -3238,9 +2627,15 @@ with tab5:
     else:
         st.info("No data to export. Run the analysis first.")
 
+
+with tab5:
+    track_tab_switch("Full Report")
+    render_report_tab()
+
 # TAB 6: Next Discovery
-with tab6:
-    track_tab_switch("Next Discovery")
+@st.fragment
+def render_discovery_tab():
+    """Next Discovery tab; widgets inside rerun only this tab"""
     
     st.markdown("""
     <div style="
@@ -3377,3 +2772,8 @@ with tab6:
             st.toast("📝 Export feature under development!", icon="🚀")
     
     st.markdown("</div>", unsafe_allow_html=True)
+
+
+with tab6:
+    track_tab_switch("Next Discovery")
+    render_discovery_tab()
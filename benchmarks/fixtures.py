@@ -0,0 +1,148 @@
+"""
+Synthetic, real-shaped fixtures for benchmarks.
+
+FixtureHTTP answers the GET requests made by search_arxiv and
+SimpleMultiPlatformScraper with deterministic payloads in each source's
+real response format (arXiv Atom, Papers with Code / Hugging Face /
+bioRxiv JSON, PubMed E-utilities JSON + XML), sized by the request's
+result-count parameter. Used as the recording transport of a
+CassetteSession, it produces a cassette that later runs replay.
+"""
+import hashlib
+import json
+import random
+from typing import List, Dict, Any, Optional
+from xml.sax.saxutils import escape
+from core.cassette import CassetteResponse
+
+TOPIC_WORDS = [
+    "transformer", "attention", "graph", "diffusion", "contrastive", "federated", "sparse",
+    "retrieval", "reinforcement", "multimodal", "protein", "segmentation", "robustness",
+    "calibration", "distillation", "quantization", "benchmark", "few-shot", "generative",
+    "causal", "temporal", "equivariant", "tokenizer", "language", "vision", "speech",
+]
+
+ABSTRACT_SENTENCES = [
+    "We propose a {a} {b} method that improves {c} on standard benchmarks.",
+    "Our approach combines {a} with {b} to address limitations of prior {c} work.",
+    "Experiments on ImageNet, COCO and GLUE show gains of {n}% over strong baselines.",
+    "However, evaluation is limited to datasets with fewer than {m} examples.",
+    "We further analyse {a} under distribution shift and report calibration error.",
+    "Code and pretrained {b} models are released to support reproducibility.",
+    "Ablations indicate that {c} contributes most of the improvement.",
+]
+
+
+def synthetic_papers(query: str, count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Deterministic paper records for a query"""
+    digest = hashlib.sha256(f"{seed}:{query}".encode("utf-8")).hexdigest()
+    rng = random.Random(digest)
+    query_words = [w for w in query.lower().replace('"', " ").split() if w.isalpha()][:3]
+    papers = []
+    for i in range(count):
+        a, b, c = rng.sample(TOPIC_WORDS, 3)
+        focus = rng.choice(query_words) if query_words else a
+        sentences = rng.sample(ABSTRACT_SENTENCES, 5)
+        abstract = " ".join(s.format(a=a, b=b, c=focus, n=rng.randint(2, 15), m=rng.choice([1000, 10000, 50000]))
+                            for s in sentences)
+        papers.append({
+            "id": f"{2000 + i}.{rng.randint(10000, 99999)}",
+            "title": f"{a.title()} {b.title()} Networks for {focus.title()} {rng.choice(['Learning', 'Modeling', 'Analysis', 'Reasoning'])}",
+            "abstract": abstract,
+            "authors": [f"{rng.choice('ABCDEFGHJKLMNPRS')}. {rng.choice(['Chen', 'Smith', 'Garcia', 'Kim', 'Müller', 'Okafor', 'Rossi', 'Tanaka'])}"
+                        for _ in range(rng.randint(1, 6))],
+            "year": rng.randint(2016, 2025),
+            "downloads": rng.randint(0, 500000),
+        })
+    return papers
+
+
+class FixtureHTTP:
+    """requests-style session returning real-shaped synthetic responses"""
+
+    def __init__(self, seed: int = 0):
+        self.seed = seed
+        self.headers: Dict[str, str] = {}
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None,
+            **kwargs) -> CassetteResponse:
+        params = params or {}
+        if "export.arxiv.org" in url:
+            return self._xml(url, self._arxiv(params))
+        if "paperswithcode.com" in url:
+            return self._json(url, self._pwc(params))
+        if "huggingface.co" in url:
+            return self._json(url, self._hf(params))
+        if "esearch.fcgi" in url:
+            return self._json(url, self._pubmed_search(params))
+        if "efetch.fcgi" in url:
+            return self._xml(url, self._pubmed_fetch(params))
+        if "api.biorxiv.org" in url:
+            return self._json(url, self._biorxiv(params))
+        return CassetteResponse(url, 404, b"Not found")
+
+    def _json(self, url: str, payload: Any) -> CassetteResponse:
+        return CassetteResponse(url, 200, json.dumps(payload).encode("utf-8"), {"Content-Type": "application/json"})
+
+    def _xml(self, url: str, payload: str) -> CassetteResponse:
+        return CassetteResponse(url, 200, payload.encode("utf-8"), {"Content-Type": "application/xml"})
+
+    def _arxiv(self, params: Dict[str, Any]) -> str:
+        papers = synthetic_papers(str(params.get("search_query", "")), int(params.get("max_results", 10)), self.seed)
+        entries = []
+        for p in papers:
+            authors = "".join(f"<author><name>{escape(a)}</name></author>" for a in p["authors"])
+            entries.append(
+                f"<entry><id>http://arxiv.org/abs/{p['id']}v1</id>"
+                f"<published>{p['year']}-03-14T00:00:00Z</published>"
+                f"<title>{escape(p['title'])}</title><summary>{escape(p['abstract'])}</summary>{authors}</entry>"
+            )
+        return f'<?xml version="1.0" encoding="UTF-8"?><feed xmlns="http://www.w3.org/2005/Atom">{"".join(entries)}</feed>'
+
+    def _pwc(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        papers = synthetic_papers("pwc " + str(params.get("q", "")), int(params.get("page_size", 10)), self.seed)
+        return {"count": len(papers), "results": [
+            {"id": p["id"], "title": p["title"], "abstract": p["abstract"], "authors": p["authors"],
+             "published": f"{p['year']}-05-01", "url_abs": f"https://arxiv.org/abs/{p['id']}",
+             "repo_url": f"https://github.com/example/{p['id']}", "paper_count": p["downloads"] % 300}
+            for p in papers
+        ]}
+
+    def _hf(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        papers = synthetic_papers("hf " + str(params.get("search", "")), int(params.get("limit", 10)), self.seed)
+        return [
+            {"modelId": f"example/{p['title'].lower().replace(' ', '-')[:40]}", "author": p["authors"][0],
+             "downloads": p["downloads"], "lastModified": f"{p['year']}-07-01T00:00:00.000Z",
+             "cardData": {"description": p["abstract"]}}
+            for p in papers
+        ]
+
+    def _pubmed_search(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        papers = synthetic_papers("pubmed " + str(params.get("term", "")), int(params.get("retmax", 10)), self.seed)
+        return {"esearchresult": {"idlist": [str(30000000 + i) for i in range(len(papers))]}}
+
+    def _pubmed_fetch(self, params: Dict[str, Any]) -> str:
+        ids = str(params.get("id", "")).split(",")
+        papers = synthetic_papers("pubmed fetch", len(ids), self.seed)
+        articles = []
+        for pmid, p in zip(ids, papers):
+            authors = "".join(
+                f"<Author><LastName>{escape(a.split('. ')[-1])}</LastName><ForeName>{escape(a.split('.')[0])}</ForeName></Author>"
+                for a in p["authors"]
+            )
+            articles.append(
+                f"<PubmedArticle><MedlineCitation><PMID>{pmid}</PMID><Article>"
+                f"<Journal><JournalIssue><PubDate><Year>{p['year']}</Year></PubDate></JournalIssue></Journal>"
+                f"<ArticleTitle>{escape(p['title'])}</ArticleTitle>"
+                f"<Abstract><AbstractText>{escape(p['abstract'])}</AbstractText></Abstract>"
+                f"<AuthorList>{authors}</AuthorList></Article></MedlineCitation></PubmedArticle>"
+            )
+        return f'<?xml version="1.0"?><PubmedArticleSet>{"".join(articles)}</PubmedArticleSet>'
+
+    def _biorxiv(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        papers = synthetic_papers("biorxiv " + str(params.get("query", "")), int(params.get("rows", 10)), self.seed)
+        return {"collection": [
+            {"title": p["title"], "abstract": p["abstract"], "authors": "; ".join(p["authors"]),
+             "date": f"{p['year']}-02-02", "doi": f"10.1101/{p['id']}"}
+            for p in papers
+        ]}
@@ -0,0 +1,240 @@
+"""
+Micro-benchmarks for parsing and text hot paths.
+
+Times the pure-Python functions that run on every LLM response or search
+result, at several input scales, with synthetic but real-shaped inputs:
+LLM.extract_json/_clean_json, arXiv Atom parsing (search_arxiv and
+SimpleMultiPlatformScraper._search_arxiv), _extract_themes_fallback,
+ValidatorAgent._extract_search_keywords, and the app.py helpers
+build_author_insight_mapping and analyze_shared_timeline.
+
+app.py runs Streamlit at import time, so its helpers are loaded by
+extracting their function definitions from the source.
+
+Usage:
+    python -m benchmarks.micro_bench
+    python -m benchmarks.micro_bench --filter extract_json --repeat 7
+    python -m benchmarks.micro_bench --compare benchmarks/results/micro_<commit>.json
+"""
+import argparse
+import ast
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import timeit
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Callable, Tuple
+
+from benchmarks.fixtures import FixtureHTTP, synthetic_papers
+from benchmarks.pipeline_bench import RESULTS_DIR, git_commit
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+
+def load_app_functions(names: List[str]) -> Dict[str, Callable]:
+    """Compile selected top-level functions from app.py without running the app"""
+    with open(APP_PATH, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=APP_PATH)
+    nodes = [node for node in tree.body if isinstance(node, ast.FunctionDef) and node.name in names]
+    missing = set(names) - {node.name for node in nodes}
+    if missing:
+        raise LookupError(f"Functions not found in app.py: {', '.join(sorted(missing))}")
+    for node in nodes:
+        # Time the functions themselves, not the app's render memoization
+        node.decorator_list = []
+    namespace: Dict[str, Any] = {}
+    exec("import re, html, json\nfrom datetime import datetime\nfrom typing import Dict, List, Any\n"
+         "from core.title_matcher import link_authors_to_insights", namespace)
+    exec(compile(ast.Module(body=nodes, type_ignores=[]), APP_PATH, "exec"), namespace)
+    return {name: namespace[name] for name in names}
+
+
+def make_papers(count: int, seed: int = 0) -> List[Any]:
+    from core.arxiv import Paper
+    return [Paper(title=p["title"], abstract=p["abstract"], authors=p["authors"], year=p["year"],
+                  url=f"http://arxiv.org/abs/{p['id']}")
+            for p in synthetic_papers("micro benchmark", count, seed)]
+
+
+def make_insights(count: int, papers: List[Any], week_format: bool = False, seed: int = 0) -> List[Dict[str, Any]]:
+    """Synthesizer-shaped insights that reference some paper titles"""
+    rng = random.Random(seed)
+    insights = []
+    for i in range(count):
+        cited = rng.sample(papers, min(2, len(papers)))
+        design = {
+            "objective": f"Test hypothesis {i}",
+            "independent_variable": "regularization weight",
+            "dependent_variables": ["accuracy", "calibration error"],
+            "control_group": "baseline",
+            "expected_outcome": "correlation above 0.6",
+        }
+        if week_format:
+            design.update(week1=f"Reproduce baseline models for study {i}", week2="Sweep weights", week3="Evaluate shift")
+        else:
+            design["experimental_procedure"] = {f"phase{n}": f"Phase {n} of study {i}" for n in range(1, 5)}
+        insights.append({
+            "title": f"Insight {i}: {cited[0].title}",
+            "gap": f"Prior work such as {cited[0].title} ignores evaluation at scale.",
+            "observation": f"Both {cited[-1].title} and related papers rely on narrow benchmarks.",
+            "validation_evidence": "Quick check: scanning recent arXiv. → Insight validated.",
+            "experiment_design": design,
+            "novelty_score": 8.0,
+        })
+    return insights
+
+
+def llm_response_variants(insights: List[Dict[str, Any]]) -> Dict[str, str]:
+    """Shapes of Synthesizer responses that extract_json has to handle"""
+    payload = json.dumps({"dialogue_messages": ["Interesting."] * len(insights), "insights": insights}, indent=2)
+    trailing = payload.replace('"novelty_score": 8.0', '"novelty_score": 8.0,')
+    return {
+        "plain": payload,
+        "fenced": f"Here are the insights:\n```json\n{payload}\n```\nLet me know if you need more.",
+        "prose_wrapped": f"Sure! Based on the analysis, {payload} Hope this helps.",
+        "trailing_commas": f"```json\n{trailing}\n```",
+    }
+
+
+def atom_feed(count: int) -> bytes:
+    return FixtureHTTP().get("http://export.arxiv.org/api/query",
+                             params={"search_query": "bench", "max_results": count}).content
+
+
+class StaticHTTP:
+    """Session that returns the same prebuilt response for every request"""
+
+    def __init__(self, response: Any):
+        self.response = response
+        self.headers: Dict[str, str] = {}
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None, **kwargs):
+        return self.response
+
+
+def build_cases(scales: List[int]) -> List[Tuple[str, int, Callable[[], Any]]]:
+    """(name, scale, zero-argument callable) for every benchmark case"""
+    from core.backends import FakeBackend
+    from core.cassette import CassetteResponse
+    from core.llm import LLM
+    from core.multi_platform import SimpleMultiPlatformScraper
+    from core.research import ValidatorAgent
+    from core.research_intelligence import ResearchIntelligence
+    from core.arxiv import search_arxiv
+
+    app = load_app_functions(["build_author_insight_mapping", "analyze_shared_timeline"])
+    llm = LLM(backend=FakeBackend())
+    validator = ValidatorAgent(llm)
+    intelligence = ResearchIntelligence(llm)
+    cases = []
+
+    for scale in scales:
+        papers = make_papers(scale)
+        insights = make_insights(max(3, scale // 5), papers)
+
+        for variant, text in llm_response_variants(insights).items():
+            cases.append((f"extract_json[{variant}]", scale, lambda text=text: llm.extract_json(text)))
+        raw = llm_response_variants(insights)["trailing_commas"]
+        cases.append(("_clean_json", scale, lambda raw=raw: llm._clean_json(raw)))
+
+        feed = CassetteResponse("http://export.arxiv.org/api/query", 200, atom_feed(scale))
+        session = StaticHTTP(feed)
+        cases.append(("search_arxiv[parse]", scale,
+                      lambda session=session, n=scale: search_arxiv("bench", max_results=n, session=session)))
+        scraper = SimpleMultiPlatformScraper(enabled_sources={"arxiv"}, session=session)
+        cases.append(("_search_arxiv[parse]", scale, lambda scraper=scraper, n=scale: scraper._search_arxiv("bench", n)))
+
+        cases.append(("_extract_themes_fallback", scale,
+                      lambda papers=papers: intelligence._extract_themes_fallback(papers, "bench")))
+        cases.append(("_extract_search_keywords", scale, lambda insights=insights: [
+            validator._extract_search_keywords(i["gap"], i["title"], "bench") for i in insights
+        ]))
+
+        cases.append(("build_author_insight_mapping", scale,
+                      lambda papers=papers, insights=insights: app["build_author_insight_mapping"](papers, insights)))
+        week_insights = make_insights(max(3, scale // 5), papers, week_format=True)
+        cases.append(("analyze_shared_timeline[phases]", scale,
+                      lambda insights=insights: app["analyze_shared_timeline"](insights)))
+        cases.append(("analyze_shared_timeline[weeks]", scale,
+                      lambda insights=week_insights: app["analyze_shared_timeline"](insights)))
+    return cases
+
+
+def time_case(func: Callable[[], Any], repeat: int, min_time: float) -> Dict[str, float]:
+    """Per-call timings in microseconds (best and median of repeat rounds)"""
+    timer = timeit.Timer(func)
+    number, elapsed = timer.autorange()
+    # Scale the loop count so each round takes at least min_time
+    if elapsed < min_time:
+        number = max(number, int(number * min_time / max(elapsed, 1e-9)))
+    rounds = [t / number * 1e6 for t in timer.repeat(repeat=repeat, number=number)]
+    return {"best_us": round(min(rounds), 3), "median_us": round(statistics.median(rounds), 3), "loops": number}
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: str, threshold: float) -> int:
+    """Print per-case deltas against a previous results file; returns number of regressions"""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {(r["name"], r["scale"]): r for r in json.load(f)["results"]}
+    regressions = 0
+    print(f"\nComparison against {baseline_path} (regression threshold {threshold:.0%}):")
+    for result in results:
+        before = baseline.get((result["name"], result["scale"]))
+        if not before:
+            continue
+        change = (result["best_us"] - before["best_us"]) / before["best_us"] if before["best_us"] else 0.0
+        flag = "  ⚠️ regression" if change > threshold else ""
+        regressions += 1 if flag else 0
+        print(f"  {result['name']:36s} n={result['scale']:<5d} {before['best_us']:12.1f} → {result['best_us']:12.1f} µs ({change:+.1%}){flag}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for parsing and text hot paths")
+    parser.add_argument("--scales", type=int, nargs="+", default=[5, 50, 500], help="Papers per input")
+    parser.add_argument("--filter", help="Only run cases whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing rounds per case")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Minimum seconds per round")
+    parser.add_argument("--output", help="Results JSON path (default: benchmarks/results/micro_<commit>.json)")
+    parser.add_argument("--compare", help="Previous results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative slowdown flagged as a regression")
+    args = parser.parse_args(argv)
+
+    commit = git_commit()
+    results = []
+    cases = build_cases(args.scales)
+    for name, scale, func in cases:
+        if args.filter and args.filter not in name:
+            continue
+        # Keep parse-error prints from the functions under test out of the report
+        with contextlib.redirect_stdout(io.StringIO()):
+            timing = time_case(func, args.repeat, args.min_time)
+        results.append({"name": name, "scale": scale, **timing})
+        print(f"{name:36s} n={scale:<5d} best={timing['best_us']:12.1f} µs  median={timing['median_us']:12.1f} µs")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"micro_{commit or 'local'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({
+            "meta": {
+                "commit": commit,
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "args": {k: v for k, v in vars(args).items() if k not in ("output", "compare")},
+            },
+            "results": results,
+        }, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        return 1 if compare(results, args.compare, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
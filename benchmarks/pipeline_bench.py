@@ -0,0 +1,232 @@
+"""
+End-to-end benchmark for the research pipeline.
+
+Runs ResearchAgent.search_papers + generate_insights offline: paper
+searches are replayed from a cassette (synthetic fixtures recorded on first
+use, or a cassette recorded from live traffic) and the LLM is the
+deterministic fake backend with simulated latency. Each case runs in a
+fresh process so peak RSS is per case. Per-stage wall times (search per
+source, ResearchIntelligence, each agent) come from the run's trace spans.
+
+Usage:
+    python -m benchmarks.pipeline_bench
+    python -m benchmarks.pipeline_bench --papers 5 20 --sources arxiv arxiv,pwc,hf --repeat 3
+    python -m benchmarks.pipeline_bench --compare benchmarks/results/pipeline_<commit>.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+
+DEFAULT_PAPER_COUNTS = [5, 20, 50, 100]
+DEFAULT_SOURCE_SETS = ["arxiv", "arxiv,pwc,hf", "arxiv,pwc,hf,pubmed,biorxiv"]
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def trace_stages(spans: List[Dict[str, Any]]) -> Dict[str, float]:
+    """
+    Wall seconds per pipeline stage from a run's trace.
+
+    Stages are the spans directly under the search and pipeline root spans
+    (search_arxiv or search.all, ResearchIntelligence.*, the agents), plus
+    the per-source search.<source> spans of a multi-platform search. Spans
+    with the same name are summed.
+    """
+    ids = {s["span_id"] for s in spans}
+    roots = {s["span_id"] for s in spans if s.get("parent_id") not in ids}
+    parents = roots | {s["span_id"] for s in spans if s["name"] == "search.all"}
+    stages: Dict[str, float] = {}
+    for s in spans:
+        if s.get("parent_id") in parents and s["span_id"] not in roots:
+            stages[s["name"]] = stages.get(s["name"], 0.0) + (s.get("duration") or 0.0)
+    return {name: round(seconds, 4) for name, seconds in stages.items()}
+
+
+def run_case(case: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one search + generate case and return its measurements"""
+    # Every case pays for field context generation; a warm store would hide it
+    os.environ["FIELD_CONTEXT_STORE"] = "off"
+    from core.backends import FakeBackend
+    from core.cassette import CassetteSession
+    from core.llm import LLM
+    from core.research import ResearchAgent
+    from benchmarks.fixtures import FixtureHTTP
+
+    sources = case["sources"].split(",")
+    multi = sources != ["arxiv"]
+    session = CassetteSession(case["cassette"], mode=case["cassette_mode"],
+                              replay_latency=case["http_latency"], transport=FixtureHTTP(case["seed"]))
+    llm = LLM(backend=FakeBackend(latency=case["llm_latency"], seconds_per_token=case["seconds_per_token"]))
+
+    log = io.StringIO()
+    redirect = contextlib.nullcontext() if case["verbose"] else contextlib.redirect_stdout(log)
+    with redirect:
+        agent = ResearchAgent(use_multi_platform=multi, enabled_sources=set(sources) if multi else None,
+                              pipelined_validation=case["pipelined"],
+                              validation_batch_size=case["batch_size"], llm=llm, http_session=session)
+
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        papers = agent.search_papers(case["topic"], case["papers"])
+        search_wall, search_cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        insights = agent.generate_insights(papers, case["topic"])
+        generate_wall, generate_cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+
+    usage = agent.get_usage_summary()
+    stages = {"search": round(search_wall, 4), **trace_stages(agent.get_trace())}
+
+    return {
+        "papers_found": len(papers),
+        "insights": len(insights),
+        "wall_seconds": {"search": search_wall, "generate": generate_wall, "total": search_wall + generate_wall},
+        "cpu_seconds": {"search": search_cpu, "generate": generate_cpu, "total": search_cpu + generate_cpu},
+        "stage_wall_seconds": stages,
+        "peak_rss_mb": peak_rss_mb(),
+        "llm_calls": usage["total"]["calls"],
+        "tokens": {"prompt": usage["total"]["prompt_tokens"], "output": usage["total"]["output_tokens"],
+                   "total": usage["total"]["total_tokens"]},
+        "llm_by_stage": usage["stages"],
+    }
+
+
+def run_isolated(case: Dict[str, Any]) -> Dict[str, Any]:
+    """Run a case in a fresh interpreter so peak RSS is not shared between cases"""
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(1) as pool:
+        return pool.apply(run_case, (case,))
+
+
+def summarize_runs(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Median timings and max peak RSS over repeated runs"""
+    first = runs[0]
+    median = lambda values: round(statistics.median(values), 4)
+    return {
+        "repeats": len(runs),
+        "papers_found": first["papers_found"],
+        "insights": first["insights"],
+        "wall_seconds": {k: median([r["wall_seconds"][k] for r in runs]) for k in first["wall_seconds"]},
+        "cpu_seconds": {k: median([r["cpu_seconds"][k] for r in runs]) for k in first["cpu_seconds"]},
+        "stage_wall_seconds": {k: median([r["stage_wall_seconds"].get(k, 0.0) for r in runs])
+                               for k in dict.fromkeys(k for r in runs for k in r["stage_wall_seconds"])},
+        "peak_rss_mb": round(max(r["peak_rss_mb"] for r in runs), 1),
+        "llm_calls": first["llm_calls"],
+        "tokens": first["tokens"],
+        "llm_by_stage": first["llm_by_stage"],
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return None
+
+
+def case_key(result: Dict[str, Any]) -> str:
+    return f"{result['sources']}|{result['papers']}"
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: str, threshold: float) -> int:
+    """Print per-case deltas against a previous results file; returns number of regressions"""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {case_key(r): r for r in json.load(f)["results"]}
+    regressions = 0
+    print(f"\nComparison against {baseline_path} (regression threshold {threshold:.0%}):")
+    for result in results:
+        before = baseline.get(case_key(result))
+        if not before:
+            continue
+        for metric, now, then in [
+            ("wall", result["wall_seconds"]["total"], before["wall_seconds"]["total"]),
+            ("cpu", result["cpu_seconds"]["total"], before["cpu_seconds"]["total"]),
+            ("rss", result["peak_rss_mb"], before["peak_rss_mb"]),
+            ("tokens", result["tokens"]["total"], before["tokens"]["total"]),
+        ]:
+            change = (now - then) / then if then else 0.0
+            flag = "  ⚠️ regression" if change > threshold else ""
+            regressions += 1 if flag else 0
+            print(f"  {case_key(result):40s} {metric:6s} {then:10.3f} → {now:10.3f} ({change:+.1%}){flag}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="End-to-end pipeline benchmark (offline)")
+    parser.add_argument("--papers", type=int, nargs="+", default=DEFAULT_PAPER_COUNTS, help="Paper counts to sweep")
+    parser.add_argument("--sources", nargs="+", default=DEFAULT_SOURCE_SETS,
+                        help="Comma-separated source sets; 'arxiv' alone uses the single-source search path")
+    parser.add_argument("--topic", default="graph neural networks")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per case (median is reported)")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Simulated seconds per LLM call")
+    parser.add_argument("--seconds-per-token", type=float, default=0.0, help="Simulated seconds per output token")
+    parser.add_argument("--http-latency", type=float, default=0.0, help="Simulated seconds per replayed request")
+    parser.add_argument("--cassette", default=os.path.join(RESULTS_DIR, "fixtures_cassette.json"),
+                        help="Cassette file; missing requests are filled from synthetic fixtures")
+    parser.add_argument("--cassette-mode", default="once", choices=["once", "replay"])
+    parser.add_argument("--seed", type=int, default=0, help="Fixture seed")
+    parser.add_argument("--sequential", action="store_true", help="Disable pipelined validation")
+    parser.add_argument("--batch-size", type=int, default=3, help="Validation batch size")
+    parser.add_argument("--output", help="Results JSON path (default: benchmarks/results/pipeline_<commit>.json)")
+    parser.add_argument("--compare", help="Previous results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative change flagged as a regression")
+    parser.add_argument("--verbose", action="store_true", help="Show pipeline output")
+    args = parser.parse_args(argv)
+
+    commit = git_commit()
+    results = []
+    for sources in args.sources:
+        for papers in args.papers:
+            case = {
+                "sources": sources, "papers": papers, "topic": args.topic, "seed": args.seed,
+                "cassette": args.cassette, "cassette_mode": args.cassette_mode,
+                "llm_latency": args.llm_latency, "seconds_per_token": args.seconds_per_token,
+                "http_latency": args.http_latency, "pipelined": not args.sequential,
+                "batch_size": args.batch_size, "verbose": args.verbose,
+            }
+            runs = [run_isolated(case) for _ in range(max(1, args.repeat))]
+            summary = summarize_runs(runs)
+            results.append({"sources": sources, "papers": papers, **summary})
+            print(f"{sources:32s} papers={papers:<4d} wall={summary['wall_seconds']['total']:7.2f}s "
+                  f"cpu={summary['cpu_seconds']['total']:6.2f}s rss={summary['peak_rss_mb']:6.1f}MB "
+                  f"calls={summary['llm_calls']:<3d} tokens={summary['tokens']['total']}")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"pipeline_{commit or 'local'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({
+            "meta": {
+                "commit": commit,
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "args": {k: v for k, v in vars(args).items() if k not in ("output", "compare")},
+            },
+            "results": results,
+        }, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        return 1 if compare(results, args.compare, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
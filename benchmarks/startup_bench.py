@@ -0,0 +1,144 @@
+"""
+Cold-start benchmark for the app and core package.
+
+Each measurement runs in a fresh interpreter so module caches are cold:
+import time of core entry points, and first paint of app.py (script
+import plus its first full run under streamlit.testing's AppTest, with the
+fake LLM backend) including the size of the page payload sent on that run.
+
+Usage:
+    python -m benchmarks.startup_bench
+    python -m benchmarks.startup_bench --repeat 7
+    python -m benchmarks.startup_bench --compare benchmarks/results/startup_<commit>.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+
+from benchmarks.pipeline_bench import RESULTS_DIR, git_commit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORT_TARGETS = ["core", "core.research", "core.llm", "core.multi_platform"]
+
+IMPORT_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+__import__(sys.argv[1])
+seconds = time.perf_counter() - start
+heavy = [m for m in ("google.generativeai", "requests", "numpy") if m in sys.modules]
+print(json.dumps({"seconds": seconds, "loaded": heavy}))
+"""
+
+PAINT_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+ready = time.perf_counter()
+app = AppTest.from_file(sys.argv[1], default_timeout=120)
+app.run()
+done = time.perf_counter()
+html_bytes = sum(len(m.value.encode()) for m in app.markdown)
+print(json.dumps({"streamlit_import": ready - start, "first_run": done - ready, "total": done - start,
+                  "markdown_bytes": html_bytes, "exceptions": [str(e.value) for e in app.exception]}))
+"""
+
+
+def run_fresh(script: str, args: List[str]) -> Dict[str, Any]:
+    """Run a measurement script in a new interpreter and parse its JSON line"""
+    output = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", script, *args], cwd=ROOT, capture_output=True, text=True,
+        env={**os.environ, "PYTHONPATH": ROOT, "LLM_BACKEND": "fake"}, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def median(values: List[float]) -> float:
+    return round(statistics.median(values), 4)
+
+
+def bench_imports(repeat: int) -> List[Dict[str, Any]]:
+    results = []
+    for module in IMPORT_TARGETS:
+        runs = [run_fresh(IMPORT_SCRIPT, [module]) for _ in range(repeat)]
+        results.append({"case": f"import {module}", "seconds": median([r["seconds"] for r in runs]),
+                        "loaded": runs[0]["loaded"]})
+    return results
+
+
+def bench_first_paint(repeat: int) -> List[Dict[str, Any]]:
+    runs = [run_fresh(PAINT_SCRIPT, [os.path.join(ROOT, "app.py")]) for _ in range(repeat)]
+    if runs[0]["exceptions"]:
+        print(f"⚠️  app.py raised during first run: {runs[0]['exceptions'][0][:200]}")
+    return [{
+        "case": "first paint",
+        "seconds": median([r["first_run"] for r in runs]),
+        "total_seconds": median([r["total"] for r in runs]),
+        "markdown_bytes": runs[0]["markdown_bytes"],
+    }]
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: str, threshold: float) -> int:
+    """Print per-case deltas against a previous results file; returns number of regressions"""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {r["case"]: r for r in json.load(f)["results"]}
+    regressions = 0
+    print(f"\nComparison against {baseline_path} (regression threshold {threshold:.0%}):")
+    for result in results:
+        before = baseline.get(result["case"])
+        if not before:
+            continue
+        change = (result["seconds"] - before["seconds"]) / before["seconds"] if before["seconds"] else 0.0
+        flag = "  ⚠️ regression" if change > threshold else ""
+        regressions += 1 if flag else 0
+        print(f"  {result['case']:36s} {before['seconds']:8.3f}s → {result['seconds']:8.3f}s ({change:+.1%}){flag}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Cold-start benchmark (imports and first paint)")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh processes per case (median is reported)")
+    parser.add_argument("--skip-paint", action="store_true", help="Only measure imports")
+    parser.add_argument("--output", help="Results JSON path (default: benchmarks/results/startup_<commit>.json)")
+    parser.add_argument("--compare", help="Previous results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative change flagged as a regression")
+    args = parser.parse_args(argv)
+
+    repeat = max(1, args.repeat)
+    results = bench_imports(repeat)
+    if not args.skip_paint:
+        results += bench_first_paint(repeat)
+    for result in results:
+        extra = f"  loads {', '.join(result['loaded'])}" if result.get("loaded") else ""
+        if "markdown_bytes" in result:
+            extra = f"  total={result['total_seconds']:.3f}s  markdown={result['markdown_bytes'] / 1024:.1f} KB"
+        print(f"{result['case']:36s} {result['seconds']:8.3f}s{extra}")
+
+    commit = git_commit()
+    output = args.output or os.path.join(RESULTS_DIR, f"startup_{commit or 'local'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({
+            "meta": {
+                "commit": commit,
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "args": {k: v for k, v in vars(args).items() if k not in ("output", "compare")},
+            },
+            "results": results,
+        }, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        return 1 if compare(results, args.compare, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,5 +5,6 @@ Provides research agent system, paper search, and language model interfaces.
 """
 from .research import ResearchAgent
 from .arxiv import Paper
+from .budget import RunBudget
 
-__all__ = ["ResearchAgent", "Paper"]
+__all__ = ["ResearchAgent", "Paper", "RunBudget"]
@@ -4,10 +4,12 @@ arXiv paper search and data retrieval.
 Provides functionality to search and retrieve academic papers
 from the arXiv preprint repository.
 """
-import requests
+import time
 import xml.etree.ElementTree as ET
-from typing import List, Dict
+from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
+from .tracing import span, traced
+from . import metrics
 
 @dataclass
 class Paper:
@@ -18,13 +20,16 @@ class Paper:
     year: int
     url: str
 
-def search_arxiv(query: str, max_results: int = 5) -> List[Paper]:
+@traced("search_arxiv")
+def search_arxiv(query: str, max_results: int = 5, timeout: float = 15, session: Optional[Any] = None) -> List[Paper]:
     """
     Search arXiv for papers matching the query.
     
     Args:
         query: Search query string
         max_results: Maximum number of results to return
+        timeout: Request timeout in seconds
+        session: Object with a requests-style get() (e.g. a CassetteSession); defaults to requests
         
     Returns:
         List of Paper objects
@@ -37,8 +42,14 @@ def search_arxiv(query: str, max_results: int = 5) -> List[Paper]:
         "sortBy": "relevance"
     }
     
+    start_time = time.time()
     try:
-        response = requests.get(url, params=params, timeout=15)
+        with span("http.get", url=url) as http_span:
+            if session is None:
+                import requests  # Deferred: only live searches need it
+                session = requests
+            response = session.get(url, params=params, timeout=timeout)
+            http_span.set(status_code=response.status_code, bytes=len(response.content))
         response.raise_for_status()
         
         root = ET.fromstring(response.content)
@@ -74,8 +85,11 @@ def search_arxiv(query: str, max_results: int = 5) -> List[Paper]:
                 print(f"Error parsing arXiv entry: {e}")
                 continue
         
-        return papers[:max_results]  # Ensure we don't return more than requested
+        papers = papers[:max_results]  # Ensure we don't return more than requested
+        metrics.observe_search("arxiv", time.time() - start_time, len(papers))
+        return papers
     except Exception as e:
         print(f"Error searching arXiv: {e}")
+        metrics.observe_search("arxiv", time.time() - start_time, None)
         return []
 
@@ -0,0 +1,564 @@
+"""
+Language model backends.
+
+LLM delegates text generation to a backend so the pipeline can run against
+Gemini in production or against a deterministic local backend for
+benchmarks, load tests and offline development.
+
+Select the backend with the LLM_BACKEND environment variable ("gemini" or
+"fake"); FAKE_LLM_LATENCY sets the simulated seconds per fake call.
+"""
+import hashlib
+import importlib.util
+import json
+import os
+import random
+import re
+import threading
+import time
+from datetime import timedelta
+from dataclasses import dataclass
+from typing import Optional, Any, List, Dict, Iterator
+from .budget import estimate_tokens
+
+# Gemini SDK (optional dependency when running on the fake backend). Importing it
+# takes about half a second, so it is loaded when the first GeminiBackend is built.
+try:
+    GENAI_AVAILABLE = importlib.util.find_spec("google.generativeai") is not None
+except ImportError:
+    GENAI_AVAILABLE = False
+genai = None
+
+
+def load_genai():
+    """Import the Gemini SDK on first use"""
+    global genai
+    if genai is None:
+        import google.generativeai
+        genai = google.generativeai
+    return genai
+
+
+# Gemini Candidate.FinishReason values, for SDK versions that return plain ints
+FINISH_REASONS = {0: "FINISH_REASON_UNSPECIFIED", 1: "STOP", 2: "MAX_TOKENS", 3: "SAFETY",
+                  4: "RECITATION", 5: "OTHER"}
+
+# Prompt scaffolding words that are never useful as fake keywords
+PROMPT_WORDS = {"abstract", "authors", "across", "papers", "between", "recent", "research"}
+
+
+@dataclass
+class Generation:
+    """
+    Text produced by a backend, or one chunk of a streamed response.
+
+    Token counts are None when the backend does not report usage; for
+    streams, only the final chunk carries them. finish_reason is the
+    model's stop reason name (e.g. "STOP", "MAX_TOKENS", "SAFETY") when known.
+    cached_tokens is the part of prompt_tokens served from a context cache.
+    """
+    text: str
+    prompt_tokens: Optional[int] = None
+    output_tokens: Optional[int] = None
+    finish_reason: Optional[str] = None
+    cached_tokens: Optional[int] = None
+
+
+class LLMBackend:
+    """
+    Interface for text generation backends.
+
+    generate() returns the full response text; error conditions reported
+    by the model (blocked, truncated) come back as "Error: ..." text, while
+    transport failures raise. stream() yields Generation chunks.
+    """
+    name = "base"
+
+    def generate(self, prompt: str, max_tokens: int, timeout: float) -> Generation:
+        raise NotImplementedError
+
+    def stream(self, prompt: str, max_tokens: int, timeout: float) -> Iterator[Generation]:
+        # Backends without native streaming produce a single chunk
+        yield self.generate(prompt, max_tokens, timeout)
+
+    def cache_prefix(self, prefix: str, ttl_seconds: int) -> bool:
+        """
+        Hold a prompt prefix in a provider-side context cache.
+
+        Later prompts that start with prefix reuse the cached tokens. Returns
+        False when the backend has no context cache (the default).
+        """
+        return False
+
+    def release_prefix(self, prefix: Optional[str] = None) -> None:
+        """Drop the cached prefix (all cached prefixes when None), if any"""
+
+
+class GeminiBackend(LLMBackend):
+    """Google Gemini API with configured safety settings and generation parameters"""
+    name = "gemini"
+
+    # Smallest prefix the API accepts for explicit context caching
+    MIN_CACHE_TOKENS = 1024
+
+    def __init__(self, model_name: str = "gemini-2.5-flash"):
+        if not GENAI_AVAILABLE:
+            raise ImportError("google-generativeai is not installed")
+        api_key = os.getenv("GOOGLE_API_KEY")
+        if not api_key:
+            raise ValueError("GOOGLE_API_KEY not found in .env")
+        load_genai()
+        genai.configure(api_key=api_key)
+        self.model_name = model_name
+        self.model = genai.GenerativeModel(model_name)
+        # One backend can serve concurrent runs. Runs that build the same prefix share
+        # its cache, which is deleted when the last of them releases it
+        self._prefix_caches: Dict[str, Dict[str, Any]] = {}
+        self._prefix_lock = threading.Lock()
+
+    def generate(self, prompt: str, max_tokens: int, timeout: float) -> Generation:
+        model, prompt = self._model_for(prompt)
+        response = model.generate_content(
+            prompt, request_options={"timeout": timeout}, **self._generation_kwargs(max_tokens)
+        )
+        prompt_tokens, output_tokens = self._usage_metadata(response)
+        return Generation(self._response_text(response), prompt_tokens, output_tokens,
+                          self._finish_reason(response), self._cached_tokens(response))
+
+    def stream(self, prompt: str, max_tokens: int, timeout: float) -> Iterator[Generation]:
+        model, prompt = self._model_for(prompt)
+        response = model.generate_content(
+            prompt, stream=True, request_options={"timeout": timeout},
+            **self._generation_kwargs(max_tokens)
+        )
+        for chunk in response:
+            # Every chunk may carry usage metadata; the last one covers the whole stream
+            prompt_tokens, output_tokens = self._usage_metadata(chunk)
+            yield Generation(self._chunk_text(chunk), prompt_tokens, output_tokens,
+                             self._finish_reason(chunk), self._cached_tokens(chunk))
+
+    def cache_prefix(self, prefix: str, ttl_seconds: int) -> bool:
+        if estimate_tokens(prefix) < self.MIN_CACHE_TOKENS:
+            return False
+        with self._prefix_lock:
+            entry = self._prefix_caches.get(prefix)
+            if entry is not None:
+                entry["refs"] += 1
+                return True
+        try:
+            from google.generativeai import caching
+            cache = caching.CachedContent.create(
+                model=f"models/{self.model_name}", contents=[prefix], ttl=timedelta(seconds=ttl_seconds)
+            )
+            model = genai.GenerativeModel.from_cached_content(cached_content=cache)
+        except Exception as e:
+            print(f"⚠️  Context cache unavailable, using compact context: {e}")
+            return False
+        with self._prefix_lock:
+            entry = self._prefix_caches.get(prefix)
+            if entry is None:
+                self._prefix_caches[prefix] = {"cache": cache, "model": model, "refs": 1}
+                return True
+            # Another run cached the same prefix meanwhile: share that one
+            entry["refs"] += 1
+        self._delete_caches([{"cache": cache}])
+        return True
+
+    def release_prefix(self, prefix: Optional[str] = None) -> None:
+        """Drop one run's reference to prefix (every cached prefix when None)"""
+        with self._prefix_lock:
+            if prefix is None:
+                released = list(self._prefix_caches.values())
+                self._prefix_caches.clear()
+            else:
+                entry = self._prefix_caches.get(prefix)
+                released = []
+                if entry is not None:
+                    entry["refs"] -= 1
+                    if entry["refs"] <= 0:
+                        released.append(self._prefix_caches.pop(prefix))
+        self._delete_caches(released)
+
+    @staticmethod
+    def _delete_caches(released: List[Dict[str, Any]]) -> None:
+        for cached in released:
+            try:
+                cached["cache"].delete()
+            except Exception as e:
+                # Expires on its own after the TTL
+                print(f"⚠️  Could not delete context cache: {e}")
+
+    def _model_for(self, prompt: str):
+        """Model and prompt to send: prompts starting with the cached prefix send only the rest"""
+        with self._prefix_lock:
+            cached = list(self._prefix_caches.items())
+        for prefix, entry in cached:
+            if prompt.startswith(prefix):
+                return entry["model"], prompt[len(prefix):]
+        return self.model, prompt
+
+    def _generation_kwargs(self, max_tokens: int) -> Dict[str, Any]:
+        """Shared generation config and safety settings for all calls"""
+        return {
+            "generation_config": genai.types.GenerationConfig(
+                max_output_tokens=max_tokens,
+                temperature=0.7
+            ),
+            "safety_settings": [
+                {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_NONE"},
+                {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_NONE"},
+                {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_NONE"},
+                {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_NONE"},
+            ]
+        }
+
+    def _usage_metadata(self, response: Any):
+        """Read (prompt, output) token counts from a response, if reported"""
+        metadata = getattr(response, 'usage_metadata', None)
+        prompt_tokens = getattr(metadata, 'prompt_token_count', None) if metadata else None
+        if not prompt_tokens:
+            return None, None
+        return prompt_tokens, getattr(metadata, 'candidates_token_count', 0) or 0
+
+    def _cached_tokens(self, response: Any) -> Optional[int]:
+        metadata = getattr(response, 'usage_metadata', None)
+        return getattr(metadata, 'cached_content_token_count', None) if metadata else None
+
+    def _finish_reason(self, response: Any) -> Optional[str]:
+        """Name of the first candidate's finish reason, if reported"""
+        candidates = getattr(response, 'candidates', None) or []
+        reason = getattr(candidates[0], 'finish_reason', None) if candidates else None
+        if reason is None:
+            return None
+        if isinstance(reason, int) and not hasattr(reason, 'name'):
+            return FINISH_REASONS.get(reason, str(reason))
+        return getattr(reason, 'name', str(reason))
+
+    def _response_text(self, response: Any) -> str:
+        """Extract text (or an "Error: ..." message) from a complete response"""
+        if not response.candidates:
+            return "Error: No candidates in response"
+
+        candidate = response.candidates[0]
+        finish_reason = getattr(candidate, 'finish_reason', None)
+
+        # Extract text from response, trying multiple access patterns for API compatibility
+        try:
+            text = response.text
+            if text:
+                return text
+        except (ValueError, AttributeError):
+            pass
+
+        # Fallback to content.parts structure if direct text access fails
+        if hasattr(candidate, 'content') and candidate.content:
+            parts = getattr(candidate.content, 'parts', [])
+            if parts:
+                text_parts = []
+                for part in parts:
+                    if hasattr(part, 'text') and part.text:
+                        text_parts.append(part.text)
+                if text_parts:
+                    return ''.join(text_parts)
+
+        # Handle API-specific finish reasons
+        if finish_reason == 2:  # MAX_TOKENS
+            return "Error: Response truncated - increase max_tokens"
+        elif finish_reason == 3:  # SAFETY
+            return "Error: Blocked by safety filters"
+
+        return f"Error: Could not extract text (finish_reason: {finish_reason})"
+
+    def _chunk_text(self, chunk: Any) -> str:
+        """Extract text from a streamed response chunk"""
+        try:
+            text = chunk.text
+            if text:
+                return text
+        except (ValueError, AttributeError):
+            pass
+
+        # Chunks without quick-accessor text still carry content.parts
+        candidates = getattr(chunk, 'candidates', None) or []
+        if candidates and getattr(candidates[0], 'content', None):
+            parts = getattr(candidates[0].content, 'parts', [])
+            return ''.join(part.text for part in parts if getattr(part, 'text', None))
+        return ""
+
+
+class FakeBackend(LLMBackend):
+    """
+    Deterministic local backend for benchmarks and offline runs.
+
+    Recognises each agent prompt (Analyzer, Skeptic, Synthesizer, Validator
+    and the ResearchIntelligence prompts) and returns schema-valid JSON built
+    from the papers in the prompt. The same prompt always produces the same
+    response, so runs are reproducible.
+
+    Args:
+        latency: Simulated seconds per call
+        seconds_per_token: Additional simulated seconds per output token
+        stream_chunk_chars: Characters per streamed chunk
+    """
+    name = "fake"
+
+    def __init__(self, latency: float = 0.0, seconds_per_token: float = 0.0,
+                 stream_chunk_chars: int = 200):
+        self.latency = latency
+        self.seconds_per_token = seconds_per_token
+        self.stream_chunk_chars = max(1, stream_chunk_chars)
+
+    def generate(self, prompt: str, max_tokens: int, timeout: float) -> Generation:
+        text = self.respond(prompt)
+        self._sleep(self._simulated_seconds(text), timeout)
+        return Generation(text, estimate_tokens(prompt), estimate_tokens(text), "STOP")
+
+    def stream(self, prompt: str, max_tokens: int, timeout: float) -> Iterator[Generation]:
+        text = self.respond(prompt)
+        chunks = [text[i:i + self.stream_chunk_chars] for i in range(0, len(text), self.stream_chunk_chars)]
+        # Spread the simulated latency evenly over the chunks
+        per_chunk = self._simulated_seconds(text) / max(1, len(chunks))
+        started = time.time()
+        for n, chunk in enumerate(chunks):
+            self._sleep(per_chunk, timeout - (time.time() - started))
+            last = n == len(chunks) - 1
+            yield Generation(chunk, estimate_tokens(prompt) if last else None,
+                             estimate_tokens(text) if last else None, "STOP" if last else None)
+
+    def _simulated_seconds(self, text: str) -> float:
+        return self.latency + self.seconds_per_token * estimate_tokens(text)
+
+    def _sleep(self, seconds: float, timeout: float) -> None:
+        if seconds <= 0:
+            return
+        if seconds > timeout:
+            time.sleep(max(0.0, timeout))
+            raise TimeoutError(f"Fake backend call exceeded {timeout:.1f}s timeout")
+        time.sleep(seconds)
+
+    def respond(self, prompt: str) -> str:
+        """Deterministic response text for a prompt"""
+        rng = random.Random(hashlib.sha256(prompt.encode("utf-8")).hexdigest())
+        titles = self._paper_titles(prompt)
+        if "Dr. Sarah Chen" in prompt:
+            return json.dumps(self._analyzer(rng, titles))
+        if "Dr. Marcus Thompson" in prompt:
+            return json.dumps(self._skeptic(rng, titles))
+        if "Dr. Alex Rivera" in prompt:
+            return json.dumps(self._synthesizer(rng, titles))
+        if "Dr. James Park" in prompt:
+            ids = [int(n) for n in re.findall(r"=== INSIGHT (\d+) ===", prompt)]
+            if ids:
+                return json.dumps([dict(insight_id=n, **self._verdict(rng)) for n in ids])
+            return json.dumps(self._verdict(rng))
+        if "extracting key themes" in prompt:
+            return json.dumps(self._themes(rng, prompt))
+        if "methodology combinations" in prompt:
+            return json.dumps(self._combinations(rng, titles))
+        if "Analyze temporal trends" in prompt:
+            return json.dumps(self._trends(prompt))
+        if "identify SPECIFIC research gaps" in prompt:
+            return json.dumps(self._gaps(rng, titles))
+        if "field context" in prompt.lower():
+            return self._field_context(prompt)
+        return "This is a deterministic response from the fake language model backend."
+
+    def _paper_titles(self, prompt: str) -> List[str]:
+        """Paper titles referenced in a prompt, in order"""
+        titles = re.findall(r"^Title: (.+)$", prompt, re.MULTILINE)
+        if not titles:
+            titles = re.findall(r"^\d+\. ([^:\n]+)", prompt, re.MULTILINE)
+        return [t.strip() for t in titles] or ["the reviewed work"]
+
+    def _keywords(self, text: str, n: int = 8) -> List[str]:
+        words = re.findall(r"\b[a-z]{6,}\b", text.lower())
+        seen = []
+        for word in words:
+            if word not in seen and word not in PROMPT_WORDS:
+                seen.append(word)
+        return seen[:n] or ["methods"]
+
+    def _analyzer(self, rng: random.Random, titles: List[str]) -> Dict[str, Any]:
+        keywords = self._keywords(" ".join(titles))
+        return {
+            "dialogue_message": f"I've analyzed {len(titles)} papers. Limitation: evaluation is narrow. This suggests a shared blind spot around {keywords[0]}.",
+            "paper_analyses": [
+                {
+                    "paper_num": i + 1,
+                    "methods": [f"{rng.choice(keywords)} model"],
+                    "datasets": [f"{rng.choice(keywords).title()}Bench"],
+                    "limitations": [f"Only evaluated on small-scale {rng.choice(keywords)} data",
+                                    "Assumes clean labels"]
+                }
+                for i, _ in enumerate(titles)
+            ],
+            "cross_paper_gaps": [
+                {
+                    "gap": f"No paper evaluates {keywords[i % len(keywords)]} beyond small benchmarks",
+                    "severity": rng.choice(["high", "medium"]),
+                    "papers_affected": list(range(1, len(titles) + 1)),
+                    "why_matters": f"Limits deployment of {keywords[(i + 1) % len(keywords)]} systems at scale"
+                }
+                for i in range(3)
+            ]
+        }
+
+    def _skeptic(self, rng: random.Random, titles: List[str]) -> Dict[str, Any]:
+        keywords = self._keywords(" ".join(titles))
+        return {
+            "dialogue_message": f"So it's a consistent story, but are the {keywords[0]} gains real? Question: would they hold on harder benchmarks?",
+            "contradictions": [
+                {"papers": [1, 2], "contradiction": f"Different reported gains for {keywords[0]}",
+                 "evidence": "Evaluation settings differ"}
+            ] if len(titles) > 1 else [],
+            "potential_contradictions": [
+                {"description": f"Benchmark saturation in {rng.choice(keywords)}",
+                 "field_evidence": "Scores cluster near ceiling",
+                 "suggested_investigation": "Re-run on held-out data"}
+            ],
+            "challenged_gaps": [
+                {"gap": f"Scale of {keywords[0]} evaluation", "challenge": "May be a compute limitation rather than a gap",
+                 "severity": "moderate"}
+            ],
+            "missing_analysis": ["Cost of training"],
+            "field_insights": f"The field is converging on {keywords[0]} without direct comparisons.",
+            "interpretation": "Few contradictions suggest papers avoid head-to-head comparisons.",
+            "field_knowledge_contradictions": f"Known debate about whether {keywords[-1]} generalises."
+        }
+
+    def _synthesizer(self, rng: random.Random, titles: List[str]) -> Dict[str, Any]:
+        keywords = self._keywords(" ".join(titles))
+        insights = []
+        for i in range(3):
+            keyword = keywords[i % len(keywords)]
+            insights.append({
+                "title": f"{keyword.title()} as a Driver of Robust Generalization",
+                "source_papers": titles[:2],
+                "observation": f"Several papers rely on {keyword} without measuring its effect.",
+                "hypothesis": f"Explicitly controlling {keyword} improves robustness under distribution shift.",
+                "experiment_design": {
+                    "objective": f"Test whether {keyword} controls robustness.",
+                    "independent_variable": f"{keyword} strength",
+                    "dependent_variables": ["Accuracy under shift", "Calibration error"],
+                    "control_group": f"Baseline without {keyword} control",
+                    "experimental_procedure": {
+                        "phase1": "Reproduce baseline",
+                        "phase2": f"Sweep {keyword} strength",
+                        "phase3": "Evaluate under shift",
+                        "phase4": "Analyse correlation"
+                    },
+                    "expected_outcome": "Correlation above 0.6 between strength and robustness.",
+                    "fallback_plan": "Check for saturation and try alternative measures.",
+                    "deliverables": ["Sweep curve", "Calibration table"],
+                    "week1": "Reproduce baseline",
+                    "week2": f"Sweep {keyword} strength",
+                    "week3": "Evaluate under shift"
+                },
+                "expected_insight": f"{keyword.title()} may act as an implicit regulariser.",
+                "gap": f"No systematic study of {keyword} under distribution shift.",
+                "skeptic_challenge": "Gains may be benchmark artifacts.",
+                "impact": f"Could make {keyword} systems reliable in deployment.",
+                "novelty_score": round(rng.uniform(6.5, 9.5), 1),
+                "feasibility_score": round(rng.uniform(6.0, 9.0), 1),
+                "impact_score": round(rng.uniform(6.5, 9.5), 1)
+            })
+        return {
+            "dialogue_messages": [f"That's interesting — maybe {i['hypothesis']}" for i in insights],
+            "insights": insights
+        }
+
+    def _verdict(self, rng: random.Random) -> Dict[str, Any]:
+        survival_score = round(rng.uniform(5.0, 9.5), 1)
+        quality = round(rng.uniform(6.0, 9.0), 1)
+        return {
+            "gap_still_valid": survival_score >= 6,
+            "survival_score": survival_score,
+            "refinement": "",
+            "evidence": "Quick check: scanning recent arXiv. Related work covers parts of this, but not the proposed test. → Insight validated.",
+            "related_work": ["Closely related benchmark study"],
+            "validation_comment": "Partially novel.",
+            "experiment_design_evaluation": {
+                "completeness": quality,
+                "reproducibility": quality,
+                "informativeness": quality,
+                "branch_logic": quality,
+                "overall_quality": quality,
+                "feedback": "Clear design; add a second dataset."
+            }
+        }
+
+    def _themes(self, rng: random.Random, prompt: str) -> Dict[str, Any]:
+        keywords = self._keywords(prompt.split("PAPERS:", 1)[-1], n=16)
+        pick = lambda k: rng.sample(keywords, min(k, len(keywords)))
+        return {
+            "themes": {
+                "architectures": pick(3), "paradigms": pick(2), "applications": pick(3),
+                "datasets": pick(2), "optimization": pick(2), "evaluation": pick(2),
+                "challenges": pick(2), "trends": pick(2)
+            },
+            "methodologies": pick(3),
+            "applications": pick(3)
+        }
+
+    def _combinations(self, rng: random.Random, titles: List[str]) -> List[Dict[str, Any]]:
+        if len(titles) < 2:
+            return []
+        return [
+            {
+                "combination": f"{titles[i]} + {titles[i + 1]}",
+                "rationale": "Complementary methods that have not been combined",
+                "papers_involved": [i + 1, i + 2],
+                "opportunity_score": rng.randint(6, 9)
+            }
+            for i in range(min(3, len(titles) - 1))
+        ]
+
+    def _trends(self, prompt: str) -> Dict[str, Any]:
+        keywords = self._keywords(prompt.split("RECENT PAPERS", 1)[-1])
+        return {
+            "trends": keywords[:3],
+            "recent_focus": keywords[3:5],
+            "evolution": f"The field is moving from {keywords[-1]} toward {keywords[0]}."
+        }
+
+    def _gaps(self, rng: random.Random, titles: List[str]) -> List[Dict[str, Any]]:
+        keywords = self._keywords(" ".join(titles))
+        return [
+            {
+                "gap": f"No large-scale evaluation of {keyword}",
+                "why_matters": "Blocks real-world use",
+                "opportunity_score": rng.randint(6, 9),
+                "related_themes": [keyword],
+                "papers_affected": [1]
+            }
+            for keyword in keywords[:3]
+        ]
+
+    def _field_context(self, prompt: str) -> str:
+        match = re.search(r'"([^"]+)"', prompt)
+        topic = match.group(1) if match else "this field"
+        return (
+            f"Field context for {topic}.\n"
+            "Key Players: major university labs and industry research groups.\n"
+            "Seminal Papers: the foundational benchmark and method papers of the area.\n"
+            "Current Debates: whether benchmark gains transfer to deployment; compute versus data scaling.\n"
+            "Common Methodologies: supervised baselines, ablations, benchmark leaderboards.\n"
+            "Known Limitations: narrow datasets, limited reproducibility, high training cost.\n"
+            "Recent Trends: efficiency, robustness and multimodal evaluation.\n"
+            "Important Venues: NeurIPS, ICML, ICLR and domain journals."
+        )
+
+
+def create_backend(name: Optional[str] = None) -> LLMBackend:
+    """
+    Create the backend named by name or the LLM_BACKEND environment variable.
+
+    Args:
+        name: "gemini" (default) or "fake"
+    """
+    name = (name or os.getenv("LLM_BACKEND") or "gemini").lower()
+    if name == "fake":
+        return FakeBackend(latency=float(os.getenv("FAKE_LLM_LATENCY", "0") or 0))
+    if name == "gemini":
+        return GeminiBackend()
+    raise ValueError(f"Unknown LLM backend: {name}")
@@ -0,0 +1,192 @@
+"""
+Token accounting and run budgets for language model usage.
+
+Tracks prompt and output tokens per pipeline stage and decides how a run
+should degrade (skip optional stages, trim paper context) when it would
+exceed its token or latency budget.
+"""
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, List
+
+
+# Default output token limits per stage
+DEFAULT_MAX_OUTPUT_TOKENS = {
+    "Analyzer": 4096,
+    "Skeptic": 2048,
+    "Synthesizer": 4096,
+    "Validator": 1024,
+    "ResearchIntelligence": 2048,
+}
+
+# Rough total tokens (prompt + output) per stage, used to reserve budget ahead of time
+CORE_STAGE_ESTIMATES = {
+    "Analyzer": 7000,
+    "Skeptic": 3500,
+    "Synthesizer": 8000,
+    "Validator": 6000,
+}
+
+OPTIONAL_STAGE_ESTIMATES = {
+    "field_context": 2500,
+    "themes": 5000,
+    "methodology_combinations": 3000,
+    "temporal_trends": 2000,
+}
+
+# Assumed latency of one LLM call before any call has been observed
+DEFAULT_CALL_SECONDS = 10.0
+
+
+def estimate_tokens(text: str) -> int:
+    """Fast local token estimate (about 4 characters per token)"""
+    if not text:
+        return 0
+    return max(1, (len(text) + 3) // 4)
+
+
+@dataclass
+class TokenUsage:
+    """Token and latency totals for one stage or a whole run."""
+    prompt_tokens: int = 0
+    output_tokens: int = 0
+    calls: int = 0
+    seconds: float = 0.0
+    estimated_calls: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.output_tokens
+
+    def add(self, other: "TokenUsage") -> None:
+        self.prompt_tokens += other.prompt_tokens
+        self.output_tokens += other.output_tokens
+        self.calls += other.calls
+        self.seconds += other.seconds
+        self.estimated_calls += other.estimated_calls
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dict for conversation logs and JSON export"""
+        return {
+            "prompt_tokens": self.prompt_tokens,
+            "output_tokens": self.output_tokens,
+            "total_tokens": self.total_tokens,
+            "calls": self.calls,
+            "seconds": round(self.seconds, 3),
+            "estimated_calls": self.estimated_calls,
+        }
+
+
+class UsageTracker:
+    """
+    Thread-safe token usage aggregation per stage.
+
+    LLM.call records every call here; agents running in worker threads
+    (pipelined validation) record concurrently.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages: Dict[str, TokenUsage] = {}
+
+    def record(self, stage: str, prompt_tokens: int, output_tokens: int,
+               seconds: float = 0.0, estimated: bool = False) -> None:
+        """Record one LLM call for a stage"""
+        with self._lock:
+            usage = self._stages.setdefault(stage or "unattributed", TokenUsage())
+            usage.prompt_tokens += prompt_tokens
+            usage.output_tokens += output_tokens
+            usage.calls += 1
+            usage.seconds += seconds
+            if estimated:
+                usage.estimated_calls += 1
+
+    def stage(self, stage: str) -> TokenUsage:
+        """Usage for a single stage (empty if the stage made no calls)"""
+        with self._lock:
+            usage = self._stages.get(stage, TokenUsage())
+            return TokenUsage(**vars(usage))
+
+    def total(self) -> TokenUsage:
+        """Usage summed over all stages"""
+        total = TokenUsage()
+        with self._lock:
+            for usage in self._stages.values():
+                total.add(usage)
+        return total
+
+    def by_stage(self) -> Dict[str, Dict[str, Any]]:
+        """Per-stage usage as plain dicts"""
+        with self._lock:
+            return {name: usage.to_dict() for name, usage in self._stages.items()}
+
+    def average_call_seconds(self) -> float:
+        """Observed mean LLM call latency, or a default before any call"""
+        total = self.total()
+        return total.seconds / total.calls if total.calls else DEFAULT_CALL_SECONDS
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stages = {}
+
+
+@dataclass
+class RunBudget:
+    """
+    Token and latency budget for one pipeline run.
+
+    Budgets are soft: the pipeline degrades gracefully instead of failing.
+    Optional intelligence stages are skipped first, then paper and field
+    context sent to the core agents is trimmed.
+
+    Args:
+        max_tokens: Total prompt + output tokens per run (None = unlimited)
+        max_seconds: Target wall time per run (None = unlimited)
+        max_output_tokens: Per-stage output token limits overriding the defaults
+    """
+    max_tokens: Optional[int] = None
+    max_seconds: Optional[float] = None
+    max_output_tokens: Dict[str, int] = field(default_factory=dict)
+
+    def output_limit(self, stage: str, default: int) -> int:
+        """Output token limit for a stage, honouring per-stage overrides"""
+        return self.max_output_tokens.get(stage, default)
+
+    def allows(self, stage: str, usage: UsageTracker, started: float,
+               pending_core: List[str]) -> bool:
+        """
+        Check whether an optional stage fits in the budget.
+
+        The estimated cost of the stage plus a reserve for the core agents
+        still to run must fit in the remaining token and time budget.
+        """
+        estimate = OPTIONAL_STAGE_ESTIMATES.get(stage, 3000)
+        reserve = sum(CORE_STAGE_ESTIMATES.get(s, 0) for s in pending_core)
+        if self.max_tokens is not None:
+            if usage.total().total_tokens + estimate + reserve > self.max_tokens:
+                return False
+        if self.max_seconds is not None:
+            call_seconds = usage.average_call_seconds()
+            elapsed = time.time() - started
+            if elapsed + call_seconds * (1 + len(pending_core)) > self.max_seconds:
+                return False
+        return True
+
+    def context_scale(self, usage: UsageTracker, started: float, pending_core: List[str]) -> float:
+        """
+        Fraction of the normal paper/field context the core agents can afford.
+
+        Returns 1.0 when the remaining budget covers the usual core stage
+        costs, and scales down (to a floor of 0.3) as the budget runs out.
+        """
+        scale = 1.0
+        reserve = sum(CORE_STAGE_ESTIMATES.get(s, 0) for s in pending_core)
+        if self.max_tokens is not None and reserve:
+            remaining = self.max_tokens - usage.total().total_tokens
+            scale = min(scale, remaining / reserve)
+        if self.max_seconds is not None and pending_core:
+            remaining_seconds = self.max_seconds - (time.time() - started)
+            needed = usage.average_call_seconds() * len(pending_core)
+            scale = min(scale, remaining_seconds / needed if needed else 1.0)
+        return max(0.3, min(1.0, scale))
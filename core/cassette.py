@@ -0,0 +1,143 @@
+"""
+Record/replay layer for HTTP traffic.
+
+A CassetteSession stands in for requests.Session in search_arxiv and
+SimpleMultiPlatformScraper. In record mode it performs real requests and
+stores the responses in a JSON cassette file; in replay mode it serves them
+from the file without touching the network, so paper search is fast and
+reproducible for benchmarks and offline runs.
+
+Set HTTP_CASSETTE to a cassette path (and optionally HTTP_CASSETTE_MODE) to
+enable it for ResearchAgent without code changes.
+"""
+import base64
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Optional, Any, Dict
+import requests
+from . import metrics
+
+
+class CassetteMiss(requests.ConnectionError):
+    """Raised in replay mode when a request has no recorded response"""
+
+
+class CassetteResponse:
+    """Recorded response exposing the parts of requests.Response the app uses"""
+
+    def __init__(self, url: str, status_code: int, content: bytes, headers: Optional[Dict[str, str]] = None):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)
+
+
+class CassetteSession:
+    """
+    requests.Session stand-in that records or replays GET requests.
+
+    Args:
+        path: Cassette JSON file
+        mode: "replay" (cassette only, misses raise CassetteMiss),
+              "record" (always hit the network and store) or
+              "once" (replay when recorded, otherwise record)
+        replay_latency: Simulated seconds per replayed request
+        transport: requests-style session used for recording (defaults to a
+                   new requests.Session); benchmarks pass a fixture generator
+    """
+    MODES = ("replay", "record", "once")
+
+    def __init__(self, path: str, mode: str = "replay", replay_latency: float = 0.0,
+                 transport: Optional[Any] = None):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.replay_latency = replay_latency
+        self.headers: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._http = transport
+        self.interactions: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.interactions = json.load(f).get("interactions", {})
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None,
+            **kwargs) -> CassetteResponse:
+        key = self._key("GET", url, params)
+        with self._lock:
+            recorded = self.interactions.get(key)
+        if self.mode != "record":
+            metrics.record_cache("http_cassette", recorded is not None)
+        if recorded is not None and self.mode != "record":
+            if self.replay_latency:
+                time.sleep(self.replay_latency)
+            return self._to_response(recorded)
+        if self.mode == "replay":
+            raise CassetteMiss(f"No recorded response for GET {url} {params or ''}")
+        return self._record(key, url, params, timeout, **kwargs)
+
+    def _record(self, key: str, url: str, params: Optional[Dict[str, Any]], timeout: Optional[float],
+                **kwargs) -> CassetteResponse:
+        if self._http is None:
+            self._http = requests.Session()
+            self._http.headers.update(self.headers)
+        response = self._http.get(url, params=params, timeout=timeout, **kwargs)
+        entry = {
+            "method": "GET",
+            "url": url,
+            "params": params or {},
+            "status_code": response.status_code,
+            "headers": {"Content-Type": response.headers.get("Content-Type", "")},
+        }
+        try:
+            entry["body"] = response.content.decode("utf-8")
+        except UnicodeDecodeError:
+            entry["body_base64"] = base64.b64encode(response.content).decode("ascii")
+        with self._lock:
+            self.interactions[key] = entry
+            self.save()
+        return self._to_response(entry)
+
+    def save(self) -> None:
+        """Write the cassette atomically (callers hold the lock)"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"interactions": self.interactions}, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def _key(self, method: str, url: str, params: Optional[Dict[str, Any]]) -> str:
+        """Stable key for a request, independent of parameter order"""
+        raw = json.dumps([method, url, params or {}], sort_keys=True, default=str)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _to_response(self, entry: Dict[str, Any]) -> CassetteResponse:
+        if "body_base64" in entry:
+            content = base64.b64decode(entry["body_base64"])
+        else:
+            content = entry.get("body", "").encode("utf-8")
+        return CassetteResponse(entry["url"], entry["status_code"], content, entry.get("headers"))
+
+
+def session_from_env() -> Optional[CassetteSession]:
+    """Cassette session configured by HTTP_CASSETTE / HTTP_CASSETTE_MODE, if set"""
+    path = os.getenv("HTTP_CASSETTE")
+    if not path:
+        return None
+    return CassetteSession(path, mode=os.getenv("HTTP_CASSETTE_MODE", "once"))
@@ -0,0 +1,127 @@
+"""
+Persistent store for generated field context.
+
+Field context depends only on the topic, so it is kept on disk and reused
+across runs. Topics are normalized ("Transformer Models" and "transformer
+model" are the same key) and, when there is no exact match, the stored
+topic naming the same field is reused: same head word and a content-word
+Jaccard similarity above a threshold (see text.topic_similarity), so
+"transformers" reuses "transformer models" but "large language models for
+math" does not reuse "... for code". Entries older than the TTL are
+regenerated.
+
+The store is a SQLite database, as for the run history: app sessions and
+the scheduler process each write single rows, so none of them overwrites
+contexts stored by the others.
+
+FIELD_CONTEXT_STORE sets the store path ("off" disables it) and
+FIELD_CONTEXT_TTL_DAYS the refresh interval.
+"""
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from typing import Optional, Tuple
+from .text import normalize_topic, topic_similarity
+
+DEFAULT_STORE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "airesearcher", "field_context.sqlite")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS contexts (
+    topic_key TEXT PRIMARY KEY,
+    topic TEXT NOT NULL,
+    context TEXT NOT NULL,
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS contexts_created ON contexts (created DESC);
+"""
+
+
+class FieldContextStore:
+    """
+    Topic-keyed field context cache backed by SQLite.
+
+    Args:
+        path: Database file (created with its directory if missing)
+        ttl_seconds: Age after which an entry is ignored and regenerated
+        threshold: Minimum topic_similarity for reusing a different (normalized)
+            topic; 0.75 accepts only word sets that differ by stopwords, generic
+            heads or one word in four
+        max_entries: Oldest entries are dropped beyond this
+    """
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH, ttl_seconds: float = 7 * 24 * 3600,
+                 threshold: float = 0.75, max_entries: int = 500):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        # One short-lived connection per call: safe from any thread or process
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def lookup(self, topic: str) -> Optional[Tuple[str, str, float]]:
+        """
+        Field context for topic or a stored topic naming the same field.
+
+        Returns:
+            (context, matched topic, similarity), or None when nothing fresh matches
+        """
+        key = normalize_topic(topic)
+        if not key:
+            return None
+        oldest = time.time() - self.ttl_seconds
+        try:
+            with closing(self._connect()) as conn:
+                row = conn.execute("SELECT context, topic FROM contexts WHERE topic_key = ? AND created >= ?",
+                                   (key, oldest)).fetchone()
+                if row:
+                    return row[0], row[1], 1.0
+                best_key, best_score = None, 0.0
+                for (other,) in conn.execute("SELECT topic_key FROM contexts WHERE created >= ?", (oldest,)):
+                    score = topic_similarity(key, other)
+                    if score > best_score:
+                        best_key, best_score = other, score
+                if best_key is None or best_score < self.threshold:
+                    return None
+                row = conn.execute("SELECT context, topic FROM contexts WHERE topic_key = ?", (best_key,)).fetchone()
+        except sqlite3.Error as e:
+            print(f"⚠️  Could not read field context store: {e}")
+            return None
+        return (row[0], row[1], best_score) if row else None
+
+    def put(self, topic: str, context: str) -> None:
+        """Store (or refresh) the field context for a topic"""
+        key = normalize_topic(topic)
+        if not key:
+            return
+        try:
+            with self._lock, closing(self._connect()) as conn, conn:
+                conn.execute("INSERT OR REPLACE INTO contexts (topic_key, topic, context, created) VALUES (?, ?, ?, ?)",
+                             (key, topic, context, time.time()))
+                conn.execute("DELETE FROM contexts WHERE topic_key IN "
+                             "(SELECT topic_key FROM contexts ORDER BY created DESC LIMIT -1 OFFSET ?)",
+                             (self.max_entries,))
+        except sqlite3.Error as e:
+            print(f"⚠️  Could not save field context store: {e}")
+
+
+def store_from_env() -> Optional[FieldContextStore]:
+    """Store configured by FIELD_CONTEXT_STORE / FIELD_CONTEXT_TTL_DAYS (None when disabled or unusable)"""
+    path = os.getenv("FIELD_CONTEXT_STORE", DEFAULT_STORE_PATH)
+    if not path or path.lower() == "off":
+        return None
+    ttl_days = float(os.getenv("FIELD_CONTEXT_TTL_DAYS", "7") or 7)
+    try:
+        return FieldContextStore(path, ttl_seconds=ttl_days * 24 * 3600)
+    except (OSError, sqlite3.Error) as e:
+        print(f"⚠️  Field context store disabled ({path}): {e}")
+        return None
@@ -0,0 +1,48 @@
+"""
+Run-level deadlines for the research pipeline.
+
+A Deadline is created once per run and handed to every stage. Stages use
+it to cap LLM and HTTP timeouts and to stop starting new work once it has
+expired, so a run returns its best partial result on time.
+"""
+import time
+from typing import Optional
+
+
+class Deadline:
+    """
+    Absolute point in time by which a run should finish.
+
+    Args:
+        seconds: Time budget from now; None means no deadline
+    """
+
+    def __init__(self, seconds: Optional[float] = None):
+        self.seconds = seconds
+        self.expires_at = time.time() + seconds if seconds else None
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left, or None if there is no deadline"""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.time())
+
+    def expired(self) -> bool:
+        """Check whether the deadline has passed"""
+        return self.expires_at is not None and time.time() >= self.expires_at
+
+    def timeout(self, default: float, minimum: float = 1.0) -> float:
+        """
+        Timeout for a single blocking call.
+
+        Args:
+            default: Timeout to use when the deadline is far away (or absent)
+            minimum: Lower bound so calls made right before expiry can still complete
+
+        Returns:
+            The smaller of default and the remaining time, at least minimum
+        """
+        remaining = self.remaining()
+        if remaining is None:
+            return default
+        return max(minimum, min(default, remaining))
@@ -0,0 +1,312 @@
+"""
+Run exports (Markdown report, JSON, JSON Lines and a gzip bundle).
+
+Exports are produced only when a download is requested and are streamed
+straight to a file: the Markdown report one line at a time, JSON through the
+encoder's chunked output, and the bundle as one JSON line per paper,
+insight, conversation turn and trace span through a gzip stream. Finished
+files are cached per run id and format, so repeat downloads of the same run
+(from any session) are served from disk without regenerating.
+"""
+import gzip
+import io
+import json
+import os
+import tempfile
+import threading
+import uuid
+from collections import OrderedDict
+from dataclasses import asdict, is_dataclass
+from datetime import datetime
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, Sequence, Tuple
+from .run_result import RunResult
+from . import metrics
+
+
+def markdown_lines(insights: Sequence[Dict[str, Any]], papers: Sequence[Any], topic: str,
+                   report_date: str) -> Iterator[str]:
+    """Lines of the Markdown report (join with newlines), generated one at a time"""
+    yield "# Research Analysis Report"
+    yield f"\n**Topic:** {topic}"
+    yield f"**Date:** {report_date}"
+    yield f"**Papers Analyzed:** {len(papers)}"
+    yield f"**Insights Generated:** {len(insights)}"
+    yield "\n---\n"
+    yield "\n## 💡 Research Opportunities\n"
+
+    for i, insight in enumerate(insights, 1):
+        overall = (
+            insight.get('novelty_score', 0) +
+            insight.get('feasibility_score', 0) +
+            insight.get('impact_score', 0)
+        ) / 3
+
+        yield f"\n### {i}. {insight.get('title', 'Untitled')} (Score: {overall:.1f}/10)\n"
+
+        # 5-Layer Conceptual Reasoning Structure
+        observation = insight.get('observation', '')
+        hypothesis = insight.get('hypothesis', '')
+        expected_insight = insight.get('expected_insight', '')
+
+        if observation or hypothesis:
+            yield f"\n## Conceptual Reasoning Flow\n"
+
+            if observation:
+                yield f"\n**1. Observation:**\n{observation}\n"
+            else:
+                yield f"\n**1. Observation (The Gap):**\n{insight.get('gap', 'N/A')}\n"
+
+            if hypothesis:
+                yield f"\n**2. Hypothesis:**\n{hypothesis}\n"
+
+            exp = insight.get('experiment_design', {})
+            if exp:
+                yield f"\n**3. Experiment Design:**"
+                # Scientific methodology format
+                if exp.get('objective'):
+                    yield f"\n**Objective:** {exp.get('objective')}"
+                if exp.get('independent_variable'):
+                    yield f"\n**Independent Variable:** {exp.get('independent_variable')}"
+                if exp.get('dependent_variables'):
+                    deps = exp.get('dependent_variables', [])
+                    if isinstance(deps, list):
+                        yield f"\n**Dependent Variables:** {', '.join(deps)}"
+                    else:
+                        yield f"\n**Dependent Variables:** {deps}"
+                if exp.get('control_group'):
+                    yield f"\n**Control Group:** {exp.get('control_group')}"
+                if exp.get('experimental_procedure'):
+                    proc = exp.get('experimental_procedure', {})
+                    if isinstance(proc, dict):
+                        yield f"\n**Experimental Procedure:**"
+                        for phase, desc in proc.items():
+                            yield f"- **{phase}:** {desc}"
+                if exp.get('expected_outcome'):
+                    yield f"\n**Expected Outcome:** {exp.get('expected_outcome')}"
+                if exp.get('fallback_plan'):
+                    yield f"\n**Fallback Plan:** {exp.get('fallback_plan')}"
+                if exp.get('deliverables'):
+                    dels = exp.get('deliverables', [])
+                    if isinstance(dels, list):
+                        yield f"\n**Deliverables:** {', '.join(dels)}"
+                    else:
+                        yield f"\n**Deliverables:** {dels}"
+                # Legacy format
+                if exp.get('week1') or exp.get('week2') or exp.get('week3'):
+                    yield f"\n**Timeline:**"
+                    yield f"- **Week 1:** {exp.get('week1', 'N/A')}"
+                    yield f"- **Week 2:** {exp.get('week2', 'N/A')}"
+                    yield f"- **Week 3:** {exp.get('week3', 'N/A')}"
+                    yield ""
+
+            if expected_insight:
+                yield f"\n**4. Expected Insight:**\n{expected_insight}\n"
+
+            # Validation
+            if insight.get('validation_evidence'):
+                validation_status = "✓ VALIDATED" if insight.get('validated') else "⚠️ UNVALIDATED"
+                yield f"\n**5. Validation:** {validation_status} (Survival Score: {insight.get('survival_score', 0)}/10)"
+                yield f"\n**Validation Evidence:**\n{insight.get('validation_evidence')}\n"
+                if insight.get('related_work'):
+                    yield f"\n**Related Work:**"
+                    for work in insight.get('related_work', [])[:5]:
+                        yield f"- {work}"
+                    yield ""
+        else:
+            # Fallback to old format (backward compatibility)
+            yield f"\n**The Gap:**\n{insight.get('gap', 'N/A')}\n"
+            yield f"\n**Skeptic's Challenge:**\n{insight.get('skeptic_challenge', 'N/A')}\n"
+
+            exp = insight.get('experiment_design', {})
+            if exp:
+                yield f"\n**3-Week Experiment:**"
+                yield f"- **Week 1:** {exp.get('week1', 'N/A')}"
+                yield f"- **Week 2:** {exp.get('week2', 'N/A')}"
+                yield f"- **Week 3:** {exp.get('week3', 'N/A')}\n"
+
+            # Add validation information
+            if insight.get('validated'):
+                yield f"\n**Validation:** ✓ VALIDATED (Survival Score: {insight.get('survival_score', 0)}/10)"
+                if insight.get('validation_evidence'):
+                    yield f"\n**Validation Evidence:**\n{insight.get('validation_evidence')}\n"
+            else:
+                yield f"\n**Validation:** ⚠️ UNVALIDATED (Survival Score: {insight.get('survival_score', 0)}/10)"
+                if insight.get('validation_evidence'):
+                    yield f"\n**Validation Evidence:**\n{insight.get('validation_evidence')}\n"
+
+        yield f"\n**Impact:**\n{insight.get('impact', 'N/A')}\n"
+        yield f"\n**Scores:**\n"
+        yield f"- **Novelty:** {insight.get('novelty_score', 0)}/10"
+        yield f"- **Feasibility:** {insight.get('feasibility_score', 0)}/10"
+        yield f"- **Impact:** {insight.get('impact_score', 0)}/10"
+        yield ""
+
+    yield f"\n---\n\n## 📚 Papers Analyzed\n"
+
+    for i, paper in enumerate(papers, 1):
+        yield f"\n### {i}. {paper.title}"
+        yield f"**Authors:** {', '.join(paper.authors[:3])}"
+        yield f"**Year:** {paper.year}"
+        yield f"**URL:** {paper.url}\n"
+
+    yield f"\n---\n\n*Generated by AiResearcher - Multi-Agent Research System*"
+
+
+def _write_text(chunks: Iterable[str], fileobj: BinaryIO, separator: str = "") -> None:
+    """Encode chunks to fileobj, joined by separator"""
+    text = io.TextIOWrapper(fileobj, encoding="utf-8", newline="\n")
+    first = True
+    for chunk in chunks:
+        if not first:
+            text.write(separator)
+        text.write(chunk)
+        first = False
+    text.flush()
+    # Leave fileobj open for the caller
+    text.detach()
+
+
+class _LazyList(list):
+    """
+    Array the pure-Python JSON encoder (used for indented output) iterates
+    item by item, so the items never exist all at once.
+    """
+
+    def __init__(self, count: int, items: Callable[[], Iterable[Any]]):
+        super().__init__()
+        self._count = count
+        self._items = items
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._items())
+
+
+def _paper_record(paper: Any) -> Dict[str, Any]:
+    return asdict(paper) if is_dataclass(paper) else dict(paper)
+
+
+def bundle_records(run: RunResult, when: datetime) -> Iterator[Dict[str, Any]]:
+    """
+    Bundle contents as records tagged by a "record" field: one "meta" record,
+    then every paper (multi-platform metadata included), insight, conversation
+    turn and trace span, and the research intelligence if any.
+    """
+    yield {"record": "meta", "run_id": run.run_id, "topic": run.topic, "date": when.isoformat(timespec="minutes"),
+           "papers": len(run.papers), "insights": len(run.insights), "timed_out": run.timed_out}
+    for paper in run.enhanced_papers or run.papers:
+        yield {"record": "paper", **_paper_record(paper)}
+    for insight in run.insights:
+        yield {"record": "insight", **insight} if isinstance(insight, dict) else {"record": "insight", "value": insight}
+    for entry in run.conversation_log:
+        yield {"record": "turn", **entry}
+    for span_dict in run.trace:
+        yield {"record": "span", **span_dict}
+    if run.research_intelligence:
+        yield {"record": "research_intelligence", "value": run.research_intelligence}
+
+
+def write_markdown(run: RunResult, fileobj: BinaryIO, when: datetime) -> None:
+    _write_text(markdown_lines(run.insights, run.papers, run.topic, when.strftime('%Y-%m-%d %H:%M')), fileobj,
+                separator="\n")
+
+
+def write_json(run: RunResult, fileobj: BinaryIO, when: datetime) -> None:
+    """The JSON document the app has always offered (abstracts truncated to 500 characters)"""
+    document = {
+        "topic": run.topic,
+        "date": when.isoformat(timespec="minutes"),
+        "papers": _LazyList(len(run.papers), lambda: (
+            {"title": p.title, "authors": p.authors, "year": p.year, "url": p.url, "abstract": p.abstract[:500]}
+            for p in run.papers
+        )),
+        "insights": run.insights,
+        "conversation_log": run.conversation_log,
+    }
+    _write_text(json.JSONEncoder(indent=2).iterencode(document), fileobj)
+
+
+def write_jsonl(run: RunResult, fileobj: BinaryIO, when: datetime) -> None:
+    _write_text((json.dumps(record, default=str) + "\n" for record in bundle_records(run, when)), fileobj)
+
+
+def write_bundle(run: RunResult, fileobj: BinaryIO, when: datetime) -> None:
+    """Gzip-compressed JSON Lines bundle"""
+    with gzip.GzipFile(fileobj=fileobj, mode="wb", compresslevel=6, mtime=0) as compressed:
+        write_jsonl(run, compressed, when)
+
+
+# Format -> (file extension, MIME type, writer)
+EXPORT_FORMATS: Dict[str, Tuple[str, str, Callable[[RunResult, BinaryIO, datetime], None]]] = {
+    "markdown": ("md", "text/markdown", write_markdown),
+    "json": ("json", "application/json", write_json),
+    "jsonl": ("jsonl", "application/x-ndjson", write_jsonl),
+    "bundle": ("jsonl.gz", "application/gzip", write_bundle),
+}
+
+
+class ExportCache:
+    """
+    Generated export files keyed by (run id, format), evicted least recently used.
+
+    Args:
+        directory: Where files are written (default: a fresh temporary directory)
+        max_entries: Most export files kept
+    """
+
+    def __init__(self, directory: str = "", max_entries: int = 64):
+        self.directory = directory or tempfile.mkdtemp(prefix="airesearcher-exports-")
+        os.makedirs(self.directory, exist_ok=True)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._files: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+
+    def path(self, run: RunResult, fmt: str) -> str:
+        """Path of the export, generating it on first request"""
+        key = (run.run_id, fmt)
+        with self._lock:
+            path = self._files.get(key)
+            if path and os.path.exists(path):
+                self._files.move_to_end(key)
+                metrics.record_cache("export", True)
+                return path
+        metrics.record_cache("export", False)
+        extension, _, writer = EXPORT_FORMATS[fmt]
+        path = os.path.join(self.directory, f"{run.run_id}.{extension}")
+        # Unique temp name: concurrent requests for the same export never share a partial file
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                writer(run, f, datetime.now())
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        with self._lock:
+            self._files[key] = path
+            self._files.move_to_end(key)
+            while len(self._files) > self.max_entries:
+                _, old_path = self._files.popitem(last=False)
+                if os.path.exists(old_path):
+                    os.remove(old_path)
+        return path
+
+    def read(self, run: RunResult, fmt: str) -> bytes:
+        """Export contents (for download handlers that need bytes)"""
+        with open(self.path(run, fmt), "rb") as f:
+            return f.read()
+
+    def clear(self) -> None:
+        with self._lock:
+            for path in self._files.values():
+                if os.path.exists(path):
+                    os.remove(path)
+            self._files.clear()
+
+
+def export_file_name(fmt: str, when: datetime) -> str:
+    prefix = "research_report" if fmt == "markdown" else "research_data"
+    return f"{prefix}_{when.strftime('%Y%m%d_%H%M')}.{EXPORT_FORMATS[fmt][0]}"
@@ -0,0 +1,172 @@
+"""
+Persistent history of completed runs.
+
+Runs are kept in a SQLite database: one row per run with indexed summary
+columns (topic, time, counts) for listing, and the run itself as a
+zlib-compressed JSON blob of RunResult.to_dict(). Listing past runs reads
+only the summary columns; reloading one decompresses a single blob and
+makes no LLM or search calls.
+
+RUN_HISTORY sets the database path ("off" disables it).
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from contextlib import closing
+from dataclasses import dataclass
+from typing import Any, Iterable, List, Optional
+from .run_result import RunResult
+from .text import normalize_topic
+
+DEFAULT_HISTORY_PATH = os.path.join(os.path.expanduser("~"), ".cache", "airesearcher", "history.sqlite")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    topic TEXT NOT NULL,
+    topic_key TEXT NOT NULL,
+    created REAL NOT NULL,
+    num_papers INTEGER NOT NULL,
+    num_insights INTEGER NOT NULL,
+    model TEXT NOT NULL DEFAULT '',
+    sources TEXT,
+    timed_out INTEGER NOT NULL DEFAULT 0,
+    payload BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_created ON runs (created DESC);
+CREATE INDEX IF NOT EXISTS runs_topic_created ON runs (topic_key, created DESC);
+"""
+
+_SUMMARY_COLUMNS = "run_id, topic, created, num_papers, num_insights, model, sources, timed_out"
+
+
+@dataclass
+class RunSummary:
+    """Listing entry for a stored run"""
+    run_id: str
+    topic: str
+    created: float
+    num_papers: int
+    num_insights: int
+    model: str = ""
+    sources: Optional[List[str]] = None
+    timed_out: bool = False
+
+    @property
+    def label(self) -> str:
+        """One-line description for pickers and listings"""
+        when = time.strftime("%Y-%m-%d %H:%M", time.localtime(self.created))
+        partial = " · partial" if self.timed_out else ""
+        return f"{self.topic} · {when} · {self.num_papers} papers, {self.num_insights} insights{partial}"
+
+
+def _restore_year_keys(research_intelligence: Any) -> None:
+    """JSON turns the int year keys of the trend distribution into strings; convert them back"""
+    trends = research_intelligence.get("temporal_trends") if isinstance(research_intelligence, dict) else None
+    distribution = trends.get("year_distribution") if isinstance(trends, dict) else None
+    if isinstance(distribution, dict):
+        trends["year_distribution"] = {int(y) if str(y).isdigit() else y: n for y, n in distribution.items()}
+
+
+class RunHistory:
+    """
+    SQLite-backed store of completed runs.
+
+    Args:
+        path: Database file (created with its directory if missing)
+        max_runs: Oldest runs are deleted beyond this
+    """
+
+    def __init__(self, path: str = DEFAULT_HISTORY_PATH, max_runs: int = 1000):
+        self.path = path
+        self.max_runs = max_runs
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        # One short-lived connection per call: safe from any Streamlit session thread
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def save(self, run: RunResult, model: str = "", sources: Optional[Iterable[str]] = None) -> Optional[str]:
+        """
+        Store a run (replacing an earlier save of the same run id).
+
+        Returns:
+            The run id, or None if the database could not be written
+        """
+        payload = zlib.compress(json.dumps(run.to_dict(), default=str).encode("utf-8"), 6)
+        row = (run.run_id, run.topic, normalize_topic(run.topic), time.time(), len(run.papers), len(run.insights),
+               model, json.dumps(sorted(sources)) if sources else None, int(run.timed_out), payload)
+        try:
+            with self._lock, closing(self._connect()) as conn, conn:
+                conn.execute("INSERT OR REPLACE INTO runs (run_id, topic, topic_key, created, num_papers, num_insights, "
+                             "model, sources, timed_out, payload) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", row)
+                conn.execute("DELETE FROM runs WHERE run_id IN "
+                             "(SELECT run_id FROM runs ORDER BY created DESC LIMIT -1 OFFSET ?)", (self.max_runs,))
+        except sqlite3.Error as e:
+            print(f"⚠️  Could not save run to history: {e}")
+            return None
+        return run.run_id
+
+    def list_runs(self, topic: Optional[str] = None, limit: int = 50) -> List[RunSummary]:
+        """Most recent runs first, optionally for one (normalized) topic"""
+        query = f"SELECT {_SUMMARY_COLUMNS} FROM runs"
+        params: tuple = ()
+        if topic:
+            query += " WHERE topic_key = ?"
+            params = (normalize_topic(topic),)
+        query += " ORDER BY created DESC LIMIT ?"
+        with closing(self._connect()) as conn:
+            rows = conn.execute(query, params + (limit,)).fetchall()
+        return [RunSummary(run_id, topic_, created, papers, insights, model,
+                           json.loads(sources) if sources else None, bool(timed_out))
+                for run_id, topic_, created, papers, insights, model, sources, timed_out in rows]
+
+    def load(self, run_id: str) -> Optional[RunResult]:
+        """Stored run, or None if unknown or unreadable"""
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT payload FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        if row is None:
+            return None
+        try:
+            data = json.loads(zlib.decompress(row[0]).decode("utf-8"))
+            _restore_year_keys(data.get("research_intelligence"))
+            return RunResult.from_dict(data)
+        except (zlib.error, ValueError, KeyError, TypeError) as e:
+            print(f"⚠️  Could not load run {run_id} from history: {e}")
+            return None
+
+    def latest(self, topic: str) -> Optional[RunResult]:
+        """Most recent complete run for topic"""
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT run_id FROM runs WHERE topic_key = ? AND timed_out = 0 ORDER BY created DESC LIMIT 1",
+                               (normalize_topic(topic),)).fetchone()
+        return self.load(row[0]) if row else None
+
+    def delete(self, run_id: str) -> bool:
+        with self._lock, closing(self._connect()) as conn, conn:
+            return conn.execute("DELETE FROM runs WHERE run_id = ?", (run_id,)).rowcount > 0
+
+    def __len__(self) -> int:
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+
+def history_from_env() -> Optional[RunHistory]:
+    """History configured by RUN_HISTORY (None when disabled or unusable)"""
+    path = os.getenv("RUN_HISTORY", DEFAULT_HISTORY_PATH)
+    if not path or path.lower() == "off":
+        return None
+    try:
+        return RunHistory(path)
+    except (OSError, sqlite3.Error) as e:
+        print(f"⚠️  Run history disabled ({path}): {e}")
+        return None
@@ -0,0 +1,80 @@
+"""
+Helpers for incremental topic refreshes.
+
+A refresh compares the current search results with the papers of the last
+stored run for the topic, analyzes only the new ones, merges their gaps
+with the earlier gaps, and re-validates only the earlier insights that the
+new papers touch. These functions are the LLM-free parts: identifying new
+papers, merging gaps and finding affected insights.
+"""
+import re
+from typing import Any, Dict, Iterable, List, Sequence, Set
+from .keyphrases import GENERIC_BACKGROUND, candidate_phrases
+from .text import normalize_topic
+
+_ARXIV_VERSION = re.compile(r"v\d+$")
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+# Insight fields describing what an insight claims
+INSIGHT_TEXT_FIELDS = ("title", "gap", "observation", "hypothesis")
+
+
+def paper_key(paper: Any) -> str:
+    """Identity of a paper across searches: URL without arXiv version, else normalized title"""
+    url = (paper.get("url") if isinstance(paper, dict) else getattr(paper, "url", "")) or ""
+    url = _ARXIV_VERSION.sub("", url.strip().lower().rstrip("/"))
+    if url:
+        return url.replace("https://", "http://")
+    title = (paper.get("title") if isinstance(paper, dict) else getattr(paper, "title", "")) or ""
+    return _NON_WORD.sub(" ", title.lower()).strip()
+
+
+def new_papers(papers: Sequence[Any], previous: Iterable[Any]) -> List[Any]:
+    """Papers (in their current order) that were not in the previous paper set"""
+    seen = {paper_key(p) for p in previous}
+    return [p for p in papers if paper_key(p) not in seen]
+
+
+def _gap_key(gap: Any) -> str:
+    text = gap.get("gap", "") if isinstance(gap, dict) else str(gap)
+    return _NON_WORD.sub(" ", text.lower()).strip()
+
+
+def merge_gaps(new: Sequence[Any], previous: Sequence[Any]) -> List[Any]:
+    """New gaps first, then earlier gaps not restated by a new one"""
+    merged, seen = [], set()
+    for gap in list(new) + list(previous):
+        key = _gap_key(gap)
+        if key and key not in seen:
+            seen.add(key)
+            merged.append(gap)
+    return merged
+
+
+def content_words(text: str, ignore: Set[str] = frozenset()) -> Set[str]:
+    """Singularized content words, without generic scientific vocabulary"""
+    return {w for w in candidate_phrases(text, max_words=1) if w not in GENERIC_BACKGROUND and w not in ignore}
+
+
+def insight_key(insight: Dict[str, Any]) -> str:
+    return _NON_WORD.sub(" ", str(insight.get("title", "")).lower()).strip()
+
+
+def affected_insights(insights: Sequence[Dict[str, Any]], papers: Sequence[Any], topic: str = "",
+                      min_shared: int = 3) -> List[int]:
+    """
+    Positions of insights a set of new papers bears on.
+
+    An insight is affected when some paper's title and abstract share at
+    least min_shared content words with the insight's title, gap,
+    observation and hypothesis. Topic words are ignored, since every paper
+    and insight mentions them.
+    """
+    ignore = set(normalize_topic(topic).split())
+    paper_words = [content_words(f"{getattr(p, 'title', '')} {getattr(p, 'abstract', '')}", ignore) for p in papers]
+    affected = []
+    for position, insight in enumerate(insights):
+        words = content_words(" ".join(str(insight.get(name, "") or "") for name in INSIGHT_TEXT_FIELDS), ignore)
+        if any(len(words & words_of_paper) >= min_shared for words_of_paper in paper_words):
+            affected.append(position)
+    return affected
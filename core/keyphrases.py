@@ -0,0 +1,294 @@
+"""
+Local keyphrase and theme extraction.
+
+An LLM-free alternative to asking the model for research themes: candidate
+phrases are word n-grams split at stopwords and punctuation (a cheap stand-in
+for noun-phrase chunking), ranked by TF-IDF over the paper set with a
+background penalty for generic scientific vocabulary, and sorted into the
+eight theme dimensions with curated lexicons. Runs over hundreds of
+abstracts in milliseconds.
+"""
+import math
+import re
+from collections import Counter, defaultdict
+from typing import List, Dict, Any, Optional, Iterable, Tuple
+from .arxiv import Paper
+from .text import singularize
+
+STOPWORDS = set("""
+a about above across after again against all also although among an and any are as at be because been
+before being below between both but by can could did do does doing done during each either else even
+every few for from further had has have having here how however if in into is it its itself just less
+made make makes many may might more most much must no nor not now of off on once one only or other our
+ours out over own per rather same several should since so some such than that the their them then there
+these they this those through thus to too two under until up upon us use used uses using very via was we
+well were what when where whether which while who whom why will with within without would yet you your
+""".split())
+
+# Verbs and filler common in abstracts that never head a useful phrase
+ACADEMIC_STOPWORDS = set("""
+propose proposed proposes present presents presented introduce introduces introduced show shows shown
+demonstrate demonstrates demonstrated achieve achieves achieved obtain obtains report reports reported
+paper work study studies approach approaches method methods result results experiment experiments
+experimental novel new existing recent recently prior previous state art furthermore moreover however
+significantly significant substantially improve improves improved improvement improvements compared
+outperform outperforms various different based first second three four five further able allows
+enable enables including include includes given extensive evaluate evaluated evaluation task tasks
+problem problems propose framework frameworks model models performance effective efficiently
+indicate indicates support supports address addresses contribute contributes release released combine
+combines analyse analyze analyses leverage leverages leveraging operate operates develop develops capture
+captures provide provides require requires rely relies remain remains apply applies yield yields help
+helps hope suggest suggests find finds focus focuses aim aims explore explores investigate investigates
+consider considers perform performs example examples fewer larger smaller better best strong standard
+limited
+""".split())
+
+# Generic scientific vocabulary, with the share of background documents it
+# appears in; keeps phrases like "neural network" from dominating every topic
+GENERIC_BACKGROUND = {
+    "learning": 0.45, "network": 0.35, "neural": 0.35, "data": 0.5, "deep": 0.3, "training": 0.3,
+    "algorithm": 0.25, "system": 0.3, "analysis": 0.3, "dataset": 0.25, "benchmark": 0.2,
+    "baseline": 0.2, "accuracy": 0.2, "representation": 0.15, "feature": 0.2, "information": 0.25,
+    "application": 0.2, "technique": 0.2, "structure": 0.15, "function": 0.15, "prediction": 0.15,
+    "code": 0.15, "release": 0.1, "gain": 0.1, "limitation": 0.1, "contribution": 0.1,
+}
+
+# Theme dimensions and the terms that identify them
+DIMENSION_LEXICONS: Dict[str, List[str]] = {
+    "architectures": [
+        "transformer", "attention", "self-attention", "cnn", "convolutional", "convolution", "rnn",
+        "recurrent", "lstm", "gru", "gnn", "graph neural network", "graph convolutional", "autoencoder",
+        "variational autoencoder", "vae", "gan", "generative adversarial", "diffusion model", "mlp",
+        "resnet", "vit", "vision transformer", "bert", "gpt", "u-net", "unet", "encoder", "decoder",
+        "mixture of experts", "state space model", "mamba", "capsule", "hypernetwork", "equivariant",
+        "neural ode", "spiking", "memory network", "pointnet", "nerf",
+    ],
+    "paradigms": [
+        "self-supervised", "supervised", "unsupervised", "semi-supervised", "weakly supervised",
+        "reinforcement learning", "few-shot", "zero-shot", "one-shot", "meta-learning", "transfer learning",
+        "contrastive", "federated", "active learning", "continual learning", "lifelong learning",
+        "multi-task", "curriculum learning", "in-context learning", "fine-tuning", "pretraining",
+        "pre-training", "distillation", "imitation learning", "online learning", "bayesian",
+        "causal", "generative", "instruction tuning", "rlhf", "domain adaptation",
+    ],
+    "applications": [
+        "computer vision", "natural language", "nlp", "healthcare", "medical", "clinical", "radiology",
+        "robotics", "autonomous driving", "recommendation", "recommender", "speech", "audio",
+        "drug discovery", "protein", "genomics", "molecular", "chemistry", "finance", "climate",
+        "weather", "education", "legal", "cybersecurity", "translation", "question answering",
+        "summarization", "segmentation", "detection", "tracking", "retrieval", "dialogue", "code generation",
+        "image generation", "video", "remote sensing", "materials",
+    ],
+    "datasets": [
+        "imagenet", "coco", "glue", "superglue", "cifar", "mnist", "squad", "wikitext", "librispeech",
+        "ogb", "cora", "citeseer", "kinetics", "ms marco", "mmlu", "humaneval", "gsm8k", "pascal voc",
+        "cityscapes", "ade20k", "celeba", "lsun", "wmt", "common crawl", "the pile", "laion", "mimic",
+        "shapenet", "kitti", "nuscenes", "atari", "mujoco", "d4rl", "big-bench", "hellaswag",
+    ],
+    "optimization": [
+        "adam", "sgd", "stochastic gradient", "learning rate", "gradient descent", "regularization",
+        "dropout", "weight decay", "quantization", "pruning", "batch normalization", "layer normalization",
+        "hyperparameter", "mixed precision", "lora", "low-rank", "sparsity", "sparse", "optimizer",
+        "second-order", "warmup", "gradient clipping", "loss function", "early stopping", "data augmentation",
+    ],
+    "evaluation": [
+        "accuracy", "f1", "bleu", "rouge", "auc", "precision", "recall", "perplexity", "iou",
+        "fid", "calibration", "calibration error", "ablation", "human evaluation", "leaderboard",
+        "top-1", "top-5", "mse", "rmse", "mae", "success rate", "win rate", "latency", "throughput",
+    ],
+    "challenges": [
+        "overfitting", "scalability", "interpretability", "explainability", "robustness",
+        "distribution shift", "out-of-distribution", "bias", "fairness", "privacy", "hallucination",
+        "catastrophic forgetting", "data scarcity", "label noise", "noisy labels", "computational cost",
+        "training cost", "reproducibility", "adversarial", "long-tail", "class imbalance", "generalization",
+        "uncertainty", "safety", "alignment", "memory footprint",
+    ],
+    "trends": [
+        "efficient", "efficiency", "multimodal", "multi-modal", "foundation model", "large language model",
+        "llm", "retrieval-augmented", "llm agent", "autonomous agent", "edge computing", "on-device",
+        "open-source", "scaling law", "vision-language", "prompting", "chain-of-thought", "tool use",
+        "synthetic data", "world model",
+    ],
+}
+
+_TOKEN = re.compile(r"[A-Za-z][A-Za-z0-9]*(?:[-'][A-Za-z0-9]+)*|\d+(?:\.\d+)?%?|[.,;:()\[\]!?\"]")
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text)
+
+
+def _lexicon_index() -> Dict[str, List[Tuple[Tuple[str, ...], str, str]]]:
+    """First normalized word -> (normalized term words, term, dimension)"""
+    index: Dict[str, List[Tuple[Tuple[str, ...], str, str]]] = defaultdict(list)
+    for dimension, terms in DIMENSION_LEXICONS.items():
+        for term in terms:
+            words = tuple(singularize(w) for w in tokenize(term.lower()))
+            index[words[0]].append((words, term, dimension))
+    return dict(index)
+
+
+_LEXICON_INDEX = _lexicon_index()
+
+
+def lexicon_terms(text: str) -> Dict[str, str]:
+    """Lexicon terms mentioned in text, mapped to their dimension"""
+    words = [singularize(t.lower()) for t in tokenize(text)]
+    found = {}
+    for i, word in enumerate(words):
+        for term_words, term, dimension in _LEXICON_INDEX.get(word, ()):
+            if len(term_words) == 1 or tuple(words[i:i + len(term_words)]) == term_words:
+                found[term] = dimension
+    return found
+
+
+def candidate_phrases(text: str, max_words: int = 3) -> List[str]:
+    """
+    Candidate keyphrases of up to max_words words.
+
+    Text is chunked at stopwords, punctuation and numbers; every n-gram
+    inside a chunk is a candidate. Words are lowercased and singularized.
+    """
+    phrases = []
+    chunk: List[str] = []
+
+    def flush():
+        for n in range(1, max_words + 1):
+            for i in range(len(chunk) - n + 1):
+                phrases.append(" ".join(chunk[i:i + n]))
+        chunk.clear()
+
+    for token in tokenize(text):
+        lowered = token.lower()
+        if (not token[0].isalpha() or lowered in STOPWORDS or lowered in ACADEMIC_STOPWORDS
+                or len(lowered) < 3 and not token.isupper()):
+            flush()
+            continue
+        chunk.append(singularize(lowered))
+    flush()
+    return phrases
+
+
+def build_background(documents: Iterable[str]) -> Dict[str, float]:
+    """Share of documents containing each single word, for use as a background corpus"""
+    counts: Counter = Counter()
+    total = 0
+    for document in documents:
+        total += 1
+        counts.update(set(candidate_phrases(document, max_words=1)))
+    return {word: count / total for word, count in counts.items()} if total else {}
+
+
+class KeyphraseExtractor:
+    """
+    TF-IDF keyphrase ranking over a set of documents.
+
+    Args:
+        background: Word -> share of background documents containing it
+            (defaults to GENERIC_BACKGROUND)
+        background_size: Number of documents the background stands for
+        max_words: Longest phrase considered
+    """
+
+    def __init__(self, background: Optional[Dict[str, float]] = None, background_size: int = 1000,
+                 max_words: int = 3):
+        self.background = GENERIC_BACKGROUND if background is None else background
+        self.background_size = background_size
+        self.max_words = max_words
+
+    def rank(self, documents: List[str], top_k: int = 40) -> List[Dict[str, Any]]:
+        """
+        Ranked keyphrases across documents.
+
+        Returns:
+            Dicts with phrase, score, count (occurrences) and documents (document frequency)
+        """
+        term_counts: Counter = Counter()
+        doc_freq: Counter = Counter()
+        for document in documents:
+            phrases = candidate_phrases(document, self.max_words)
+            term_counts.update(phrases)
+            doc_freq.update(set(phrases))
+
+        n_docs = len(documents)
+        scored = []
+        for phrase, count in term_counts.items():
+            df = doc_freq[phrase]
+            # Phrases must recur; unigrams need to recur more to beat noise
+            if df < 2 or (" " not in phrase and df < 3):
+                continue
+            words = phrase.split()
+            # Background share of the phrase: its most specific word bounds it
+            background = min(self.background.get(w, 0.0) for w in words)
+            idf = math.log((n_docs + self.background_size) / (df + background * self.background_size + 1))
+            # Documents share the topic, so local df rewards coverage instead of penalizing it
+            score = (1 + math.log(count)) * (df / n_docs) * max(idf, 0.0) * (1 + 0.5 * (len(words) - 1))
+            if score > 0:
+                scored.append({"phrase": phrase, "score": round(score, 4), "count": count, "documents": df})
+
+        scored.sort(key=lambda item: (-item["score"], item["phrase"]))
+        return self._drop_contained(scored)[:top_k]
+
+    def _drop_contained(self, scored: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Remove phrases that only occur as part of a higher-ranked longer phrase"""
+        kept: List[Dict[str, Any]] = []
+        for item in scored:
+            phrase = item["phrase"]
+            if any(f" {phrase} " in f" {k['phrase']} " and k["documents"] >= item["documents"] for k in kept):
+                continue
+            kept.append(item)
+        return kept
+
+
+def classify_phrase(phrase: str) -> Optional[str]:
+    """Theme dimension whose lexicon matches the phrase (longest lexicon term wins)"""
+    found = lexicon_terms(phrase)
+    if not found:
+        return None
+    return found[max(found, key=len)]
+
+
+def extract_themes(papers: List[Paper], topic: str = "", per_dimension: int = 5) -> Dict[str, Any]:
+    """
+    Theme data in the same shape as ResearchIntelligence.extract_research_themes.
+
+    Dimensions are filled from lexicon matches counted per paper, then
+    topped up with the best-ranked keyphrases classified into them;
+    unclassified keyphrases become methodologies.
+    """
+    documents = [f"{p.title}. {p.title}. {p.abstract}" for p in papers]
+
+    # Lexicon terms by number of papers mentioning them
+    mentions: Dict[str, Counter] = defaultdict(Counter)
+    for document in documents:
+        for term, dimension in lexicon_terms(document).items():
+            mentions[dimension][term] += 1
+
+    keyphrases = KeyphraseExtractor().rank(documents, top_k=60)
+    themes: Dict[str, List[str]] = {dimension: [] for dimension in DIMENSION_LEXICONS}
+    unclassified: List[str] = []
+    for item in keyphrases:
+        dimension = classify_phrase(item["phrase"])
+        if dimension and " " in item["phrase"] and len(themes[dimension]) < per_dimension:
+            themes[dimension].append(item["phrase"])
+        elif not dimension:
+            unclassified.append(item["phrase"])
+    # Multi-word phrases make better methodology names than single words
+    methodologies = sorted(unclassified, key=lambda p: " " not in p)[:per_dimension]
+
+    for dimension, counts in mentions.items():
+        for term, _ in counts.most_common():
+            if len(themes[dimension]) >= per_dimension:
+                break
+            if not any(term in existing for existing in themes[dimension]):
+                themes[dimension].append(term)
+
+    applications = themes["applications"][:3] or ([topic] if topic else [])
+    if not themes["applications"] and topic:
+        themes["applications"] = [topic]
+    return {
+        "themes": themes,
+        "methodologies": (methodologies + themes["architectures"] + themes["paradigms"])[:per_dimension],
+        "applications": applications,
+        "keyphrases": keyphrases[:20],
+    }
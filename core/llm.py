@@ -1,15 +1,19 @@
 """
 Language model interface for generating text responses.
 
-Provides a wrapper around Google's Gemini API for consistent
-language model interactions throughout the application.
+Provides a wrapper around a text generation backend (Google's Gemini API by
+default) for consistent language model interactions throughout the application.
 """
-import os
 import json
 import re
-import google.generativeai as genai
-from typing import Optional, Any, List, Dict
+import time
+from typing import Optional, Any, List, Dict, Iterator, Callable
 from dotenv import load_dotenv
+from .backends import LLMBackend, Generation, create_backend
+from .budget import UsageTracker, RunBudget, DEFAULT_MAX_OUTPUT_TOKENS, estimate_tokens
+from .deadline import Deadline
+from .tracing import Span, span, tracer
+from . import metrics
 
 load_dotenv()
 
@@ -17,80 +21,180 @@ class LLM:
     """
     Language model client for text generation.
     
-    Wraps Google Gemini API with configured safety settings and
-    generation parameters for research analysis tasks.
+    Wraps a generation backend (Gemini by default, see core.backends) and
+    adds deadlines, output limits and per-stage token accounting.
+    
+    Args:
+        backend: Backend to use; defaults to the one selected by LLM_BACKEND,
+            created on first use so building agents does not load the SDK
     """
-    def __init__(self):
-        api_key = os.getenv("GOOGLE_API_KEY")
-        if not api_key:
-            raise ValueError("GOOGLE_API_KEY not found in .env")
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel("gemini-2.5-flash")
-    
-    def call(self, prompt: str, max_tokens: int = 1024) -> str:
+    def __init__(self, backend: Optional[LLMBackend] = None):
+        self._backend = backend
+        self.usage = UsageTracker()
+        self.budget: Optional[RunBudget] = None
+        self.deadline: Optional[Deadline] = None
+        # Upper bound for a single request so one slow call cannot stall a run
+        self.request_timeout = 120.0
+    
+    @property
+    def backend(self) -> LLMBackend:
+        if self._backend is None:
+            self._backend = create_backend()
+        return self._backend
+    
+    @backend.setter
+    def backend(self, backend: LLMBackend) -> None:
+        self._backend = backend
+    
+    def call(self, prompt: str, max_tokens: int = 1024, stage: str = "") -> str:
         """
         Generate text response from language model.
         
         Args:
             prompt: Input text prompt
             max_tokens: Maximum tokens to generate
+            stage: Pipeline stage the call is attributed to for token accounting
             
         Returns:
             Generated text response
         """
-        try:
-            response = self.model.generate_content(
-                prompt,
-                generation_config=genai.types.GenerationConfig(
-                    max_output_tokens=max_tokens,
-                    temperature=0.7
-                ),
-                safety_settings=[
-                    {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_NONE"},
-                    {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_NONE"},
-                    {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_NONE"},
-                    {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_NONE"},
-                ]
-            )
-            
-            if not response.candidates:
-                return "Error: No candidates in response"
-            
-            candidate = response.candidates[0]
-            finish_reason = getattr(candidate, 'finish_reason', None)
-            
-            # Extract text from response, trying multiple access patterns for API compatibility
+        if self.deadline and self.deadline.expired():
+            return "Error: Run deadline exceeded"
+        
+        with span("llm.call", stage=stage, backend=self.backend.name, max_tokens=max_tokens) as call_span:
+            start_time = time.time()
+            generation = None
+            text = ""
             try:
-                text = response.text
-                if text:
-                    return text
-            except (ValueError, AttributeError):
-                pass
-            
-            # Fallback to content.parts structure if direct text access fails
-            if hasattr(candidate, 'content') and candidate.content:
-                parts = getattr(candidate.content, 'parts', [])
-                if parts:
-                    text_parts = []
-                    for part in parts:
-                        if hasattr(part, 'text') and part.text:
-                            text_parts.append(part.text)
-                    if text_parts:
-                        return ''.join(text_parts)
-            
-            # Handle API-specific finish reasons
-            if finish_reason == 2:  # MAX_TOKENS
-                return "Error: Response truncated - increase max_tokens"
-            elif finish_reason == 3:  # SAFETY
-                return "Error: Blocked by safety filters"
+                generation = self.backend.generate(prompt, max_tokens, self._request_timeout())
+                text = generation.text
+                return text
+            except Exception as e:
+                text = f"Error: {e}"
+                return text
+            finally:
+                self._record_usage(stage, prompt, text, generation, time.time() - start_time, call_span)
+    
+    def call_stream(self, prompt: str, max_tokens: int = 1024, stage: str = "") -> Iterator[str]:
+        """
+        Generate text response incrementally from language model.
+        
+        Yields text chunks as the model produces them so callers can render
+        or parse partial output before generation finishes. Errors are
+        reported the same way as in call(): if nothing was produced yet, a
+        single "Error: ..." chunk is yielded.
+        
+        Args:
+            prompt: Input text prompt
+            max_tokens: Maximum tokens to generate
+            stage: Pipeline stage the call is attributed to for token accounting
             
-            return f"Error: Could not extract text (finish_reason: {finish_reason})"
-                
+        Yields:
+            Generated text chunks
+        """
+        if self.deadline and self.deadline.expired():
+            yield "Error: Run deadline exceeded"
+            return
+        
+        # Not activated as the current span: a generator can be resumed or
+        # closed from a different context than the one that started it
+        stream_span = tracer.start_span("llm.stream", stage=stage, backend=self.backend.name, max_tokens=max_tokens)
+        start_time = time.time()
+        produced = []
+        last_chunk = None
+        try:
+            for chunk in self.backend.stream(prompt, max_tokens, self._request_timeout()):
+                last_chunk = chunk
+                if chunk.text:
+                    if not produced:
+                        stream_span.set(first_chunk_seconds=round(time.time() - start_time, 4))
+                    produced.append(chunk.text)
+                    yield chunk.text
         except Exception as e:
-            return f"Error: {e}"
+            print(f"LLM stream error: {e}")
+            stream_span.set(error=str(e))
+            if not produced:
+                yield f"Error: {e}"
+        finally:
+            # The final chunk carries usage for the whole stream
+            self._record_usage(stage, prompt, ''.join(produced), last_chunk, time.time() - start_time, stream_span)
+            tracer.finish(stream_span)
+    
+    def cache_prefix(self, prefix: str, ttl_seconds: int) -> bool:
+        """Ask the backend to cache a shared prompt prefix; False if it cannot"""
+        with span("llm.cache_prefix", backend=self.backend.name, chars=len(prefix)) as cache_span:
+            cached = self.backend.cache_prefix(prefix, ttl_seconds)
+            cache_span.set(cached=cached)
+        return cached
+    
+    def release_prefix(self, prefix: Optional[str] = None) -> None:
+        """Drop a cached prefix (every prefix this backend holds when None)"""
+        self.backend.release_prefix(prefix)
+    
+    def _record_usage(self, stage: str, prompt: str, text: str, generation: Optional[Generation],
+                      seconds: float, call_span: Optional[Span] = None) -> None:
+        """Record token usage and call metrics, preferring backend-reported counts over local estimates"""
+        prompt_tokens = generation.prompt_tokens if generation is not None else None
+        output_tokens = generation.output_tokens if generation is not None else None
+        estimated = not prompt_tokens
+        if estimated:
+            prompt_tokens = estimate_tokens(prompt)
+            output_tokens = 0 if text.startswith("Error:") else estimate_tokens(text)
+        self.usage.record(stage, prompt_tokens, output_tokens or 0, seconds=seconds, estimated=estimated)
+        if call_span is not None:
+            call_span.set(prompt_tokens=prompt_tokens, output_tokens=output_tokens or 0,
+                          estimated_tokens=estimated, output_chars=len(text))
+            if generation is not None and generation.cached_tokens:
+                call_span.set(cached_tokens=generation.cached_tokens)
+            if text.startswith("Error:"):
+                call_span.status = "error"
+                call_span.error = text
+        
+        stage_label = stage or "unknown"
+        failed = text.startswith("Error:")
+        metrics.LLM_SECONDS.labels(stage_label, self.backend.name, "error" if failed else "ok").observe(seconds)
+        metrics.LLM_TOKENS.labels(stage_label, "prompt").inc(prompt_tokens)
+        metrics.LLM_TOKENS.labels(stage_label, "output").inc(output_tokens or 0)
+        if generation is not None and generation.cached_tokens:
+            metrics.LLM_TOKENS.labels(stage_label, "cached").inc(generation.cached_tokens)
+        finish_reason = generation.finish_reason if generation is not None else None
+        if finish_reason:
+            metrics.LLM_FINISH_REASONS.labels(self.backend.name, finish_reason).inc()
+        if failed:
+            metrics.LLM_ERRORS.labels(stage_label, self.backend.name, self._error_reason(text)).inc()
+    
+    def _error_reason(self, text: str) -> str:
+        """Coarse error category for metrics labels"""
+        lowered = text.lower()
+        if "deadline" in lowered or "timeout" in lowered or "timed out" in lowered:
+            return "timeout"
+        if "truncated" in lowered:
+            return "max_tokens"
+        if "safety" in lowered:
+            return "safety"
+        if "429" in lowered or "quota" in lowered or "resource exhausted" in lowered:
+            return "rate_limited"
+        return "other"
+    
+    def output_limit(self, stage: str, default: Optional[int] = None) -> int:
+        """Output token limit for a stage: budget override, else the stage default"""
+        if default is None:
+            default = DEFAULT_MAX_OUTPUT_TOKENS.get(stage, 1024)
+        return self.budget.output_limit(stage, default) if self.budget else default
+    
+    def _request_timeout(self) -> float:
+        """Per-request timeout; never outlives the run deadline"""
+        return self.deadline.timeout(self.request_timeout) if self.deadline else self.request_timeout
     
     def extract_json(self, text: str) -> Optional[Any]:
         """Extract JSON from response with improved parsing"""
+        with span("llm.extract_json", chars=len(text or "")) as parse_span:
+            result = self._extract_json(text)
+            parse_span.set(parsed=result is not None, result_type=type(result).__name__)
+            return result
+
+    def _extract_json(self, text: str) -> Optional[Any]:
+        """Parsing strategies behind extract_json(): direct, code block, array, object"""
         if not text or text.startswith("Error:"):
             return None
 
@@ -181,3 +285,88 @@ class LLM:
         json_str = ''.join(char for char in json_str if ord(char) >= 32 or char in '\n\r\t')
         return json_str
 
+
+class IncrementalJSONParser:
+    """
+    Incremental parser that emits JSON objects from a streamed array.
+    
+    Feed it text chunks as they arrive; each call returns the objects of the
+    target array whose closing brace has been seen. The target array is
+    either a top-level array or the value of array_key in a top-level
+    object, so both response shapes accepted by extract_json() work.
+    """
+    def __init__(self, array_key: str = "insights", clean: Optional[Callable[[str], str]] = None):
+        self.array_key = array_key
+        self.clean = clean
+        self.text = ""
+        self._pos = 0
+        self._in_string = False
+        self._escape = False
+        # Each entry: [container char, is target array, object start offset or None]
+        self._stack: List[List[Any]] = []
+    
+    def feed(self, chunk: str) -> List[Any]:
+        """
+        Consume a text chunk.
+        
+        Args:
+            chunk: Next piece of streamed model output
+            
+        Returns:
+            List of objects completed within this chunk (possibly empty)
+        """
+        self.text += chunk
+        completed = []
+        text = self.text
+        
+        for i in range(self._pos, len(text)):
+            char = text[i]
+            
+            # Only track strings inside JSON - prose before the payload is ignored
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+            if char == '"' and self._stack:
+                self._in_string = True
+            elif char == '[':
+                self._stack.append(['[', self._is_target_array(i), None])
+            elif char == '{':
+                parent = self._stack[-1] if self._stack else None
+                start = i if parent is not None and parent[1] else None
+                self._stack.append(['{', False, start])
+            elif char in '}]' and self._stack:
+                entry = self._stack.pop()
+                if char == '}' and entry[2] is not None:
+                    obj = self._decode(text[entry[2]:i + 1])
+                    if obj is not None:
+                        completed.append(obj)
+        
+        self._pos = len(text)
+        return completed
+    
+    def _is_target_array(self, index: int) -> bool:
+        """Check whether the array opening at index holds the streamed objects"""
+        if not self._stack:
+            return True
+        if len(self._stack) != 1 or self._stack[0][0] != '{':
+            return False
+        key_match = re.search(r'"((?:[^"\\]|\\.)*)"\s*:\s*$', self.text[max(0, index - 200):index])
+        return bool(key_match) and key_match.group(1) == self.array_key
+    
+    def _decode(self, json_str: str) -> Optional[Any]:
+        """Decode one completed object, cleaning it if the raw text is invalid"""
+        try:
+            return json.loads(json_str)
+        except ValueError:
+            pass
+        if self.clean:
+            try:
+                return json.loads(self.clean(json_str))
+            except ValueError as e:
+                print(f"JSON parse error in streamed object: {e}")
+        return None
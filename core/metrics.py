@@ -0,0 +1,278 @@
+"""
+In-process metrics in the Prometheus text exposition format.
+
+Counters and histograms for LLM calls, paper searches, caches, fallback
+insights and pipeline runs. Metrics live in the process that runs the
+pipeline, so the exporter is started inside the Streamlit app: set
+METRICS_PORT (and optionally METRICS_ADDR) and scrape
+http://<host>:<port>/metrics.
+"""
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, List, Dict, Tuple, Sequence
+
+# Seconds buckets sized for LLM calls and paper searches
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+PIPELINE_BUCKETS = (5.0, 10.0, 30.0, 60.0, 90.0, 120.0, 180.0, 240.0, 300.0, 600.0)
+COUNT_BUCKETS = (0, 1, 5, 10, 20, 50, 100)
+INF_LABEL = 'le="+Inf"'
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    """Base for labelled metrics; one child series per label combination"""
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple[str, ...], object] = {}
+
+    def labels(self, *values: str, **labels: str):
+        """Child series for a label combination (positional or by name)"""
+        if labels:
+            values = tuple(str(labels[n]) for n in self.labelnames)
+        else:
+            values = tuple(str(v) for v in values)
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        with self._lock:
+            child = self._series.get(values)
+            if child is None:
+                child = self._series[values] = self._new_child()
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class _CounterChild:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class Counter(_Metric):
+    """Monotonically increasing count"""
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def value(self, *values: str) -> float:
+        return self.labels(*values).value
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            series = list(self._series.items())
+        return [f"{self.name}{_format_labels(self.labelnames, values)} {_format_number(child.value)}"
+                for values, child in series]
+
+
+class _HistogramChild:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self._lock = threading.Lock()
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.sum += value
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self.counts[i] += 1
+                    break
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets"""
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            series = list(self._series.items())
+        lines = []
+        for values, child in series:
+            with child._lock:
+                counts, count, total = list(child.counts), child.count, child.sum
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                le = f'le="{_format_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, values, le)} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, values, INF_LABEL)} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, values)} {_format_number(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, values)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named collection of metrics rendered together"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text format"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(m.render() for m in metrics) + "\n"
+
+
+registry = MetricsRegistry()
+
+LLM_SECONDS = registry.histogram(
+    "airesearcher_llm_request_seconds", "LLM request latency", ["stage", "backend", "outcome"])
+LLM_ERRORS = registry.counter(
+    "airesearcher_llm_errors_total", "LLM calls that returned an error", ["stage", "backend", "reason"])
+LLM_FINISH_REASONS = registry.counter(
+    "airesearcher_llm_finish_reasons_total", "Model finish reasons (STOP, MAX_TOKENS, SAFETY, ...)",
+    ["backend", "reason"])
+LLM_TOKENS = registry.counter(
+    "airesearcher_llm_tokens_total", "Prompt and output tokens", ["stage", "kind"])
+SEARCH_SECONDS = registry.histogram(
+    "airesearcher_search_seconds", "Paper search latency per source", ["source"])
+SEARCH_RESULTS = registry.histogram(
+    "airesearcher_search_results", "Papers returned per search", ["source"], buckets=COUNT_BUCKETS)
+SEARCH_REQUESTS = registry.counter(
+    "airesearcher_search_requests_total", "Paper searches by outcome", ["source", "outcome"])
+CACHE_REQUESTS = registry.counter(
+    "airesearcher_cache_requests_total", "Cache lookups by result (hit or miss)", ["cache", "result"])
+INSIGHTS = registry.counter(
+    "airesearcher_insights_total", "Synthesized insights by origin (model or fallback)", ["origin"])
+PIPELINE_SECONDS = registry.histogram(
+    "airesearcher_pipeline_seconds", "Pipeline phase duration", ["phase"], buckets=PIPELINE_BUCKETS)
+PIPELINE_RUNS = registry.counter(
+    "airesearcher_pipeline_runs_total", "Insight generation runs by outcome", ["outcome"])
+
+
+def observe_search(source: str, seconds: float, results: Optional[int]) -> None:
+    """Record one paper search; results is None when the search raised"""
+    SEARCH_SECONDS.labels(source).observe(seconds)
+    if results is None:
+        SEARCH_REQUESTS.labels(source, "error").inc()
+        return
+    SEARCH_RESULTS.labels(source).observe(results)
+    SEARCH_REQUESTS.labels(source, "ok" if results else "empty").inc()
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry = registry
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = self.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Scrapes every few seconds would flood the app log
+        pass
+
+
+_server: Optional[ThreadingHTTPServer] = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port: int, addr: str = "0.0.0.0") -> ThreadingHTTPServer:
+    """
+    Serve /metrics from a daemon thread.
+
+    Safe to call on every Streamlit rerun: the first call starts the
+    server and later calls return it.
+    """
+    global _server
+    with _server_lock:
+        if _server is None:
+            _server = ThreadingHTTPServer((addr, port), _MetricsHandler)
+            _server.daemon_threads = True
+            threading.Thread(target=_server.serve_forever, name="metrics-exporter", daemon=True).start()
+            print(f"📈 Metrics exporter listening on http://{addr}:{port}/metrics")
+        return _server
+
+
+def start_from_env() -> Optional[ThreadingHTTPServer]:
+    """Start the exporter if METRICS_PORT is set"""
+    port = os.getenv("METRICS_PORT")
+    if not port:
+        return None
+    try:
+        return start_metrics_server(int(port), os.getenv("METRICS_ADDR", "0.0.0.0"))
+    except ValueError:
+        print(f"⚠️  Metrics exporter not started: METRICS_PORT must be a port number, got {port!r}")
+        return None
+    except (OSError, OverflowError) as e:
+        print(f"⚠️  Metrics exporter not started: {e}")
+        return None
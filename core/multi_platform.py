@@ -5,15 +5,17 @@ Supports searching across multiple academic platforms including arXiv,
 Papers with Code, Hugging Face, PubMed, bioRxiv, SSRN, and CORE.
 Provides parallel search capabilities and unified paper representation.
 """
-import requests
 import xml.etree.ElementTree as ET
-from typing import List, Dict, Optional, Set
+from typing import List, Dict, Any, Optional, Set
 from datetime import datetime
 from dataclasses import dataclass
 import concurrent.futures
 import time
 import json
 import re
+from .deadline import Deadline
+from .tracing import span, traced, propagate
+from . import metrics
 
 
 @dataclass
@@ -49,10 +51,14 @@ class EnhancedPaper:
         }
 
 
+class SearchFailed(list):
+    """Empty result of a source search that failed, as opposed to one that found nothing"""
+
+
 class SimpleMultiPlatformScraper:
     """Simple multi-platform scraper without overengineering"""
     
-    def __init__(self, enabled_sources: Optional[Set[str]] = None):
+    def __init__(self, enabled_sources: Optional[Set[str]] = None, session: Optional[Any] = None):
         """
         Initialize scraper with optional source selection
         
@@ -60,15 +66,33 @@ class SimpleMultiPlatformScraper:
             enabled_sources: Set of source names to enable. If None, enables working sources.
                             Options: 'arxiv', 'pwc', 'hf' (working)
                             Note: 'pubmed', 'biorxiv', 'ssrn', 'core' are available but not enabled by default
+            session: HTTP session to use (e.g. a CassetteSession for record/replay).
+                     Defaults to a new requests.Session.
         """
-        self.session = requests.Session()
+        if session is None:
+            import requests  # Deferred: only live searches need it
+            session = requests.Session()
+        self.session = session
         self.session.headers.update({'User-Agent': 'AiResearcher/1.0'})
         
         # Default enabled sources - only working sources: arXiv, Papers with Code, Hugging Face
         # PubMed, bioRxiv, SSRN, and CORE have been removed as they don't work reliably
         default_sources = {'arxiv', 'pwc', 'hf'}
         self.enabled_sources = enabled_sources if enabled_sources is not None else default_sources
+        self.deadline: Optional[Deadline] = None
+    
+    def _timeout(self, default: float) -> float:
+        """Request timeout capped by the run deadline"""
+        return self.deadline.timeout(default) if self.deadline else default
     
+    def _get(self, url: str, params: Optional[Dict] = None, timeout: Optional[float] = None):
+        """GET through the session, traced so network time is separated from parsing"""
+        with span("http.get", url=url) as http_span:
+            response = self.session.get(url, params=params, timeout=timeout)
+            http_span.set(status_code=response.status_code, bytes=len(response.content))
+            return response
+    
+    @traced("search.all")
     def search_all(self, query: str, max_per_platform: int = 10, 
                    enabled_sources: Optional[Set[str]] = None) -> List[EnhancedPaper]:
         """
@@ -103,26 +127,58 @@ class SimpleMultiPlatformScraper:
         if 'core' in sources_to_use:
             search_tasks.append(('core', self._search_core, query, max_per_platform))
         
+        if not search_tasks:
+            return results
+        
         # Execute searches in parallel with rate limiting
         max_workers = min(len(search_tasks), 7)  # Limit concurrent requests
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {}
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+        futures = {}
+        try:
             for source_name, search_func, *args in search_tasks:
-                future = executor.submit(search_func, *args)
+                if self.deadline and self.deadline.expired():
+                    print(f"⚠️  Run deadline reached, not starting {source_name.upper()} search")
+                    continue
+                future = executor.submit(propagate(self._measured(source_name, search_func)), *args)
                 futures[future] = source_name
                 time.sleep(0.3)  # Rate limiting: small delay between requests
             
-            for future in concurrent.futures.as_completed(futures, timeout=30):
+            for future in concurrent.futures.as_completed(futures, timeout=self._timeout(30)):
                 source_name = futures[future]
                 try:
                     source_results = future.result(timeout=20)
                     results.extend(source_results)
-                    print(f"✓ {source_name.upper()}: Found {len(source_results)} papers")
+                    if isinstance(source_results, SearchFailed):
+                        print(f"⚠️  {source_name.upper()} search failed")
+                    else:
+                        print(f"✓ {source_name.upper()}: Found {len(source_results)} papers")
                 except Exception as e:
                     print(f"⚠️  {source_name.upper()} search timeout/error: {e}")
+        except concurrent.futures.TimeoutError:
+            pending = [futures[f] for f in futures if not f.done()]
+            print(f"⚠️  Search time limit reached, returning partial results (still waiting on: {', '.join(pending)})")
+        finally:
+            # Don't block on stragglers - their results are discarded
+            executor.shutdown(wait=False, cancel_futures=True)
         
         return results
     
+    def _measured(self, source_name: str, search_func):
+        """Wrap a source search so its latency and result count are recorded"""
+        def run(*args):
+            start_time = time.time()
+            try:
+                results = search_func(*args)
+            except Exception:
+                metrics.observe_search(source_name, time.time() - start_time, None)
+                raise
+            # Source searches report their own failures as SearchFailed rather than raising
+            failed = isinstance(results, SearchFailed)
+            metrics.observe_search(source_name, time.time() - start_time, None if failed else len(results))
+            return results
+        return run
+    
+    @traced("search.arxiv")
     def _search_arxiv(self, query: str, max_results: int) -> List[EnhancedPaper]:
         """Search arXiv"""
         try:
@@ -132,7 +188,7 @@ class SimpleMultiPlatformScraper:
                 'max_results': min(max_results, 50),
                 'sortBy': 'relevance'
             }
-            response = self.session.get(url, params=params, timeout=10)
+            response = self._get(url, params=params, timeout=self._timeout(10))
             response.raise_for_status()
             
             papers = []
@@ -178,8 +234,9 @@ class SimpleMultiPlatformScraper:
             return papers
         except Exception as e:
             print(f"ArXiv search failed: {e}")
-            return []
+            return SearchFailed()
     
+    @traced("search.pwc")
     def _search_pwc(self, query: str, max_results: int) -> List[EnhancedPaper]:
         """Search Papers with Code"""
         try:
@@ -189,10 +246,10 @@ class SimpleMultiPlatformScraper:
                 'page_size': min(max_results, 30),
                 'ordering': '-paper_count'
             }
-            response = self.session.get(url, params=params, timeout=10)
+            response = self._get(url, params=params, timeout=self._timeout(10))
             
             if response.status_code != 200:
-                return []
+                return SearchFailed()
             
             papers = []
             data = response.json()
@@ -237,8 +294,9 @@ class SimpleMultiPlatformScraper:
             return papers
         except Exception as e:
             print(f"PWC search failed: {e}")
-            return []
+            return SearchFailed()
     
+    @traced("search.hf")
     def _search_hf(self, query: str, max_results: int) -> List[EnhancedPaper]:
         """Search Hugging Face"""
         try:
@@ -253,7 +311,7 @@ class SimpleMultiPlatformScraper:
                 'limit': max_results
             }
             
-            response = self.session.get(models_url, params=params, timeout=10)
+            response = self._get(models_url, params=params, timeout=self._timeout(10))
             
             if response.status_code == 200:
                 for item in response.json()[:max_results]:
@@ -308,8 +366,9 @@ class SimpleMultiPlatformScraper:
             return artifacts
         except Exception as e:
             print(f"HF search failed: {e}")
-            return []
+            return SearchFailed()
     
+    @traced("search.pubmed")
     def _search_pubmed(self, query: str, max_results: int) -> List[EnhancedPaper]:
         """Search PubMed using NCBI E-utilities API"""
         try:
@@ -324,10 +383,10 @@ class SimpleMultiPlatformScraper:
             }
             
             time.sleep(0.34)  # Rate limiting: 3 requests/second max
-            search_response = self.session.get(search_url, params=search_params, timeout=10)
+            search_response = self._get(search_url, params=search_params, timeout=self._timeout(10))
             
             if search_response.status_code != 200:
-                return []
+                return SearchFailed()
             
             search_data = search_response.json()
             pmids = search_data.get('esearchresult', {}).get('idlist', [])
@@ -345,10 +404,10 @@ class SimpleMultiPlatformScraper:
             }
             
             time.sleep(0.34)  # Rate limiting
-            fetch_response = self.session.get(fetch_url, params=fetch_params, timeout=10)
+            fetch_response = self._get(fetch_url, params=fetch_params, timeout=self._timeout(10))
             
             if fetch_response.status_code != 200:
-                return []
+                return SearchFailed()
             
             papers = []
             root = ET.fromstring(fetch_response.content)
@@ -400,8 +459,9 @@ class SimpleMultiPlatformScraper:
             return papers
         except Exception as e:
             print(f"PubMed search failed: {e}")
-            return []
+            return SearchFailed()
     
+    @traced("search.biorxiv")
     def _search_biorxiv(self, query: str, max_results: int) -> List[EnhancedPaper]:
         """Search bioRxiv using RSS feed"""
         try:
@@ -421,10 +481,10 @@ class SimpleMultiPlatformScraper:
                 'format': 'json'
             }
             
-            response = self.session.get(api_url, params=params, timeout=10)
+            response = self._get(api_url, params=params, timeout=self._timeout(10))
             
             if response.status_code != 200:
-                return []
+                return SearchFailed()
             
             data = response.json()
             papers = []
@@ -458,8 +518,9 @@ class SimpleMultiPlatformScraper:
             return papers
         except Exception as e:
             print(f"bioRxiv search failed: {e}")
-            return []
+            return SearchFailed()
     
+    @traced("search.ssrn")
     def _search_ssrn(self, query: str, max_results: int) -> List[EnhancedPaper]:
         """Search SSRN (Social Science Research Network)"""
         try:
@@ -477,8 +538,9 @@ class SimpleMultiPlatformScraper:
             return []
         except Exception as e:
             print(f"SSRN search failed: {e}")
-            return []
+            return SearchFailed()
     
+    @traced("search.core")
     def _search_core(self, query: str, max_results: int) -> List[EnhancedPaper]:
         """Search CORE (Academic search engine)"""
         try:
@@ -502,5 +564,5 @@ class SimpleMultiPlatformScraper:
             return []
         except Exception as e:
             print(f"CORE search failed: {e}")
-            return []
+            return SearchFailed()
 
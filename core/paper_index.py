@@ -0,0 +1,119 @@
+"""
+Prebuilt index over a run's papers for filtering, search and pagination.
+
+Built once per result set: papers grouped by platform and an inverted
+index from normalized title/author/abstract words to paper positions. A
+filter then intersects precomputed id lists instead of rescanning every
+paper, and only one page of results is handed to the UI.
+"""
+import bisect
+import math
+import re
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from .text import singularize
+
+ALL_PLATFORMS = "All"
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def index_terms(text: str) -> List[str]:
+    """Lowercased, singularized words"""
+    return [singularize(w) for w in _WORD.findall(text.lower())]
+
+
+def paper_platform(paper: Any, default: str = "arXiv") -> str:
+    """Platform of an EnhancedPaper, dict or plain Paper"""
+    if isinstance(paper, dict):
+        return paper.get("platform", default) or default
+    return getattr(paper, "platform", default) or default
+
+
+def _field(paper: Any, name: str, default: Any = "") -> Any:
+    return paper.get(name, default) if isinstance(paper, dict) else getattr(paper, name, default)
+
+
+class PaperIndex:
+    """
+    Platform and word index over a result set.
+
+    Args:
+        papers: Papers in relevance order
+        enhanced: Enhanced papers aligned with papers (multi-platform runs);
+            used for display and platforms where present
+    """
+
+    def __init__(self, papers: Sequence[Any], enhanced: Optional[Sequence[Any]] = None):
+        self.papers = papers
+        self.enhanced = enhanced
+        self.by_platform: Dict[str, List[int]] = defaultdict(list)
+        self.platform_of: List[str] = []
+        postings: Dict[str, List[int]] = defaultdict(list)
+        for i in range(len(papers)):
+            paper = self.display_paper(i)
+            platform = paper_platform(paper)
+            self.platform_of.append(platform)
+            self.by_platform[platform].append(i)
+            text = " ".join([
+                _field(paper, "title"), " ".join(_field(paper, "authors", []) or []), _field(paper, "abstract"),
+            ])
+            for term in set(index_terms(text)):
+                postings[term].append(i)
+        self.by_platform[ALL_PLATFORMS] = list(range(len(papers)))
+        self.postings: Dict[str, List[int]] = dict(postings)
+        # Sorted vocabulary for prefix lookups on the word being typed
+        self.vocabulary = sorted(self.postings)
+
+    @property
+    def platforms(self) -> List[str]:
+        """"All" followed by the platforms present"""
+        return [ALL_PLATFORMS] + sorted(p for p in self.by_platform if p != ALL_PLATFORMS)
+
+    def display_paper(self, i: int) -> Any:
+        """Enhanced paper at position i when available, else the plain paper"""
+        if self.enhanced and i < len(self.enhanced):
+            return self.enhanced[i]
+        return self.papers[i]
+
+    def _prefix_ids(self, prefix: str) -> set:
+        start = bisect.bisect_left(self.vocabulary, prefix)
+        ids: set = set()
+        for term in self.vocabulary[start:]:
+            if not term.startswith(prefix):
+                break
+            ids.update(self.postings[term])
+        return ids
+
+    def search(self, query: str = "", platform: str = ALL_PLATFORMS) -> List[int]:
+        """
+        Positions of papers on platform matching every word of query.
+
+        The last query word also matches as a prefix, so results update while
+        a word is being typed. Results keep relevance order.
+        """
+        terms = index_terms(query)
+        if not terms:
+            return self.by_platform.get(platform, [])
+        matches: Optional[set] = None
+        for n, term in enumerate(terms):
+            found = self._prefix_ids(term) if n == len(terms) - 1 else set(self.postings.get(term, ()))
+            matches = found if matches is None else matches & found
+            if not matches:
+                return []
+        if platform != ALL_PLATFORMS:
+            return sorted(i for i in matches if self.platform_of[i] == platform)
+        return sorted(matches)
+
+    @staticmethod
+    def page(ids: List[int], page: int, page_size: int) -> Tuple[List[int], int]:
+        """
+        One page of ids.
+
+        Returns:
+            (ids on the page, number of pages); page is clamped to the valid range
+        """
+        pages = max(1, math.ceil(len(ids) / page_size))
+        page = min(max(page, 1), pages)
+        start = (page - 1) * page_size
+        return ids[start:start + page_size], pages
@@ -0,0 +1,92 @@
+"""
+Shared prompt context for the agent pipeline.
+
+Field context and the paper list are the same for every agent call in a
+run. SharedContext renders them once as a byte-identical prefix that every
+agent prompt starts with, so the provider can serve it from a context cache
+(explicit cached content, or implicit prefix caching) instead of processing
+it again on each call. When no explicit cache is available, later agents get
+a compact extractive summary of the field context instead of the full text.
+"""
+import re
+from dataclasses import dataclass, field
+from typing import List
+from .arxiv import Paper
+
+# Cached content lifetime; comfortably longer than one run
+CONTEXT_CACHE_TTL_SECONDS = 600
+
+
+def compact_field_context(text: str, max_chars: int = 700, items_per_section: int = 3) -> str:
+    """
+    Extractive summary of a field context document.
+
+    Keeps section headings and the first sentence of the first few items
+    under each heading, up to max_chars.
+    """
+    lines = []
+    items = 0
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line:
+            continue
+        heading = line.startswith("#") or re.match(r"^(\d+\.\s*)?\*\*[^*]+\*\*:?$", line) or line.endswith(":")
+        if heading:
+            items = 0
+            lines.append(line.strip("#* ")[:100])
+            continue
+        if re.match(r"^[A-Z][\w /&()-]{2,40}:\s+\S", line):
+            # "Label: text" lines are one-line sections
+            items = 0
+        if items >= items_per_section:
+            continue
+        items += 1
+        sentence = re.split(r"(?<=[.!?])\s", line, maxsplit=1)[0]
+        lines.append(sentence[:160])
+
+    summary = "\n".join(lines)
+    if len(summary) > max_chars:
+        summary = summary[:max_chars].rsplit("\n", 1)[0]
+    return summary
+
+
+@dataclass
+class SharedContext:
+    """
+    Stable context shared by all agent prompts in a run.
+
+    Args:
+        topic: Research topic
+        field_context: Domain knowledge from ResearchIntelligence
+        papers: Papers the agents analyze
+        cached: True when the backend holds full() in a context cache
+    """
+    topic: str
+    field_context: str = ""
+    papers: List[Paper] = field(default_factory=list)
+    cached: bool = False
+
+    def full(self) -> str:
+        """Complete prefix: full field context and paper abstracts"""
+        papers_text = "\n\n".join(
+            f"PAPER {i+1}:\nTitle: {p.title}\nAbstract: {p.abstract[:400]}"
+            for i, p in enumerate(self.papers)
+        )
+        return self._render(self.field_context, papers_text)
+
+    def compact(self) -> str:
+        """Short prefix: summarized field context and paper titles"""
+        papers_text = "\n".join(f"{i+1}. {p.title} ({p.year})" for i, p in enumerate(self.papers))
+        return self._render(compact_field_context(self.field_context) if self.field_context else "", papers_text)
+
+    def prefix(self) -> str:
+        """Prefix for agents after the Analyzer: full when cached, compact otherwise"""
+        return self.full() if self.cached else self.compact()
+
+    def _render(self, field_text: str, papers_text: str) -> str:
+        sections = [f"SHARED RESEARCH CONTEXT\nTopic: {self.topic or 'research'}"]
+        if field_text:
+            sections.append(f"FIELD CONTEXT (Your Domain Knowledge):\n{field_text}")
+        if papers_text:
+            sections.append(f"PAPERS UNDER REVIEW:\n{papers_text}")
+        return "\n\n".join(sections) + "\n\n---\n\n"
@@ -0,0 +1,76 @@
+"""
+Content-hash memoization for HTML render functions.
+
+Streamlit reruns the whole app script on every interaction, rebuilding
+every tab's HTML. Render functions wrapped with RenderCache.memoize return
+the previous HTML when called again with equal arguments; arguments are
+compared by a hash of their pickled content, so equal data loaded in
+another session or rerun hits the same entry.
+
+The cache is shared by every session in the process, so only string
+results are kept: a cached list or dict would be the same mutable object
+in all sessions, and one caller changing it would change the others' views.
+"""
+import functools
+import hashlib
+import pickle
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+from . import metrics
+
+
+def content_hash(value: Any) -> Optional[str]:
+    """SHA-1 of the pickled value, or None when it cannot be pickled"""
+    try:
+        return hashlib.sha1(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)).hexdigest()
+    except Exception:
+        return None
+
+
+class RenderCache:
+    """
+    LRU cache of rendered output keyed by function and argument content.
+
+    Args:
+        max_entries: Most rendered results kept
+    """
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+
+    def memoize(self, func: Callable[..., Any]) -> Callable[..., Any]:
+        """Wrap a pure render function; unhashable arguments and non-string results bypass the cache"""
+        name = f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            digest = content_hash((args, sorted(kwargs.items())))
+            if digest is None:
+                return func(*args, **kwargs)
+            key = f"{name}:{digest}"
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    metrics.record_cache("render", True)
+                    return self._entries[key]
+            metrics.record_cache("render", False)
+            result = func(*args, **kwargs)
+            if not isinstance(result, str):
+                return result
+            with self._lock:
+                self._entries[key] = result
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            return result
+
+        return wrapper
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
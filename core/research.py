@@ -4,9 +4,21 @@ Research agent system for analyzing academic papers and generating insights.
 This module implements a multi-agent pipeline for paper analysis, gap detection,
 contradiction identification, and research opportunity synthesis.
 """
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator, Tuple
 from .arxiv import search_arxiv, Paper
-from .llm import LLM
+from .llm import LLM, IncrementalJSONParser
+from .budget import RunBudget
+from .deadline import Deadline
+from .prompts import SharedContext, CONTEXT_CACHE_TTL_SECONDS
+from .keyphrases import extract_themes
+from .incremental import new_papers, merge_gaps, affected_insights, insight_key
+from .tracing import span, traced, propagate, tracer, current_span, export_from_env
+from . import metrics
+import concurrent.futures
+import copy
+import json
+import queue
+import re
 import time
 
 # Multi-platform search support (optional dependency)
@@ -40,7 +52,9 @@ class AnalyzerAgent:
         self.name = "Analyzer"
         self.personality = "Analytical"
         self.expertise = "Research analyst with 15+ years of experience in systematic literature review"
+        self.context: Optional[SharedContext] = None  # Shared prompt prefix for the run
 
+    @traced()
     def analyze_papers(self, papers: List[Paper], topic: str = "", field_context: str = "") -> Dict[str, Any]:
         """
         Analyzes papers to extract methods, datasets, and limitations.
@@ -56,13 +70,16 @@ class AnalyzerAgent:
             for i, p in enumerate(papers[:5])
         ])
 
+        # With a shared context, field context and papers are in the prompt prefix
+        prefix = self.context.full() if self.context else ""
+        papers_section = ("CURRENT PAPERS TO ANALYZE: the PAPERS UNDER REVIEW in the shared context above."
+                          if self.context else f"CURRENT PAPERS TO ANALYZE:\n{papers_text}")
+
         # Build field context section
         field_section = ""
         if field_context:
-            field_section = f"""
-FIELD CONTEXT (Your Domain Knowledge):
-{field_context}
-
+            field_text = "" if self.context else f"\nFIELD CONTEXT (Your Domain Knowledge):\n{field_context}\n"
+            field_section = f"""{field_text}
 Use this context to:
 - Compare papers against known benchmarks and standards
 - Identify limitations that papers don't explicitly state
@@ -70,7 +87,7 @@ Use this context to:
 - Infer gaps based on field knowledge, not just what papers say
 """
 
-        prompt = f"""You are Dr. Sarah Chen, a leading research analyst at MIT with 15 years of experience in {topic or 'research analysis'}. 
+        prompt = prefix + f"""You are Dr. Sarah Chen, a leading research analyst at MIT with 15 years of experience in {topic or 'research analysis'}. 
 You have reviewed hundreds of papers in this field and know the key players, methodologies, and debates.
 Your personality: {self.personality} - You see patterns others miss and think systematically.
 
@@ -80,8 +97,7 @@ IMPORTANT: Generate your findings in a DIALOGUE STYLE as if you're presenting at
 Start with: "I've extracted..." or "I've analyzed..." and state your findings clearly.
 
 {field_section}
-CURRENT PAPERS TO ANALYZE:
-{papers_text}
+{papers_section}
 
 DEEP ANALYSIS FRAMEWORK:
 For each paper, extract:
@@ -123,7 +139,7 @@ Return JSON:
   ]
 }}"""
 
-        response = self.llm.call(prompt, max_tokens=4096)
+        response = self.llm.call(prompt, max_tokens=self.llm.output_limit(self.name), stage=self.name)
         analysis = self.llm.extract_json(response)
 
         duration = time.time() - start_time
@@ -175,7 +191,9 @@ class SkepticAgent:
         self.name = "Skeptic"
         self.personality = "Critical"
         self.expertise = "Brutal skeptic who challenges everything and finds flaws others miss"
+        self.context: Optional[SharedContext] = None  # Shared prompt prefix for the run
 
+    @traced()
     def critique(self, papers: List[Paper], analyzer_output: Dict[str, Any], topic: str = "", field_context: str = "") -> Dict[str, Any]:
         """Challenge assumptions and find contradictions"""
         print(f"⚠️  {self.name}: Challenging assumptions...")
@@ -215,23 +233,25 @@ class SkepticAgent:
         gaps = analyzer_output.get("analysis", {}).get("cross_paper_gaps", [])
         gaps_text = "\n".join([f"- {g.get('gap', '')}" for g in gaps[:3]]) if gaps else "No gaps identified yet."
 
+        # With a shared context, field context (and abstracts, when cached) are in the prompt prefix
+        prefix = self.context.prefix() if self.context else ""
+        papers_section = ("PAPERS TO CRITIQUE: the PAPERS UNDER REVIEW in the shared context above."
+                          if self.context and self.context.cached else f"PAPERS TO CRITIQUE:\n{papers_text}")
+
         # Build field context section (simplified)
         field_section = ""
         if field_context:
-            field_section = f"""
-FIELD CONTEXT:
-{field_context[:500]}
-
+            field_text = "" if self.context else f"\nFIELD CONTEXT:\n{field_context[:500]}\n"
+            field_section = f"""{field_text}
 Use this to reference known debates and provide field insights even when no direct contradictions are found.
 """
 
         # Simplified prompt - reduced verbosity, focused on essential JSON structure
-        prompt = f"""You are Dr. Marcus Thompson, a critical thinker with 20 years of experience in {topic or 'research'}. 
+        prompt = prefix + f"""You are Dr. Marcus Thompson, a critical thinker with 20 years of experience in {topic or 'research'}. 
 Your job: Find contradictions, challenge assumptions, and provide field insights. ALWAYS provide insights, even when finding "0 contradictions".
 
 {field_section}
-PAPERS TO CRITIQUE:
-{papers_text}
+{papers_section}
 
 GAPS IDENTIFIED BY ANALYZER:
 {gaps_text}
@@ -273,7 +293,7 @@ Return valid JSON with these keys:
 }}"""
 
         # Get LLM response
-        response = self.llm.call(prompt, max_tokens=2048)
+        response = self.llm.call(prompt, max_tokens=self.llm.output_limit(self.name), stage=self.name)
         
         # Debug logging: print raw response for troubleshooting
         if response and len(response) > 0:
@@ -399,13 +419,81 @@ class SynthesizerAgent:
         self.name = "Synthesizer"
         self.personality = "Creative"
         self.expertise = "World-class research strategist who sees opportunities others miss"
+        self.context: Optional[SharedContext] = None  # Shared prompt prefix for the run
 
+    @traced()
     def synthesize(self, papers: List[Paper], analyzer_output: Dict[str, Any],
                    skeptic_output: Dict[str, Any], topic: str = "", field_context: str = "") -> List[Dict[str, Any]]:
         """Combine analysis and critique to generate actionable research directions"""
         print(f"💡 {self.name}: Synthesizing insights...")
         start_time = time.time()
 
+        prompt, gaps = self._build_prompt(papers, analyzer_output, skeptic_output, topic, field_context)
+        response = self.llm.call(prompt, max_tokens=self.llm.output_limit(self.name), stage=self.name)
+        result = self.llm.extract_json(response)
+
+        duration = time.time() - start_time
+        return self._finalize_insights(result, papers, gaps, duration)
+
+    def synthesize_stream(self, papers: List[Paper], analyzer_output: Dict[str, Any],
+                          skeptic_output: Dict[str, Any], topic: str = "",
+                          field_context: str = "") -> Iterator[Dict[str, Any]]:
+        """
+        Stream insights as soon as each one is generated.
+        
+        Yields every insight object the moment its closing brace arrives, so
+        downstream stages can start on insight #1 while later insights are
+        still being generated. If nothing can be parsed incrementally, the
+        full response goes through the same post-processing as synthesize().
+        """
+        print(f"💡 {self.name}: Synthesizing insights (streaming)...")
+        start_time = time.time()
+
+        prompt, gaps = self._build_prompt(papers, analyzer_output, skeptic_output, topic, field_context)
+        parser = IncrementalJSONParser(array_key="insights", clean=self.llm._clean_json)
+
+        emitted = 0
+        for chunk in self.llm.call_stream(prompt, max_tokens=self.llm.output_limit(self.name), stage=self.name):
+            for item in parser.feed(chunk):
+                insight = self._coerce_insight(item)
+                if insight is None:
+                    continue
+                self._fill_required_fields(insight, emitted)
+                dialogue_messages = self._streamed_dialogue_messages(parser.text)
+                if emitted < len(dialogue_messages) and isinstance(dialogue_messages[emitted], str):
+                    insight['dialogue_message'] = dialogue_messages[emitted]
+                else:
+                    insight['dialogue_message'] = self._default_dialogue_message(insight)
+                emitted += 1
+                metrics.INSIGHTS.labels("model").inc()
+                print(f"  ↳ {self.name}: Insight {emitted} ready ({time.time() - start_time:.1f}s)")
+                yield insight
+
+        duration = time.time() - start_time
+        if emitted:
+            print(f"✓ {self.name}: Streamed {emitted} insights ({duration:.1f}s)")
+            return
+
+        # Nothing streamed (error or unexpected shape) - fall back to full parsing,
+        # which counts the insights by origin (model, fallback or generic_fallback)
+        result = self.llm.extract_json(parser.text)
+        for insight in self._finalize_insights(result, papers, gaps, duration):
+            yield insight
+
+    def _streamed_dialogue_messages(self, text: str) -> List[Any]:
+        """Read the dialogue_messages array from partial output once it is complete"""
+        match = re.search(r'"dialogue_messages"\s*:\s*\[', text)
+        if not match:
+            return []
+        try:
+            messages, _ = json.JSONDecoder().raw_decode(text, match.end() - 1)
+        except ValueError:
+            return []
+        return messages if isinstance(messages, list) else []
+
+    def _build_prompt(self, papers: List[Paper], analyzer_output: Dict[str, Any],
+                      skeptic_output: Dict[str, Any], topic: str, field_context: str):
+        """Build the synthesis prompt; returns (prompt, analyzer gaps)"""
         # Prepare context
         gaps = analyzer_output.get("analysis", {}).get("cross_paper_gaps", [])
         gaps_text = "\n".join([f"- {g.get('gap', '')}: {g.get('why_matters', '')}" for g in gaps[:5]])
@@ -419,13 +507,16 @@ class SynthesizerAgent:
 
         papers_titles = "\n".join([f"{i+1}. {p.title}" for i, p in enumerate(papers[:5])])
 
+        # With a shared context, field context and paper titles are in the prompt prefix
+        prefix = self.context.prefix() if self.context else ""
+        papers_section = ("PAPERS ANALYZED: the PAPERS UNDER REVIEW in the shared context above."
+                          if self.context else f"PAPERS ANALYZED:\n{papers_titles}")
+
         # Build field context section
         field_section = ""
         if field_context:
-            field_section = f"""
-FIELD CONTEXT (Your Domain Knowledge):
-{field_context}
-
+            field_text = "" if self.context else f"\nFIELD CONTEXT (Your Domain Knowledge):\n{field_context}\n"
+            field_section = f"""{field_text}
 Use this to:
 - Reference known research directions and important authors
 - Cite important conferences and trends
@@ -433,7 +524,7 @@ Use this to:
 - Identify opportunities that align with field evolution
 """
 
-        prompt = f"""You are Dr. Alex Rivera, a world-class research strategist at MIT with 18 years of experience. 
+        prompt = prefix + f"""You are Dr. Alex Rivera, a world-class research strategist at MIT with 18 years of experience. 
 Your personality: {self.personality} - You see connections others miss and generate brilliant research ideas.
 You've published in top venues and know what makes research impactful.
 
@@ -441,8 +532,7 @@ Your job is to generate research insights using CONCEPTUAL REASONING, not proced
 Think like a scientist: extract patterns, form hypotheses, design experiments, predict insights, validate.
 
 {field_section}
-PAPERS ANALYZED:
-{papers_titles}
+{papers_section}
 
 GAPS IDENTIFIED:
 {gaps_text}
@@ -625,11 +715,11 @@ Return JSON with two parts:
 OR if you prefer, return just the insights array and we'll generate dialogue messages from them.
 Return ONLY valid JSON."""
 
-        response = self.llm.call(prompt, max_tokens=4096)
-        result = self.llm.extract_json(response)
-
-        duration = time.time() - start_time
+        return prompt, gaps
 
+    def _finalize_insights(self, result: Any, papers: List[Paper], gaps: List[Dict],
+                           duration: float) -> List[Dict[str, Any]]:
+        """Normalize a parsed synthesis response into a list of complete insights"""
         # Handle different response formats
         dialogue_messages = []
         insights = []
@@ -646,33 +736,17 @@ Return ONLY valid JSON."""
         if isinstance(insights, list):
             validated_insights = []
             for item in insights:
-                if isinstance(item, dict):
-                    validated_insights.append(item)
-                elif isinstance(item, str):
-                    # If we got a string, try to create a basic insight from it
-                    print(f"⚠️  Warning: Found string in insights list, converting: {item[:50]}...")
-                    validated_insights.append({
-                        "title": item[:100] if len(item) > 100 else item,
-                        "observation": item,
-                        "hypothesis": "",
-                        "gap": item,
-                        "experiment_design": {},
-                        "expected_insight": "",
-                        "skeptic_challenge": "",
-                        "impact": "",
-                        "novelty_score": 5,
-                        "feasibility_score": 5,
-                        "impact_score": 5
-                    })
-                else:
-                    # Skip invalid items
-                    print(f"⚠️  Warning: Skipping invalid insight item of type {type(item)}")
+                insight = self._coerce_insight(item)
+                if insight is not None:
+                    validated_insights.append(insight)
             insights = validated_insights
         
         # Fallback if parsing fails or no valid insights
+        origin = "model"
         if not insights or not isinstance(insights, list) or len(insights) == 0:
             print(f"⚠️  {self.name}: JSON parsing failed or no valid insights, using fallback ({duration:.1f}s)")
             insights = self._create_fallback_insights(papers, gaps)
+            origin = "fallback"
         else:
             print(f"✓ {self.name}: Generated {len(insights)} insights ({duration:.1f}s)")
 
@@ -680,6 +754,7 @@ Return ONLY valid JSON."""
         if len(insights) == 0:
             print(f"⚠️  {self.name}: No insights generated, creating generic ones")
             insights = self._create_generic_fallback(papers)
+            origin = "generic_fallback"
         
         # Final validation - ensure all insights are dictionaries with required fields
         validated_final_insights = []
@@ -688,18 +763,7 @@ Return ONLY valid JSON."""
                 print(f"⚠️  Warning: Insight {i} is not a dict, skipping")
                 continue
             
-            # Ensure required fields exist
-            if 'title' not in insight:
-                insight['title'] = f"Research Insight {i+1}"
-            if 'observation' not in insight:
-                insight['observation'] = ''
-            if 'hypothesis' not in insight:
-                insight['hypothesis'] = ''
-            if 'gap' not in insight:
-                insight['gap'] = ''
-            if 'experiment_design' not in insight:
-                insight['experiment_design'] = {}
-            
+            self._fill_required_fields(insight, i)
             validated_final_insights.append(insight)
         
         insights = validated_final_insights
@@ -708,18 +772,7 @@ Return ONLY valid JSON."""
         if not dialogue_messages or len(dialogue_messages) != len(insights):
             dialogue_messages = []
             for insight in insights:
-                # Double-check it's a dict (defensive programming)
-                if not isinstance(insight, dict):
-                    dialogue_msg = "I see an opportunity here that could be worth exploring."
-                else:
-                    hypothesis = insight.get('hypothesis', '')
-                    observation = insight.get('observation', '')
-                    if hypothesis:
-                        dialogue_msg = f"That's interesting — I recall that {observation[:100] if observation else 'there are patterns here'}. Maybe {hypothesis[:150]}."
-                    else:
-                        gap = insight.get('gap', '')
-                        dialogue_msg = f"I see an opportunity here. {gap[:150]} This could be worth exploring."
-                dialogue_messages.append(dialogue_msg)
+                dialogue_messages.append(self._default_dialogue_message(insight))
         
         # Attach dialogue messages to insights
         for i, insight in enumerate(insights):
@@ -728,8 +781,58 @@ Return ONLY valid JSON."""
             if i < len(dialogue_messages):
                 insight['dialogue_message'] = dialogue_messages[i]
 
+        metrics.INSIGHTS.labels(origin).inc(len(insights))
         return insights
 
+    def _coerce_insight(self, item: Any) -> Optional[Dict[str, Any]]:
+        """Convert a raw parsed item into an insight dict, or None if unusable"""
+        if isinstance(item, dict):
+            return item
+        if isinstance(item, str):
+            # If we got a string, try to create a basic insight from it
+            print(f"⚠️  Warning: Found string in insights list, converting: {item[:50]}...")
+            return {
+                "title": item[:100] if len(item) > 100 else item,
+                "observation": item,
+                "hypothesis": "",
+                "gap": item,
+                "experiment_design": {},
+                "expected_insight": "",
+                "skeptic_challenge": "",
+                "impact": "",
+                "novelty_score": 5,
+                "feasibility_score": 5,
+                "impact_score": 5
+            }
+        # Skip invalid items
+        print(f"⚠️  Warning: Skipping invalid insight item of type {type(item)}")
+        return None
+
+    def _fill_required_fields(self, insight: Dict[str, Any], index: int) -> None:
+        """Ensure required fields exist on an insight"""
+        if 'title' not in insight:
+            insight['title'] = f"Research Insight {index+1}"
+        if 'observation' not in insight:
+            insight['observation'] = ''
+        if 'hypothesis' not in insight:
+            insight['hypothesis'] = ''
+        if 'gap' not in insight:
+            insight['gap'] = ''
+        if 'experiment_design' not in insight:
+            insight['experiment_design'] = {}
+
+    def _default_dialogue_message(self, insight: Any) -> str:
+        """Generate a roundtable dialogue message from an insight's content"""
+        # Double-check it's a dict (defensive programming)
+        if not isinstance(insight, dict):
+            return "I see an opportunity here that could be worth exploring."
+        hypothesis = insight.get('hypothesis', '')
+        observation = insight.get('observation', '')
+        if hypothesis:
+            return f"That's interesting — I recall that {observation[:100] if observation else 'there are patterns here'}. Maybe {hypothesis[:150]}."
+        gap = insight.get('gap', '')
+        return f"I see an opportunity here. {gap[:150]} This could be worth exploring."
+
     def _create_fallback_insights(self, papers: List[Paper], gaps: List[Dict]) -> List[Dict]:
         """Fallback insights based on identified gaps"""
         insights = []
@@ -796,6 +899,44 @@ Return ONLY valid JSON."""
         return insights
 
 
+# Validation instructions shared by the single-insight and batched prompts
+VALIDATION_CRITERIA = """CITATION-AWARE VALIDATION:
+1. **Novelty Check**: Has this hypothesis been explicitly tested? Search your knowledge of the field.
+2. **Contradiction Check**: Do any of these papers (or known work) directly address this?
+3. **Related Work**: What related papers should be cited? Are there partial solutions?
+4. **Refinement**: If valid, how can we refine to be more precise given existing work?
+5. **Validation Statement**: Write a clear validation statement in narrative form (like "Quick check: scanning OpenAlex and 2023-2025 arXiv. 'Equivariant Transformers' cover group constraints, but none evaluate them as data-regularizers. → Insight validated.")
+
+🔬 EXPERIMENT DESIGN EVALUATION:
+Evaluate the experiment design on scientific rigor:
+1. **Completeness** (0-10): Does the plan cover variables + metrics? Are independent/dependent variables clearly defined? Is there a control group?
+2. **Reproducibility** (0-10): Can another researcher execute it? Is the procedure clear and detailed enough?
+3. **Informativeness** (0-10): Does it produce interpretable data? Are the deliverables specified? Will results be meaningful?
+4. **Branch Logic** (0-10): What if results differ? Is there a fallback plan? Are failure scenarios addressed?
+
+Score each criterion and provide an overall experiment_design_quality score (average of the four criteria).
+
+Scoring (0-10):
+- 0-3: Gap is invalid/already solved
+- 4-6: Gap is partially valid but needs major refinement
+- 7-10: Gap survives, possibly with minor refinement"""
+
+VALIDATION_VERDICT_FIELDS = """  "gap_still_valid": true/false,
+  "survival_score": 0-10,
+  "refinement": "Updated gap/observation statement (or original if no changes needed)",
+  "evidence": "Narrative validation statement: 'Quick check: scanning [sources]. [What you found]. → [Conclusion]'",
+  "related_work": ["List of related papers or topics that should be cited"],
+  "validation_comment": "Brief comment on novelty and validation status",
+  "experiment_design_evaluation": {
+    "completeness": 0-10,
+    "reproducibility": 0-10,
+    "informativeness": 0-10,
+    "branch_logic": 0-10,
+    "overall_quality": 0-10,
+    "feedback": "Brief feedback on experiment design quality and suggestions for improvement"
+  }"""
+
+
 class ValidatorAgent:
     """
     Validates research insights against existing prior work.
@@ -809,59 +950,240 @@ class ValidatorAgent:
         self.name = "Validator"
         self.personality = "Rigorous"
         self.expertise = "Harsh validator who ensures research is truly novel and rigorous"
+        self.deadline: Optional[Deadline] = None
+        self.session = None  # HTTP session for challenge searches (None = requests)
+        self.context: Optional[SharedContext] = None  # Shared prompt prefix for the run
 
+    @traced()
     def validate(self, insights: List[Dict[str, Any]], original_topic: str, field_context: str = "") -> List[Dict[str, Any]]:
         """Challenge each insight by searching for contradicting prior work"""
         print(f"🛡️  {self.name}: Validating insights against prior work...")
         start_time = time.time()
 
         validated_insights = []
-        validation_stats = {"survived": 0, "refined": 0, "rejected": 0}
+        validation_stats = {"survived": 0, "refined": 0, "rejected": 0, "skipped": 0}
 
         for i, insight in enumerate(insights, 1):
             # Defensive check: ensure insight is a dictionary
             if not isinstance(insight, dict):
                 print(f"  ⚠️  Skipping invalid insight {i} (not a dictionary)")
                 continue
-            
-            print(f"  ↳ Validating insight {i}/{len(insights)}...")
 
-            # Extract keywords from the gap for targeted search
-            gap_text = insight.get('gap', '')
-            title_text = insight.get('title', '')
+            result, outcome = self.validate_insight(insight, i, original_topic, field_context, total=len(insights))
+            validation_stats[outcome] += 1
+            if result is not None:
+                validated_insights.append(result)
+
+        return self.summarize(validated_insights, insights, validation_stats, start_time)
+
+    @traced()
+    def validate_batch(self, insights: List[Dict[str, Any]], original_topic: str, field_context: str = "",
+                       batch_size: int = 3) -> List[Dict[str, Any]]:
+        """
+        Validate insights with one LLM call per batch of insights.
+        
+        Packs up to batch_size insights with their challenge papers into a
+        single prompt that returns verdicts keyed by insight number, so the
+        shared instructions and field context are sent once per batch instead
+        of once per insight. Insights whose verdict is missing or unparseable
+        fall back to the per-insight path.
+        """
+        print(f"🛡️  {self.name}: Validating insights against prior work (batches of {batch_size})...")
+        start_time = time.time()
+
+        numbered = []
+        for i, insight in enumerate(insights, 1):
+            # Defensive check: ensure insight is a dictionary
+            if not isinstance(insight, dict):
+                print(f"  ⚠️  Skipping invalid insight {i} (not a dictionary)")
+                continue
+            numbered.append((i, insight))
+
+        outcomes = self.validate_numbered(numbered, original_topic, field_context, batch_size=batch_size)
+
+        validated_insights = []
+        validation_stats = {"survived": 0, "refined": 0, "rejected": 0, "skipped": 0}
+        for number in sorted(outcomes):
+            result, outcome = outcomes[number]
+            validation_stats[outcome] += 1
+            if result is not None:
+                validated_insights.append(result)
 
-            # Create search query from gap + title
-            search_query = self._extract_search_keywords(gap_text, title_text, original_topic)
+        return self.summarize(validated_insights, insights, validation_stats, start_time)
 
-            # Search arXiv for potentially contradicting papers
+    def validate_numbered(self, numbered: List[Tuple[int, Dict[str, Any]]], original_topic: str,
+                          field_context: str = "", batch_size: int = 3) -> Dict[int, Tuple[Optional[Dict[str, Any]], str]]:
+        """
+        Validate (number, insight) pairs, batching the LLM verdicts.
+        
+        Returns:
+            Mapping of insight number to (insight or None if rejected, outcome)
+        """
+        outcomes = {}
+        pending = []
+        for number, insight in numbered:
+            if self._deadline_expired():
+                outcomes[number] = self._skip_for_deadline(insight, number)
+                continue
+            print(f"  ↳ Searching prior work for insight {number}...")
+            challenge_papers = self._search_challenge_papers(insight, number, original_topic)
+            if not challenge_papers:
+                outcomes[number] = self._survive_unchallenged(insight)
+            else:
+                pending.append((number, insight, challenge_papers))
+
+        batch_size = max(1, batch_size)
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+            if self._deadline_expired():
+                for number, insight, _ in batch:
+                    outcomes[number] = self._skip_for_deadline(insight, number)
+                continue
+            verdicts = self._request_batch_verdicts(batch, field_context) if len(batch) > 1 else {}
+            for number, insight, challenge_papers in batch:
+                verdict = verdicts.get(number)
+                if verdict is None:
+                    if len(batch) > 1:
+                        print(f"  ⚠️  No batched verdict for insight {number}, validating individually")
+                    outcomes[number] = self.validate_insight(
+                        insight, number, original_topic, field_context, challenge_papers=challenge_papers
+                    )
+                else:
+                    outcomes[number] = self._apply_verdict(insight, verdict, number)
+        return outcomes
+
+    @traced()
+    def _request_batch_verdicts(self, batch: List[Tuple[int, Dict[str, Any], List[Paper]]],
+                                field_context: str) -> Dict[int, Dict[str, Any]]:
+        """Ask for verdicts on a batch of insights; returns verdicts keyed by insight number"""
+        print(f"  ↳ Validating insights {', '.join(str(n) for n, _, _ in batch)} in one call...")
+        prompt = self._build_batch_validation_prompt(batch, field_context)
+        response = self.llm.call(prompt, max_tokens=min(self.llm.output_limit(self.name) * len(batch), 8192), stage=self.name)
+        parsed = self.llm.extract_json(response)
+
+        # Accept a bare array, a wrapper object, or a single verdict object
+        if isinstance(parsed, dict):
+            parsed = parsed.get('verdicts', [parsed])
+        if not isinstance(parsed, list):
+            print("  ⚠️  Batched validation parsing failed, falling back to per-insight validation")
+            return {}
+
+        expected = {number for number, _, _ in batch}
+        verdicts = {}
+        for item in parsed:
+            if not isinstance(item, dict):
+                continue
             try:
-                challenge_papers = search_arxiv(search_query, max_results=3)
-            except Exception as e:
-                print(f"  ⚠️  Search failed for insight {i}: {e}")
-                challenge_papers = []
-
-            # If no papers found, insight survives by default
-            if not challenge_papers or len(challenge_papers) == 0:
-                insight['validated'] = True
-                insight['survival_score'] = 8.5
-                insight['validation_evidence'] = "No contradicting prior work found in recent literature. Gap appears valid."
-                validated_insights.append(insight)
-                validation_stats["survived"] += 1
+                number = int(item.get('insight_id'))
+            except (TypeError, ValueError):
                 continue
+            if number in expected:
+                verdicts[number] = item
+        return verdicts
+
+    @traced()
+    def validate_insight(self, insight: Dict[str, Any], i: int, original_topic: str,
+                         field_context: str = "", total: Optional[int] = None,
+                         challenge_papers: Optional[List[Paper]] = None) -> Tuple[Optional[Dict[str, Any]], str]:
+        """
+        Validate a single insight against prior work.
+        
+        Runs the arXiv challenge search and the LLM verdict for one insight.
+        Safe to call from worker threads, which lets validation start while
+        later insights are still being synthesized.
+        
+        Args:
+            insight: Insight dictionary (updated in place with validation fields)
+            i: 1-based insight number used in progress output
+            original_topic: Research topic appended to the challenge search
+            field_context: Optional domain knowledge for the prompt
+            total: Total number of insights, if known
+            challenge_papers: Previously searched challenge papers (searched if None)
+            
+        Returns:
+            Tuple of (insight or None if rejected, outcome) where outcome is
+            "survived", "refined", "rejected" or "skipped" (run deadline reached)
+        """
+        if self._deadline_expired():
+            return self._skip_for_deadline(insight, i)
 
-            # Prepare challenge context
-            challenge_text = "\n".join([
-                f"- {p.title} ({p.year}): {p.abstract[:200]}..."
-                for p in challenge_papers[:3]
-            ])
+        print(f"  ↳ Validating insight {i}/{total}..." if total else f"  ↳ Validating insight {i}...")
 
-            # Build field context section
-            field_section = ""
-            if field_context:
-                field_section = f"""
-FIELD CONTEXT (Your Domain Knowledge):
-{field_context}
+        if challenge_papers is None:
+            challenge_papers = self._search_challenge_papers(insight, i, original_topic)
 
+        # If no papers found, insight survives by default
+        if not challenge_papers or len(challenge_papers) == 0:
+            return self._survive_unchallenged(insight)
+
+        prompt = self._build_validation_prompt(insight, challenge_papers, field_context)
+        response = self.llm.call(prompt, max_tokens=self.llm.output_limit(self.name), stage=self.name)
+        validation = self.llm.extract_json(response)
+
+        # Handle case where validation might be a list, dict, or None
+        if isinstance(validation, list):
+            # If we got a list, try to use first element if it's a dict, otherwise create default
+            print(f"  ⚠️  Warning: Validator returned a list instead of dict for insight {i}")
+            if validation and len(validation) > 0 and isinstance(validation[0], dict):
+                validation = validation[0]
+            else:
+                validation = None
+        elif not isinstance(validation, dict):
+            # If it's None or some other type, set to None
+            validation = None
+
+        # Handle failed validation parsing
+        if not validation:
+            print(f"  ⚠️  Validation parsing failed for insight {i}, defaulting to survive")
+            insight['validated'] = True
+            insight['survival_score'] = 7.0
+            insight['validation_evidence'] = "Validation inconclusive - insight retained with caution."
+            return insight, "survived"
+
+        return self._apply_verdict(insight, validation, i)
+
+    @traced()
+    def _search_challenge_papers(self, insight: Dict[str, Any], i: int, original_topic: str) -> List[Paper]:
+        """Search arXiv for papers that might contradict an insight"""
+        # Create search query from gap + title
+        search_query = self._extract_search_keywords(insight.get('gap', ''), insight.get('title', ''), original_topic)
+
+        # Search arXiv for potentially contradicting papers
+        try:
+            timeout = self.deadline.timeout(15) if self.deadline else 15
+            return search_arxiv(search_query, max_results=3, timeout=timeout, session=self.session)
+        except Exception as e:
+            print(f"  ⚠️  Search failed for insight {i}: {e}")
+            return []
+
+    def _deadline_expired(self) -> bool:
+        return self.deadline is not None and self.deadline.expired()
+
+    def _skip_for_deadline(self, insight: Dict[str, Any], i: int) -> Tuple[Dict[str, Any], str]:
+        """Keep an insight unvalidated because the run deadline was reached"""
+        print(f"  ⏱️  Run deadline reached, insight {i} kept unvalidated")
+        insight['validated'] = False
+        insight['survival_score'] = 5.0
+        insight['validation_evidence'] = "Validation skipped - run deadline reached before prior work could be checked."
+        return insight, "skipped"
+
+    def _survive_unchallenged(self, insight: Dict[str, Any]) -> Tuple[Dict[str, Any], str]:
+        """Mark an insight as surviving when no challenging prior work was found"""
+        insight['validated'] = True
+        insight['survival_score'] = 8.5
+        insight['validation_evidence'] = "No contradicting prior work found in recent literature. Gap appears valid."
+        return insight, "survived"
+
+    def _prefix(self) -> str:
+        return self.context.prefix() if self.context else ""
+
+    def _field_section(self, field_context: str) -> str:
+        """Field context block shared by single and batched validation prompts"""
+        if not field_context:
+            return ""
+        # With a shared context the field text is already in the prompt prefix
+        field_text = "" if self.context else f"\nFIELD CONTEXT (Your Domain Knowledge):\n{field_context}\n"
+        return f"""{field_text}
 Use this to:
 - Reference seminal papers and important prior work
 - Know what has already been done in the field
@@ -869,13 +1191,27 @@ Use this to:
 - Understand recent trends and field evolution
 """
 
-            # Get observation and hypothesis if available (for conceptual reasoning)
-            observation = insight.get('observation', '')
-            hypothesis = insight.get('hypothesis', '')
-            expected_insight = insight.get('expected_insight', '')
-            
-            # Ask LLM to validate with citation-aware reasoning
-            prompt = f"""You are Dr. James Park, a rigorous research validator at Harvard with 22 years of experience. 
+    def _build_validation_prompt(self, insight: Dict[str, Any], challenge_papers: List[Paper],
+                                 field_context: str) -> str:
+        """Build the citation-aware validation prompt for a single insight"""
+        gap_text = insight.get('gap', '')
+        title_text = insight.get('title', '')
+
+        # Prepare challenge context
+        challenge_text = "\n".join([
+            f"- {p.title} ({p.year}): {p.abstract[:200]}..."
+            for p in challenge_papers[:3]
+        ])
+
+        field_section = self._field_section(field_context)
+
+        # Get observation and hypothesis if available (for conceptual reasoning)
+        observation = insight.get('observation', '')
+        hypothesis = insight.get('hypothesis', '')
+        expected_insight = insight.get('expected_insight', '')
+        
+        # Ask LLM to validate with citation-aware reasoning
+        prompt = self._prefix() + f"""You are Dr. James Park, a rigorous research validator at Harvard with 22 years of experience. 
 Your personality: {self.personality} - You're known for being thorough and ensuring research is truly novel.
 You have encyclopedic knowledge of prior work and know what's been done.
 
@@ -898,127 +1234,124 @@ EXPERIMENT DESIGN:
 RECENT PAPERS THAT MIGHT CONTRADICT THIS:
 {challenge_text if challenge_text else 'No specific contradicting papers found in search.'}
 
-CITATION-AWARE VALIDATION:
-1. **Novelty Check**: Has this hypothesis been explicitly tested? Search your knowledge of the field.
-2. **Contradiction Check**: Do any of these papers (or known work) directly address this?
-3. **Related Work**: What related papers should be cited? Are there partial solutions?
-4. **Refinement**: If valid, how can we refine to be more precise given existing work?
-5. **Validation Statement**: Write a clear validation statement in narrative form (like "Quick check: scanning OpenAlex and 2023-2025 arXiv. 'Equivariant Transformers' cover group constraints, but none evaluate them as data-regularizers. → Insight validated.")
-
-🔬 EXPERIMENT DESIGN EVALUATION:
-Evaluate the experiment design on scientific rigor:
-1. **Completeness** (0-10): Does the plan cover variables + metrics? Are independent/dependent variables clearly defined? Is there a control group?
-2. **Reproducibility** (0-10): Can another researcher execute it? Is the procedure clear and detailed enough?
-3. **Informativeness** (0-10): Does it produce interpretable data? Are the deliverables specified? Will results be meaningful?
-4. **Branch Logic** (0-10): What if results differ? Is there a fallback plan? Are failure scenarios addressed?
-
-Score each criterion and provide an overall experiment_design_quality score (average of the four criteria).
-
-Scoring (0-10):
-- 0-3: Gap is invalid/already solved
-- 4-6: Gap is partially valid but needs major refinement
-- 7-10: Gap survives, possibly with minor refinement
+{VALIDATION_CRITERIA}
 
 Return JSON:
 {{
-  "gap_still_valid": true/false,
-  "survival_score": 0-10,
-  "refinement": "Updated gap/observation statement (or original if no changes needed)",
-  "evidence": "Narrative validation statement: 'Quick check: scanning [sources]. [What you found]. → [Conclusion]'",
-  "related_work": ["List of related papers or topics that should be cited"],
-  "validation_comment": "Brief comment on novelty and validation status",
-  "experiment_design_evaluation": {{
-    "completeness": 0-10,
-    "reproducibility": 0-10,
-    "informativeness": 0-10,
-    "branch_logic": 0-10,
-    "overall_quality": 0-10,
-    "feedback": "Brief feedback on experiment design quality and suggestions for improvement"
-  }}
+{VALIDATION_VERDICT_FIELDS}
 }}"""
+        return prompt
 
-            response = self.llm.call(prompt, max_tokens=1024)
-            validation = self.llm.extract_json(response)
+    def _build_batch_validation_prompt(self, batch: List[Tuple[int, Dict[str, Any], List[Paper]]],
+                                       field_context: str) -> str:
+        """Build one prompt that validates several insights, each keyed by its number"""
+        insight_blocks = []
+        for number, insight, challenge_papers in batch:
+            challenge_text = "\n".join([
+                f"- {p.title} ({p.year}): {p.abstract[:200]}..."
+                for p in challenge_papers[:3]
+            ])
+            insight_blocks.append(f"""=== INSIGHT {number} ===
+Title: {insight.get('title', '')}
+Observation: {insight.get('observation', '') or insight.get('gap', '')}
+Hypothesis: {insight.get('hypothesis', '') or 'N/A'}
+Expected Insight: {insight.get('expected_insight', '') or 'N/A'}
 
-            # Handle case where validation might be a list, dict, or None
-            if isinstance(validation, list):
-                # If we got a list, try to use first element if it's a dict, otherwise create default
-                print(f"  ⚠️  Warning: Validator returned a list instead of dict for insight {i}")
-                if validation and len(validation) > 0 and isinstance(validation[0], dict):
-                    validation = validation[0]
-                else:
-                    validation = None
-            elif not isinstance(validation, dict):
-                # If it's None or some other type, set to None
-                validation = None
+EXPERIMENT DESIGN:
+{self._format_experiment_design(insight.get('experiment_design', {}))}
 
-            # Handle failed validation parsing
-            if not validation:
-                print(f"  ⚠️  Validation parsing failed for insight {i}, defaulting to survive")
-                insight['validated'] = True
-                insight['survival_score'] = 7.0
-                insight['validation_evidence'] = "Validation inconclusive - insight retained with caution."
-                dialogue_message = f"Quick check: scanning recent literature. Validation inconclusive, but insight appears valid. → Insight retained with caution."
-                validated_insights.append(insight)
-                validation_stats["survived"] += 1
-                continue
+RECENT PAPERS THAT MIGHT CONTRADICT THIS:
+{challenge_text}""")
+        insights_text = "\n\n".join(insight_blocks)
+        ids = ", ".join(str(number) for number, _, _ in batch)
 
-            # Process validation results
-            survival_score = validation.get('survival_score', 5)
-            gap_valid = validation.get('gap_still_valid', survival_score >= 6)
-            
-            # Extract dialogue message from validation evidence
-            validation_evidence = validation.get('evidence', 'Gap validated against recent literature.')
-            dialogue_message = validation_evidence  # Use evidence as dialogue message
-
-            if gap_valid and survival_score >= 6:
-                # Insight survives
-                insight['validated'] = True
-                insight['survival_score'] = survival_score
-                insight['validation_evidence'] = validation_evidence
-                insight['validation_dialogue'] = dialogue_message
-                
-                # Add related work and validation comment if available
-                if validation.get('related_work'):
-                    insight['related_work'] = validation.get('related_work', [])
-                if validation.get('validation_comment'):
-                    insight['validation_comment'] = validation.get('validation_comment', '')
-                
-                # Add experiment design evaluation if available
-                exp_eval = validation.get('experiment_design_evaluation', {})
-                if exp_eval:
-                    insight['experiment_design_quality'] = exp_eval.get('overall_quality', 0)
-                    insight['experiment_design_feedback'] = exp_eval.get('feedback', '')
-                    insight['experiment_design_scores'] = {
-                        'completeness': exp_eval.get('completeness', 0),
-                        'reproducibility': exp_eval.get('reproducibility', 0),
-                        'informativeness': exp_eval.get('informativeness', 0),
-                        'branch_logic': exp_eval.get('branch_logic', 0)
-                    }
-
-                # Check if refinement needed - update observation or gap
-                refinement = validation.get('refinement', '')
-                if refinement and refinement.strip():
-                    if observation and refinement.strip() != observation.strip():
-                        insight['observation'] = refinement
-                    if not observation or refinement.strip() != gap_text.strip():
-                        insight['gap'] = refinement
-                    validation_stats["refined"] += 1
-                    print(f"  ✓ Insight {i} survived with refinement (score: {survival_score}/10)")
-                else:
-                    validation_stats["survived"] += 1
-                    print(f"  ✓ Insight {i} survived unchanged (score: {survival_score}/10)")
+        return self._prefix() + f"""You are Dr. James Park, a rigorous research validator at Harvard with 22 years of experience. 
+Your personality: {self.personality} - You're known for being thorough and ensuring research is truly novel.
+You have encyclopedic knowledge of prior work and know what's been done.
 
-                validated_insights.append(insight)
-            else:
-                # Insight rejected
-                validation_stats["rejected"] += 1
-                print(f"  ✗ Insight {i} rejected (score: {survival_score}/10)")
-                # Don't add to validated_insights - it's filtered out
+Your job: Validate EACH of the following {len(batch)} research insights independently with CITATION-AWARE reasoning.
+Check if the space is already occupied, if the hypothesis has been tested, if the expected insight conflicts with known work.
 
+IMPORTANT: Write each evidence statement in a DIALOGUE STYLE as if you're reporting at a research roundtable.
+Format: "Quick check: scanning [sources]. [What you found]. → [Conclusion]."
+
+{self._field_section(field_context)}
+PROPOSED INSIGHTS:
+{insights_text}
+
+{VALIDATION_CRITERIA}
+
+Return a JSON array with exactly one verdict per insight (insight_id values: {ids}):
+[
+  {{
+    "insight_id": <insight number>,
+{VALIDATION_VERDICT_FIELDS}
+  }}
+]"""
+
+    def _apply_verdict(self, insight: Dict[str, Any], validation: Dict[str, Any],
+                       i: int) -> Tuple[Optional[Dict[str, Any]], str]:
+        """Apply a parsed validation verdict to an insight"""
+        gap_text = insight.get('gap', '')
+        observation = insight.get('observation', '')
+
+        # Process validation results
+        survival_score = validation.get('survival_score', 5)
+        gap_valid = validation.get('gap_still_valid', survival_score >= 6)
+        
+        # Extract dialogue message from validation evidence
+        validation_evidence = validation.get('evidence', 'Gap validated against recent literature.')
+        dialogue_message = validation_evidence  # Use evidence as dialogue message
+
+        if gap_valid and survival_score >= 6:
+            # Insight survives
+            insight['validated'] = True
+            insight['survival_score'] = survival_score
+            insight['validation_evidence'] = validation_evidence
+            insight['validation_dialogue'] = dialogue_message
+            
+            # Add related work and validation comment if available
+            if validation.get('related_work'):
+                insight['related_work'] = validation.get('related_work', [])
+            if validation.get('validation_comment'):
+                insight['validation_comment'] = validation.get('validation_comment', '')
+            
+            # Add experiment design evaluation if available
+            exp_eval = validation.get('experiment_design_evaluation', {})
+            if exp_eval:
+                insight['experiment_design_quality'] = exp_eval.get('overall_quality', 0)
+                insight['experiment_design_feedback'] = exp_eval.get('feedback', '')
+                insight['experiment_design_scores'] = {
+                    'completeness': exp_eval.get('completeness', 0),
+                    'reproducibility': exp_eval.get('reproducibility', 0),
+                    'informativeness': exp_eval.get('informativeness', 0),
+                    'branch_logic': exp_eval.get('branch_logic', 0)
+                }
+
+            # Check if refinement needed - update observation or gap
+            refinement = validation.get('refinement', '')
+            if refinement and refinement.strip():
+                if observation and refinement.strip() != observation.strip():
+                    insight['observation'] = refinement
+                if not observation or refinement.strip() != gap_text.strip():
+                    insight['gap'] = refinement
+                print(f"  ✓ Insight {i} survived with refinement (score: {survival_score}/10)")
+                return insight, "refined"
+            print(f"  ✓ Insight {i} survived unchanged (score: {survival_score}/10)")
+            return insight, "survived"
+
+        # Insight rejected - filtered out of the validated list
+        print(f"  ✗ Insight {i} rejected (score: {survival_score}/10)")
+        return None, "rejected"
+
+    def summarize(self, validated_insights: List[Dict[str, Any]], insights: List[Dict[str, Any]],
+                  validation_stats: Dict[str, int], start_time: float) -> List[Dict[str, Any]]:
+        """Report validation stats and keep at least one insight if all were rejected"""
         duration = time.time() - start_time
         print(f"✓ {self.name}: Validation complete ({duration:.1f}s)")
         print(f"  → {validation_stats['survived']} survived | {validation_stats['refined']} refined | {validation_stats['rejected']} rejected")
+        if validation_stats.get('skipped'):
+            print(f"  → {validation_stats['skipped']} left unvalidated (run deadline reached)")
 
         # Ensure we return at least 1 insight (keep top-scoring if all rejected)
         if len(validated_insights) == 0 and len(insights) > 0:
@@ -1114,17 +1447,63 @@ class ResearchAgent:
     generate insights, and validate results against prior work.
     """
 
-    def __init__(self, use_multi_platform: bool = False, enabled_sources: Optional[set] = None):
-        self.llm = LLM()
+    # Agent stages that always run, reserved for when budgeting optional stages
+    CORE_STAGES = ["Analyzer", "Skeptic", "Synthesizer", "Validator"]
+
+    def __init__(self, use_multi_platform: bool = False, enabled_sources: Optional[set] = None,
+                 pipelined_validation: bool = False, validation_workers: int = 2,
+                 validation_queue_size: int = 2, validation_batch_size: int = 1,
+                 budget: Optional[RunBudget] = None, run_timeout: Optional[float] = None,
+                 llm: Optional[LLM] = None, http_session: Optional[Any] = None):
+        """
+        Args:
+            use_multi_platform: Search multiple platforms instead of arXiv only
+            enabled_sources: Sources for multi-platform search
+            pipelined_validation: Validate each insight as soon as the Synthesizer
+                streams it, overlapping synthesis and validation latency
+            validation_workers: Concurrent validation workers in pipelined mode
+            validation_queue_size: Bound on insights waiting for validation; a full
+                queue pauses the Synthesizer stream (backpressure)
+            validation_batch_size: Insights validated per LLM call. Values above 1
+                share one prompt across insights, with per-insight fallback
+            budget: Token/latency budget per run; optional stages are skipped and
+                context is trimmed when a run would exceed it
+            run_timeout: Default deadline in seconds for search_papers and
+                generate_insights; stages stop starting new work once it passes
+                and the best partial result is returned
+            llm: Language model client; defaults to LLM() with the backend
+                selected by LLM_BACKEND (e.g. "fake" for offline runs)
+            http_session: requests-style session for paper searches, e.g. a
+                CassetteSession; defaults to the HTTP_CASSETTE setting or live requests
+        """
+        self.llm = llm or LLM()
+        if http_session is None:
+            from .cassette import session_from_env  # Loads requests; deferred to keep imports fast
+            http_session = session_from_env()
+        self.http_session = http_session
+        self.llm.budget = budget
+        self.budget = budget
+        self.budget_actions = []
+        self.run_timeout = run_timeout
+        self.deadline: Optional[Deadline] = None
         self.analyzer = AnalyzerAgent(self.llm)
         self.skeptic = SkepticAgent(self.llm)
         self.synthesizer = SynthesizerAgent(self.llm)
         self.validator = ValidatorAgent(self.llm)
+        self.validator.session = self.http_session
         self.conversation_log = []
+        self.search_trace_id = None  # Trace of the last search_papers call
+        self.run_trace_id = None  # Trace of the last generate_insights call
+        self._exported_search_trace: Optional[str] = None  # Search trace already sent to TRACE_JSONL / OTLP
         self.use_multi_platform = use_multi_platform
         self.enabled_sources = enabled_sources
         self.multi_scraper = None
         self.last_enhanced_papers = None  # Cache for enhanced papers
+        self.last_refresh: Optional[Dict[str, int]] = None  # Counts from the last incremental run
+        self.pipelined_validation = pipelined_validation
+        self.validation_workers = max(1, validation_workers)
+        self.validation_queue_size = max(1, validation_queue_size)
+        self.validation_batch_size = max(1, validation_batch_size)
         
         # Initialize research intelligence
         self.research_intelligence = None
@@ -1142,15 +1521,16 @@ class ResearchAgent:
             try:
                 # Use provided enabled_sources or default to all sources
                 sources = enabled_sources if enabled_sources else {'arxiv', 'pwc', 'hf', 'pubmed', 'biorxiv'}
-                self.multi_scraper = SimpleMultiPlatformScraper(enabled_sources=sources)
+                self.multi_scraper = SimpleMultiPlatformScraper(enabled_sources=sources, session=self.http_session)
                 self.enabled_sources = sources
             except Exception as e:
                 print(f"Warning: Could not initialize multi-platform scraper: {e}")
                 self.use_multi_platform = False
                 self.enabled_sources = None
 
+    @traced("pipeline.search_papers")
     def search_papers(self, topic: str, num_papers: int = 5, multi_platform: Optional[bool] = None,
-                      enabled_sources: Optional[set] = None) -> List[Paper]:
+                      enabled_sources: Optional[set] = None, deadline: Optional[Deadline] = None) -> List[Paper]:
         """Search for papers (supports multi-platform)
         
         Args:
@@ -1158,6 +1538,8 @@ class ResearchAgent:
             num_papers: Number of papers to retrieve
             multi_platform: If True, search multiple platforms. If None, use instance setting.
             enabled_sources: Set of sources to search. If None, uses instance setting.
+            deadline: Run deadline shared with generate_insights. If None, a new
+                one is started from run_timeout (if set).
         
         Returns:
             List of Paper objects
@@ -1165,6 +1547,9 @@ class ResearchAgent:
         # Use parameter if provided, otherwise use instance setting
         use_multi = multi_platform if multi_platform is not None else self.use_multi_platform
         sources_to_use = enabled_sources if enabled_sources is not None else self.enabled_sources
+        self._set_deadline(deadline)
+        self.search_trace_id = current_span().trace_id
+        search_start = time.time()
         
         if use_multi and self.multi_scraper:
             print(f"🌐 Searching multiple platforms for '{topic}'...")
@@ -1193,14 +1578,18 @@ class ResearchAgent:
                     url=ep.url
                 ))
             print(f"✓ Found {len(papers)} papers from multiple platforms")
+            metrics.PIPELINE_SECONDS.labels("search").observe(time.time() - search_start)
             return papers
         else:
             print(f"📚 Searching arXiv for '{topic}'...")
-            papers = search_arxiv(topic, max_results=num_papers)
+            papers = search_arxiv(topic, max_results=num_papers, timeout=self.deadline.timeout(15),
+                                  session=self.http_session)
             print(f"✓ Found {len(papers)} papers")
+            metrics.PIPELINE_SECONDS.labels("search").observe(time.time() - search_start)
             return papers
 
-    def generate_insights(self, papers: List[Paper], topic: str = "") -> List[dict]:
+    def generate_insights(self, papers: List[Paper], topic: str = "",
+                          deadline: Optional[Deadline] = None, previous: Optional[Any] = None) -> List[dict]:
         """
         Generates research insights using the agent pipeline.
         
@@ -1210,15 +1599,52 @@ class ResearchAgent:
         Args:
             papers: List of papers to analyze
             topic: Research topic for context
+            deadline: Run deadline. Once it passes, optional stages are skipped,
+                LLM calls fail fast and remaining insights are returned
+                unvalidated. If None, a new one is started from run_timeout (if set).
+            previous: Earlier RunResult for the topic. Enables incremental mode:
+                only papers not in it are analyzed, and only the earlier
+                insights they bear on are re-validated (see refresh_topic)
             
         Returns:
             List of insight dictionaries with validation scores
         """
+        try:
+            with span("pipeline.generate_insights", topic=topic, papers=len(papers),
+                      incremental=previous is not None) as run_span:
+                if previous is not None:
+                    insights = self._refresh_insights(papers, topic, deadline, previous)
+                else:
+                    insights = self._generate_insights(papers, topic, deadline)
+                run_span.set(insights=len(insights), tokens=self.llm.usage.total().total_tokens)
+        except Exception:
+            metrics.PIPELINE_RUNS.labels("error").inc()
+            raise
+        finally:
+            self._set_shared_context(None)
+        metrics.PIPELINE_SECONDS.labels("generate").observe(run_span.duration)
+        metrics.PIPELINE_RUNS.labels("partial" if self.deadline.expired() else "ok").inc()
+        self.run_trace_id = run_span.trace_id
+        # The search ran under its own trace; export it with the pipeline so the
+        # network-bound part of the run is in the output too (once per search)
+        trace_ids = [self.run_trace_id]
+        if self.search_trace_id is not None and self.search_trace_id != self._exported_search_trace:
+            trace_ids.insert(0, self.search_trace_id)
+            self._exported_search_trace = self.search_trace_id
+        export_from_env([s for trace_id in trace_ids for s in tracer.spans(trace_id)])
+        return insights
+
+    def _generate_insights(self, papers: List[Paper], topic: str,
+                           deadline: Optional[Deadline]) -> List[dict]:
+        """Pipeline body of generate_insights(), run inside the run's root span"""
         print("\n🤖 Starting 4-Agent Pipeline...")
         pipeline_start = time.time()
 
-        # Clear conversation log
+        # Clear conversation log and per-run token accounting
         self.conversation_log = []
+        self.budget_actions = []
+        self.llm.usage.reset()
+        self._set_deadline(deadline)
         
         # Smart sampling for large paper sets (50+ papers)
         # Agents analyze top 5 papers, but for research intelligence we can use more
@@ -1226,27 +1652,37 @@ class ResearchAgent:
         papers_for_intelligence = papers
         
         if len(papers) >= 50:
-            # For 50+ papers, use stratified sampling for research intelligence
+            # For 50+ papers, use diversity-aware sampling for research intelligence
             print(f"📊 Large paper set detected ({len(papers)} papers). Using smart sampling...")
-            # Take top 20 by relevance (first 20), 10 random, and sample from different years
-            sampled_papers = papers[:20]  # Top 20
-            if len(papers) > 30:
-                import random
-                random_indices = random.sample(range(20, len(papers)), min(10, len(papers) - 20))
-                sampled_papers.extend([papers[i] for i in random_indices])
-            papers_for_intelligence = sampled_papers[:30]  # Limit to 30 for efficiency
+            # Top 10 by relevance plus one representative per topical cluster, spread across years
+            from .sampling import diverse_sample  # NumPy is loaded on first use
+            papers_for_intelligence = diverse_sample(papers, size=30, keep_top=10)
             print(f"✓ Using {len(papers_for_intelligence)} papers for research intelligence analysis")
         
         # Generate field context and research intelligence
         if self.research_intelligence and topic:
             print("🧠 Generating field context and research intelligence...")
             try:
-                self.field_context = self.research_intelligence.generate_field_context(topic)
+                self.field_context = ""
+                if self._budget_allows("field_context", pipeline_start):
+                    self.field_context = self.research_intelligence.generate_field_context(topic)
                 
                 # Extract research themes and other intelligence (use sampled papers for large sets)
-                themes_data = self.research_intelligence.extract_research_themes(papers_for_intelligence, topic)
-                methodology_combos = self.research_intelligence.analyze_methodology_combinations(papers_for_intelligence)
-                temporal_trends = self.research_intelligence.analyze_temporal_trends(papers)  # Use all papers for temporal trends
+                if self.research_intelligence.theme_mode == "local":
+                    # No model call, so every paper can be used
+                    themes_data = self.research_intelligence.extract_research_themes(papers, topic)
+                elif self._budget_allows("themes", pipeline_start):
+                    themes_data = self.research_intelligence.extract_research_themes(papers_for_intelligence, topic)
+                else:
+                    themes_data = extract_themes(papers, topic)
+                methodology_combos = []
+                if self._budget_allows("methodology_combinations", pipeline_start):
+                    methodology_combos = self.research_intelligence.analyze_methodology_combinations(papers_for_intelligence)
+                if self.research_intelligence.trend_mode == "local" or self._budget_allows("temporal_trends", pipeline_start):
+                    temporal_trends = self.research_intelligence.analyze_temporal_trends(papers)  # Use all papers for temporal trends
+                else:
+                    from .trends import detect_trends, summarize_trends  # NumPy is loaded on first use
+                    temporal_trends = summarize_trends(detect_trends(papers))
                 top_authors = self.research_intelligence.get_top_authors(papers)  # Use all papers for authors
                 
                 self.research_intelligence_data = {
@@ -1262,6 +1698,17 @@ class ResearchAgent:
                 self.field_context = ""
                 self.research_intelligence_data = None
 
+        # Trim paper and field context when the remaining budget is tight
+        if self.budget:
+            scale = self.budget.context_scale(self.llm.usage, pipeline_start, self.CORE_STAGES)
+            if scale < 1.0:
+                num_agent_papers = max(2, int(round(len(papers_for_agents) * scale)))
+                papers_for_agents = papers_for_agents[:num_agent_papers]
+                self.field_context = self.field_context[:int(len(self.field_context) * scale)]
+                self._note_budget_action(f"Trimmed agent context to {scale:.0%} ({len(papers_for_agents)} papers)")
+
+        self._share_context(topic, papers_for_agents)
+
         # Agent 1: Analyzer (uses top 5 papers)
         analyzer_result = self.analyzer.analyze_papers(papers_for_agents, topic=topic, field_context=self.field_context)
         
@@ -1294,7 +1741,8 @@ class ResearchAgent:
                 f"Most severe gap: {gaps[0]['gap'][:80]}..." if gaps else "No major gaps found"
             ],
             "key_findings": gaps[:2] if gaps else [],
-            "analysis_details": analyzer_result.get('analysis', {})
+            "analysis_details": analyzer_result.get('analysis', {}),
+            "tokens": self.llm.usage.stage("Analyzer").to_dict()
         })
 
         # Agent 2: Skeptic (uses same papers as Analyzer) - responds to Analyzer
@@ -1359,13 +1807,20 @@ class ResearchAgent:
             "potential_contradictions": potential_contradictions,
             "field_insights": field_insights,
             "field_knowledge_contradictions": field_knowledge_contradictions,
-            "interpretation": interpretation
+            "interpretation": interpretation,
+            "tokens": self.llm.usage.stage("Skeptic").to_dict()
         })
 
         # Agent 3: Synthesizer (uses same papers as Analyzer) - responds to Analyzer and Skeptic
-        synthesizer_start = time.time()
-        insights = self.synthesizer.synthesize(papers_for_agents, analyzer_result, skeptic_result, topic=topic, field_context=self.field_context)
-        synthesizer_duration = time.time() - synthesizer_start
+        # In pipelined mode Agent 4 (Validator) runs concurrently on streamed insights
+        if self.pipelined_validation:
+            insights, validated_insights, synthesizer_duration, validator_duration = self._synthesize_and_validate(
+                papers_for_agents, analyzer_result, skeptic_result, topic
+            )
+        else:
+            synthesizer_start = time.time()
+            insights = self.synthesizer.synthesize(papers_for_agents, analyzer_result, skeptic_result, topic=topic, field_context=self.field_context)
+            synthesizer_duration = time.time() - synthesizer_start
         
         # Validate insights are dictionaries before accessing
         validated_insights_for_stats = [i for i in insights if isinstance(i, dict)]
@@ -1390,13 +1845,21 @@ class ResearchAgent:
                 f"Top insight: {validated_insights_for_stats[0]['title'][:80]}..." if validated_insights_for_stats and len(validated_insights_for_stats) > 0 else "No insights generated"
             ],
             "key_findings": [{"title": i.get('title', 'Untitled'), "novelty": i.get('novelty_score', 0)} for i in validated_insights_for_stats[:2] if isinstance(i, dict)],
-            "insights": validated_insights_for_stats  # Store validated insights for dialogue context
+            "insights": validated_insights_for_stats,  # Store validated insights for dialogue context
+            "tokens": self.llm.usage.stage("Synthesizer").to_dict()
         })
 
         # Agent 4: Validator - responds to Synthesizer (use validated insights to ensure all are dicts)
-        validator_start = time.time()
-        validated_insights = self.validator.validate(validated_insights_for_stats, topic or "research", field_context=self.field_context)
-        validator_duration = time.time() - validator_start
+        if not self.pipelined_validation:
+            validator_start = time.time()
+            if self.validation_batch_size > 1:
+                validated_insights = self.validator.validate_batch(
+                    validated_insights_for_stats, topic or "research",
+                    field_context=self.field_context, batch_size=self.validation_batch_size
+                )
+            else:
+                validated_insights = self.validator.validate(validated_insights_for_stats, topic or "research", field_context=self.field_context)
+            validator_duration = time.time() - validator_start
 
         survived = len([i for i in validated_insights if isinstance(i, dict) and i.get('validated', False)])
         rejected = len(validated_insights_for_stats) - len(validated_insights)
@@ -1421,14 +1884,431 @@ class ResearchAgent:
                 f"Average survival score: {sum([i.get('survival_score', 0) for i in validated_insights if isinstance(i, dict)]) / len(validated_insights):.1f}/10" if validated_insights else "No insights survived"
             ],
             "key_findings": [{"title": i.get('title', 'Untitled'), "survival_score": i.get('survival_score', 0)} for i in validated_insights[:2] if isinstance(i, dict)],
-            "validated_insights": validated_insights
+            "validated_insights": validated_insights,
+            "tokens": self.llm.usage.stage("Validator").to_dict()
         })
 
         total_duration = time.time() - pipeline_start
-        print(f"\n✅ Pipeline complete! ({total_duration:.1f}s total)")
+        run_usage = self.llm.usage.total()
+        if self.deadline.expired():
+            self._note_deadline_action("Run deadline reached - returning partial results")
+        print(f"\n✅ Pipeline complete! ({total_duration:.1f}s total, {run_usage.total_tokens} tokens in {run_usage.calls} LLM calls)")
 
         return validated_insights
 
+    def refresh_topic(self, topic: str, num_papers: int = 5, history: Optional[Any] = None,
+                      previous: Optional[Any] = None, deadline: Optional[Deadline] = None) -> Any:
+        """
+        Search a monitored topic and analyze only what changed since its last run.
+
+        Args:
+            topic: Research topic
+            num_papers: Papers to search for
+            history: RunHistory to read the last run from and save the new one to
+            previous: Last RunResult for the topic (default: latest in history);
+                without one a full run is made
+            deadline: Run deadline covering search and analysis
+
+        Returns:
+            RunResult of the refreshed run (the previous one if the search found nothing)
+        """
+        from .run_result import RunResult
+        deadline = deadline or Deadline(self.run_timeout)
+        if previous is None and history is not None:
+            previous = history.latest(topic)
+        papers = self.search_papers(topic, num_papers, deadline=deadline)
+        if not papers:
+            print("⚠️  Search returned no papers - keeping the previous run" if previous else "❌ No papers found")
+            return previous or RunResult(topic, [])
+        insights = self.generate_insights(papers, topic, deadline=deadline,
+                                          previous=previous if previous is not None and previous.papers else None)
+        result = RunResult(
+            topic, papers, self.last_enhanced_papers if self.use_multi_platform else None, insights,
+            conversation_log=self.get_conversation_log(),
+            trace=self.get_trace(),
+            research_intelligence=self.get_research_intelligence(),
+            timed_out=self.deadline.expired(),
+            usage=self.get_usage_summary(),
+        )
+        if history is not None:
+            backend = self.llm.backend
+            history.save(result, model=f"{backend.name}:{getattr(backend, 'model_name', '')}",
+                         sources=self.enabled_sources if self.use_multi_platform else None)
+        return result
+
+    def _refresh_insights(self, papers: List[Paper], topic: str, deadline: Optional[Deadline],
+                          previous: Any) -> List[dict]:
+        """
+        Incremental pipeline body of generate_insights().
+
+        The most relevant new papers (up to five, as in a full run) go through
+        the Analyzer and Skeptic, their gaps are merged with the previous run's,
+        and the Synthesizer proposes insights from the merged analysis. The
+        Validator sees only the new insights and the earlier ones any new paper
+        bears on; the rest are kept as they were. A refresh with no new papers
+        makes no LLM calls, and one never costs more than a full run.
+        """
+        print("\n🔁 Starting incremental refresh...")
+        pipeline_start = time.time()
+        self.conversation_log = []
+        self.budget_actions = []
+        self.llm.usage.reset()
+        self._set_deadline(deadline)
+
+        fresh = new_papers(papers, previous.papers)
+        # Copies: the previous run may be shared with other sessions, and validation edits insights
+        prior_insights = [copy.deepcopy(i) for i in previous.insights if isinstance(i, dict)]
+        prior_log = {e.get("agent"): e for e in previous.conversation_log if isinstance(e, dict)}
+        prior_gaps = (prior_log.get("Analyzer", {}).get("analysis_details") or {}).get("cross_paper_gaps", [])
+        self.research_intelligence_data = self._refresh_intelligence(papers, previous.research_intelligence)
+        self.field_context = (self.research_intelligence_data or {}).get("field_context", "")
+        self.last_refresh = {"new_papers": len(fresh), "reused_insights": len(prior_insights), "revalidated": 0}
+
+        if not fresh:
+            print(f"✓ No new papers since the last run - keeping {len(prior_insights)} insights")
+            self.conversation_log = copy.deepcopy(previous.conversation_log)
+            # The log is carried over, but this run spent no agent tokens
+            for entry in self.conversation_log:
+                if isinstance(entry, dict) and "tokens" in entry:
+                    entry["tokens"] = self.llm.usage.stage(entry.get("agent", "")).to_dict()
+            return prior_insights
+        print(f"🆕 {len(fresh)} new papers of {len(papers)} (previous run: {len(previous.papers)})")
+
+        # Agents 1-2 on the new papers only (top 5 by relevance, like a full run)
+        analyzed = fresh[:5]
+        self._share_context(topic, analyzed)
+        analyzer_result = self.analyzer.analyze_papers(analyzed, topic=topic, field_context=self.field_context) or {}
+        analysis = analyzer_result.get("analysis") or {}
+        new_gaps = analysis.get("cross_paper_gaps", [])
+        analyzer_duration = analyzer_result.get("duration", 0)
+        skeptic_result = self.skeptic.critique(analyzed, analyzer_result, topic=topic, field_context=self.field_context) or {}
+        critique = skeptic_result.get("critique") or {}
+        contradictions = critique.get("contradictions", [])
+        potential_contradictions = critique.get("potential_contradictions", [])
+        skeptic_dialogue = skeptic_result.get("dialogue_message", "")
+        skeptic_duration = skeptic_result.get("duration", 0)
+
+        gaps = merge_gaps(new_gaps, prior_gaps)
+        analyzer_result = {
+            "analysis": {"cross_paper_gaps": gaps, "paper_analyses": analysis.get("paper_analyses", [])},
+            "papers_analyzed": len(analyzed),
+            "duration": analyzer_duration,
+            "dialogue_message": f"{len(analyzed)} new papers since the last run. They add {len(new_gaps)} gaps, "
+                                f"merged with {len(prior_gaps)} from before into {len(gaps)}.",
+        }
+        self.conversation_log.append({
+            "turn": 1,
+            "agent": "Analyzer",
+            "responding_to": [],
+            "message_type": "observation",
+            "dialogue_message": analyzer_result["dialogue_message"],
+            "action": "Analyzed papers new since the last run and merged gaps",
+            "duration": analyzer_duration,
+            "output_summary": f"Found {len(new_gaps)} new gaps ({len(gaps)} after merging)",
+            "thinking": [
+                f"Analyzed {len(analyzed)} of {len(fresh)} new papers ({len(papers) - len(fresh)} of {len(papers)} unchanged since the last run)",
+                f"Merged {len(new_gaps)} new gaps with {len(prior_gaps)} earlier gaps",
+                f"Most severe new gap: {new_gaps[0]['gap'][:80]}..." if new_gaps and isinstance(new_gaps[0], dict) and new_gaps[0].get('gap') else "No new gaps found"
+            ],
+            "key_findings": new_gaps[:2],
+            "analysis_details": analyzer_result["analysis"],
+            "tokens": self.llm.usage.stage("Analyzer").to_dict()
+        })
+        self.conversation_log.append({
+            "turn": 2,
+            "agent": "Skeptic",
+            "responding_to": ["Analyzer"],
+            "message_type": "challenge",
+            "dialogue_message": skeptic_dialogue or "The new papers don't overturn the earlier analysis, but their claims still need checking.",
+            "action": "Challenged the new papers' assumptions",
+            "duration": skeptic_duration,
+            "output_summary": f"Found {len(contradictions)} contradictions, {len(potential_contradictions)} potential contradictions in new papers",
+            "thinking": [
+                f"Challenged {len(new_gaps)} new gaps",
+                f"Found {len(contradictions)} direct contradictions between papers",
+                f"Suggested {len(potential_contradictions)} potential contradictions from field knowledge"
+            ],
+            "key_findings": (contradictions or potential_contradictions)[:2],
+            "contradictions": contradictions,
+            "potential_contradictions": potential_contradictions,
+            "field_insights": critique.get("field_insights", ""),
+            "field_knowledge_contradictions": critique.get("field_knowledge_contradictions", ""),
+            "interpretation": critique.get("interpretation", ""),
+            "tokens": self.llm.usage.stage("Skeptic").to_dict()
+        })
+
+        # Agent 3: new insights from the merged analysis, skipping ones the previous run already has
+        synthesizer_start = time.time()
+        new_insights = []
+        if not self.deadline.expired():
+            known = {insight_key(i) for i in prior_insights}
+            new_insights = [i for i in self.synthesizer.synthesize(analyzed, analyzer_result, skeptic_result,
+                                                                   topic=topic, field_context=self.field_context)
+                            if isinstance(i, dict) and insight_key(i) not in known]
+        synthesizer_duration = time.time() - synthesizer_start
+        self.conversation_log.append({
+            "turn": 3,
+            "agent": "Synthesizer",
+            "responding_to": ["Analyzer", "Skeptic"],
+            "message_type": "synthesis",
+            "dialogue_message": next((i.get("dialogue_message") for i in new_insights if i.get("dialogue_message")),
+                                     f"The new papers suggest {len(new_insights)} additional research directions."),
+            "action": "Generated research opportunities from the new papers",
+            "duration": synthesizer_duration,
+            "output_summary": f"Generated {len(new_insights)} new insights ({len(prior_insights)} kept from the last run)",
+            "thinking": [
+                f"Synthesized {len(new_insights)} new opportunities from {len(gaps)} merged gaps",
+                f"Top new insight: {new_insights[0].get('title', '')[:80]}..." if new_insights else "No new insights"
+            ],
+            "key_findings": [{"title": i.get('title', 'Untitled'), "novelty": i.get('novelty_score', 0)} for i in new_insights[:2]],
+            "insights": new_insights,
+            "tokens": self.llm.usage.stage("Synthesizer").to_dict()
+        })
+
+        # Agent 4: validate new insights and re-validate only the earlier ones the new papers touch
+        affected = set(affected_insights(prior_insights, fresh, topic))
+        to_validate = new_insights + [prior_insights[i] for i in sorted(affected)]
+        validator_start = time.time()
+        validated = []
+        if to_validate:
+            if self.validation_batch_size > 1:
+                validated = self.validator.validate_batch(to_validate, topic or "research", field_context=self.field_context,
+                                                          batch_size=self.validation_batch_size)
+            else:
+                validated = self.validator.validate(to_validate, topic or "research", field_context=self.field_context)
+        validator_duration = time.time() - validator_start
+        insights = [insight for i, insight in enumerate(prior_insights) if i not in affected] + validated
+        self.last_refresh.update(reused_insights=len(prior_insights) - len(affected), revalidated=len(affected))
+
+        survived = len([i for i in validated if i.get('validated', False)])
+        self.conversation_log.append({
+            "turn": 4,
+            "agent": "Validator",
+            "responding_to": ["Synthesizer"],
+            "message_type": "validation",
+            "dialogue_message": f"Checked {len(new_insights)} new insights and re-checked {len(affected)} earlier ones the new papers touch. "
+                                f"{survived} passed; {len(prior_insights) - len(affected)} unaffected insights carried over.",
+            "action": "Validated new and affected insights against prior work",
+            "duration": validator_duration,
+            "output_summary": f"{survived} survived | {len(to_validate) - len(validated)} rejected | {len(prior_insights) - len(affected)} carried over",
+            "thinking": [
+                f"Validated {len(new_insights)} new insights",
+                f"Re-validated {len(affected)} of {len(prior_insights)} earlier insights affected by new papers",
+                f"{len(to_validate) - len(validated)} insights rejected"
+            ],
+            "key_findings": [{"title": i.get('title', 'Untitled'), "survival_score": i.get('survival_score', 0)} for i in validated[:2]],
+            "validated_insights": insights,
+            "tokens": self.llm.usage.stage("Validator").to_dict()
+        })
+
+        run_usage = self.llm.usage.total()
+        print(f"\n✅ Refresh complete! ({time.time() - pipeline_start:.1f}s, {run_usage.total_tokens} tokens in {run_usage.calls} LLM calls)")
+        return insights
+
+    def _refresh_intelligence(self, papers: List[Paper], previous: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Previous research intelligence with the LLM-free parts (trends, authors) recomputed"""
+        if not previous:
+            return previous
+        data = dict(previous)
+        if self.research_intelligence:
+            if self.research_intelligence.trend_mode == "local":
+                data["temporal_trends"] = self.research_intelligence.analyze_temporal_trends(papers)
+            else:
+                from .trends import detect_trends, summarize_trends  # NumPy is loaded on first use
+                data["temporal_trends"] = summarize_trends(detect_trends(papers))
+            data["top_authors"] = self.research_intelligence.get_top_authors(papers)
+        return data
+
+    def _synthesize_and_validate(self, papers: List[Paper], analyzer_result: Dict[str, Any],
+                                 skeptic_result: Dict[str, Any], topic: str):
+        """
+        Run Synthesizer and Validator as a producer/consumer pipeline.
+        
+        The Synthesizer streams insights into a bounded queue and validation
+        workers consume them immediately, so synthesis and validation latency
+        overlap instead of adding up. A full queue blocks the producer, which
+        keeps at most validation_queue_size insights waiting.
+        
+        Returns:
+            Tuple of (synthesized insights, validated insights,
+            synthesizer duration, validator duration)
+        """
+        print(f"🔀 Pipelining Synthesizer → Validator ({self.validation_workers} workers)...")
+        work_queue = queue.Queue(maxsize=self.validation_queue_size)
+        synthesized = []
+        outcomes = {}  # insight number -> (validated insight or None, outcome)
+        timing = {"validation_start": None, "validation_end": None}
+        enqueued_at = {}  # insight number -> time it entered the queue
+        validation_topic = topic or "research"
+        
+        def produce() -> float:
+            start = time.time()
+            with span("SynthesizerAgent.synthesize_stream") as synth_span:
+                try:
+                    for insight in self.synthesizer.synthesize_stream(
+                        papers, analyzer_result, skeptic_result, topic=topic, field_context=self.field_context
+                    ):
+                        if not isinstance(insight, dict):
+                            continue
+                        synthesized.append(insight)
+                        enqueued_at[len(synthesized)] = time.time()
+                        work_queue.put((len(synthesized), insight))
+                        if self.deadline.expired():
+                            # Keep what has streamed so far; the validator marks it unvalidated
+                            self._note_deadline_action(f"Stopped synthesis after {len(synthesized)} insights")
+                            break
+                finally:
+                    synth_span.set(results=len(synthesized))
+                    # One stop marker per worker, even if synthesis failed midway
+                    for _ in range(self.validation_workers):
+                        work_queue.put(None)
+            return time.time() - start
+        
+        def consume() -> None:
+            stopped = False
+            while not stopped:
+                item = work_queue.get()
+                if item is None:
+                    return
+                # Batch whatever else is already waiting, without blocking for more
+                batch = [item]
+                while len(batch) < self.validation_batch_size:
+                    try:
+                        extra = work_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if extra is None:
+                        stopped = True
+                        break
+                    batch.append(extra)
+                dequeued = time.time()
+                if timing["validation_start"] is None:
+                    timing["validation_start"] = dequeued
+                queue_wait = max(dequeued - enqueued_at.get(n, dequeued) for n, _ in batch)
+                with span("validation.batch", insights=str([n for n, _ in batch]),
+                          queue_wait_seconds=round(queue_wait, 4)):
+                    try:
+                        if len(batch) == 1:
+                            number, insight = batch[0]
+                            outcomes[number] = self.validator.validate_insight(insight, number, validation_topic, self.field_context)
+                        else:
+                            outcomes.update(self.validator.validate_numbered(
+                                batch, validation_topic, self.field_context, batch_size=self.validation_batch_size
+                            ))
+                    except Exception as e:
+                        print(f"  ⚠️  Validation failed for insights {[n for n, _ in batch]}: {e}")
+                        for number, insight in batch:
+                            if number in outcomes:
+                                continue
+                            insight['validated'] = True
+                            insight['survival_score'] = 7.0
+                            insight['validation_evidence'] = "Validation inconclusive - insight retained with caution."
+                            outcomes[number] = (insight, "survived")
+                timing["validation_end"] = time.time()
+        
+        validator_start = time.time()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.validation_workers + 1) as executor:
+            producer = executor.submit(propagate(produce))
+            consumers = [executor.submit(propagate(consume)) for _ in range(self.validation_workers)]
+            concurrent.futures.wait(consumers)
+            try:
+                synthesizer_duration = producer.result()
+            except Exception as e:
+                print(f"⚠️  Synthesizer stream failed: {e}")
+                synthesizer_duration = time.time() - validator_start
+        
+        # Synthesis produced nothing usable - fall back to the sequential path
+        if not synthesized:
+            insights = self.synthesizer.synthesize(papers, analyzer_result, skeptic_result, topic=topic, field_context=self.field_context)
+            insights = [i for i in insights if isinstance(i, dict)]
+            validator_start = time.time()
+            if self.validation_batch_size > 1:
+                validated = self.validator.validate_batch(insights, validation_topic, field_context=self.field_context,
+                                                          batch_size=self.validation_batch_size)
+            else:
+                validated = self.validator.validate(insights, validation_topic, field_context=self.field_context)
+            return insights, validated, synthesizer_duration, time.time() - validator_start
+        
+        validation_stats = {"survived": 0, "refined": 0, "rejected": 0, "skipped": 0}
+        validated = []
+        for number in sorted(outcomes):
+            result, outcome = outcomes[number]
+            validation_stats[outcome] += 1
+            if result is not None:
+                validated.append(result)
+        validated = self.validator.summarize(validated, synthesized, validation_stats, timing["validation_start"] or validator_start)
+        
+        # Validator time is its active window, which overlaps with synthesis
+        validator_duration = (timing["validation_end"] or validator_start) - (timing["validation_start"] or validator_start)
+        return synthesized, validated, synthesizer_duration, validator_duration
+
+    def _budget_allows(self, stage: str, pipeline_start: float) -> bool:
+        """Check an optional stage against the run budget and deadline, recording skips"""
+        remaining = self.deadline.remaining()
+        if remaining is not None:
+            # Leave time for this stage plus every core agent still to run
+            needed = self.llm.usage.average_call_seconds() * (1 + len(self.CORE_STAGES))
+            if remaining < needed:
+                self._note_deadline_action(f"Skipped optional stage '{stage}' ({remaining:.0f}s left)")
+                return False
+        if not self.budget or self.budget.allows(stage, self.llm.usage, pipeline_start, self.CORE_STAGES):
+            return True
+        self._note_budget_action(f"Skipped optional stage '{stage}' to stay within budget")
+        return False
+
+    def _share_context(self, topic: str, papers: List[Paper]) -> None:
+        """
+        Put field context and papers in a prompt prefix shared by all agents.
+
+        The full prefix is cached provider-side when the backend supports it;
+        otherwise agents after the Analyzer get the compact version.
+        """
+        context = SharedContext(topic=topic, field_context=self.field_context, papers=list(papers))
+        context.cached = self.llm.cache_prefix(context.full(), CONTEXT_CACHE_TTL_SECONDS)
+        if context.cached:
+            print("✓ Shared context cached for all agents")
+        self._set_shared_context(context)
+
+    def _set_shared_context(self, context: Optional[SharedContext]) -> None:
+        """Give all agents the run's shared context, releasing the cache of the one it replaces"""
+        previous = self.analyzer.context
+        if previous is not None and previous is not context and previous.cached:
+            # The backend may be shared with other runs: this drops only this run's reference
+            self.llm.release_prefix(previous.full())
+        for agent in (self.analyzer, self.skeptic, self.synthesizer, self.validator):
+            agent.context = context
+
+    def _set_deadline(self, deadline: Optional[Deadline]) -> None:
+        """Share the run deadline with the LLM, validator and scraper"""
+        self.deadline = deadline or Deadline(self.run_timeout)
+        self.llm.deadline = self.deadline
+        self.validator.deadline = self.deadline
+        if self.multi_scraper:
+            self.multi_scraper.deadline = self.deadline
+
+    def _note_budget_action(self, action: str) -> None:
+        print(f"💰 Budget: {action}")
+        self.budget_actions.append(action)
+
+    def _note_deadline_action(self, action: str) -> None:
+        print(f"⏱️  Deadline: {action}")
+        self.budget_actions.append(action)
+
+    def get_usage_summary(self) -> Dict[str, Any]:
+        """Token usage of the last run, per stage and in total, plus budget actions taken"""
+        return {
+            "stages": self.llm.usage.by_stage(),
+            "total": self.llm.usage.total().to_dict(),
+            "budget_actions": list(self.budget_actions)
+        }
+
+    def get_trace(self) -> List[Dict[str, Any]]:
+        """Spans of the last search and pipeline run, in start order"""
+        spans = []
+        for trace_id in {self.search_trace_id, self.run_trace_id} - {None}:
+            spans.extend(tracer.spans(trace_id))
+        return [s.to_dict() for s in sorted(spans, key=lambda s: s.start)]
+
     def get_conversation_log(self) -> List[Dict[str, Any]]:
         """Get the conversation log for visualization"""
         return self.conversation_log
@@ -7,7 +7,11 @@ domain-specific knowledge for enhanced analysis.
 from typing import List, Dict, Any, Optional
 from .arxiv import Paper
 from .llm import LLM
-import re
+from .tracing import traced
+from .context_store import FieldContextStore, store_from_env
+from .keyphrases import extract_themes
+from . import metrics
+import os
 import json
 from collections import Counter, defaultdict
 from datetime import datetime
@@ -19,22 +23,60 @@ class ResearchIntelligence:
     
     Analyzes papers to identify common themes, methodology patterns, and
     temporal trends that provide context for research analysis.
+    
+    Args:
+        llm: Language model client
+        context_store: Field context cache; defaults to the one configured by
+            FIELD_CONTEXT_STORE (set it to "off" to disable)
+        theme_mode: How themes are extracted: "llm" (model call over 20 papers),
+            "local" (keyphrase engine over all papers, no model call) or "seeded"
+            (local themes refined by a smaller model call). Defaults to THEME_MODE or "llm".
+        trend_mode: How temporal trends are found: "llm" (model compares 5 recent and
+            5 older abstracts), "local" (term-by-year growth and burst statistics over
+            all papers, no model call) or "seeded" (model interprets those statistics).
+            Defaults to TREND_MODE or "llm".
     """
+    THEME_MODES = ("llm", "local", "seeded")
+    TREND_MODES = THEME_MODES
     
-    def __init__(self, llm: Optional[LLM] = None):
+    def __init__(self, llm: Optional[LLM] = None, context_store: Optional[FieldContextStore] = None,
+                 theme_mode: Optional[str] = None, trend_mode: Optional[str] = None):
         self.llm = llm or LLM()
+        self.context_store = context_store if context_store is not None else store_from_env()
+        self.theme_mode = (theme_mode or os.getenv("THEME_MODE") or "llm").lower()
+        if self.theme_mode not in self.THEME_MODES:
+            raise ValueError(f"Unknown theme mode: {self.theme_mode}")
+        self.trend_mode = (trend_mode or os.getenv("TREND_MODE") or "llm").lower()
+        if self.trend_mode not in self.TREND_MODES:
+            raise ValueError(f"Unknown trend mode: {self.trend_mode}")
     
+    @traced()
     def extract_research_themes(self, papers: List[Paper], topic: str) -> Dict[str, Any]:
         """Extract 8 research dimensions/themes from papers"""
         if not papers:
             return {"themes": [], "methodologies": [], "applications": []}
         
-        # For large paper sets, use batch processing
-        papers_to_analyze = papers[:20] if len(papers) > 20 else papers
+        if self.theme_mode == "local":
+            return extract_themes(papers, topic)
+        
+        seed_section = ""
+        if self.theme_mode == "seeded":
+            # Local themes cover every paper, so the model only needs a sample to refine them
+            local = extract_themes(papers, topic)
+            papers_to_analyze = papers[:10]
+            abstract_chars = 300
+            seed_section = f"""
+CANDIDATE THEMES (extracted locally from all {len(papers)} papers; keep, merge, rename or replace):
+{json.dumps(local["themes"])}
+"""
+        else:
+            # For large paper sets, use batch processing
+            papers_to_analyze = papers[:20] if len(papers) > 20 else papers
+            abstract_chars = 500
         
         # Prepare paper summaries
         papers_text = "\n\n".join([
-            f"PAPER {i+1}:\nTitle: {p.title}\nAbstract: {p.abstract[:500]}\nAuthors: {', '.join(p.authors[:3])}\nYear: {p.year}"
+            f"PAPER {i+1}:\nTitle: {p.title}\nAbstract: {p.abstract[:abstract_chars]}\nAuthors: {', '.join(p.authors[:3])}\nYear: {p.year}"
             for i, p in enumerate(papers_to_analyze)
         ])
         
@@ -42,6 +84,7 @@ class ResearchIntelligence:
 
 PAPERS:
 {papers_text}
+{seed_section}
 
 Extract research themes across 8 dimensions:
 1. **Architectures** - Model architectures, network designs (e.g., "Transformer variants", "CNN architectures")
@@ -71,7 +114,7 @@ Return JSON:
   "applications": ["app1", "app2", "app3"]
 }}"""
         
-        response = self.llm.call(prompt, max_tokens=2048)
+        response = self.llm.call(prompt, max_tokens=self.llm.output_limit("ResearchIntelligence", 2048), stage="ResearchIntelligence")
         themes_data = self.llm.extract_json(response)
         
         # Handle case where themes_data might be a list or None
@@ -89,26 +132,10 @@ Return JSON:
         return themes_data
     
     def _extract_themes_fallback(self, papers: List[Paper], topic: str) -> Dict[str, Any]:
-        """Fallback theme extraction using keyword matching"""
-        all_text = " ".join([p.title + " " + p.abstract[:200] for p in papers])
-        words = re.findall(r'\b[a-z]{4,}\b', all_text.lower())
-        common_words = [w for w, count in Counter(words).most_common(20) if count >= 2]
-        
-        return {
-            "themes": {
-                "architectures": common_words[:3],
-                "paradigms": common_words[3:6],
-                "applications": [topic],
-                "datasets": [],
-                "optimization": [],
-                "evaluation": [],
-                "challenges": [],
-                "trends": []
-            },
-            "methodologies": common_words[:5],
-            "applications": [topic]
-        }
+        """Fallback theme extraction with the local keyphrase engine"""
+        return extract_themes(papers, topic)
     
+    @traced()
     def analyze_methodology_combinations(self, papers: List[Paper]) -> List[Dict[str, Any]]:
         """Find intersection opportunities between methodologies"""
         if not papers:
@@ -142,7 +169,7 @@ Return JSON array:
   }}
 ]"""
         
-        response = self.llm.call(prompt, max_tokens=1536)
+        response = self.llm.call(prompt, max_tokens=self.llm.output_limit("ResearchIntelligence", 1536), stage="ResearchIntelligence")
         combinations = self.llm.extract_json(response)
         
         if not combinations or not isinstance(combinations, list):
@@ -150,11 +177,15 @@ Return JSON array:
         
         return combinations
     
+    @traced()
     def analyze_temporal_trends(self, papers: List[Paper]) -> Dict[str, Any]:
         """Analyze year-over-year patterns"""
         if not papers:
             return {"trends": [], "year_distribution": {}}
         
+        if self.trend_mode != "llm":
+            return self._analyze_trends_local(papers)
+        
         # Group by year
         year_counts = Counter(p.year for p in papers if p.year)
         years = sorted(year_counts.keys())
@@ -194,7 +225,7 @@ Return JSON:
   "evolution": "How the field has evolved"
 }}"""
         
-        response = self.llm.call(prompt, max_tokens=1024)
+        response = self.llm.call(prompt, max_tokens=self.llm.output_limit("ResearchIntelligence", 1024), stage="ResearchIntelligence")
         trends_data = self.llm.extract_json(response)
         
         # Handle case where trends_data might be a list or None
@@ -215,6 +246,50 @@ Return JSON:
         trends_data["year_distribution"] = dict(year_counts)
         return trends_data
     
+    def _analyze_trends_local(self, papers: List[Paper]) -> Dict[str, Any]:
+        """Trends from term statistics, optionally interpreted by the model (seeded mode)"""
+        from .trends import detect_trends, summarize_trends  # NumPy is loaded on first use
+        summary = summarize_trends(detect_trends(papers))
+        term_trends = summary["term_trends"]
+        if self.trend_mode == "local" or not term_trends["emerging"]:
+            return summary
+        
+        def rows(items: List[Dict[str, Any]]) -> str:
+            return "\n".join(
+                f"- {t['term']}: growth {t['growth']:+.2f} (log2), recent share {t['recent_share']:.1%}, "
+                f"older share {t['older_share']:.1%}, burst {t['burst_years'] or 'none'}"
+                for t in items[:8]
+            ) or "- none"
+        
+        prompt = f"""Interpret term statistics computed over {term_trends['papers']} papers in a research area.
+
+PAPERS PER YEAR: {json.dumps(term_trends['year_distribution'])}
+
+EMERGING TERMS (share of recent vs. older papers mentioning them):
+{rows(term_trends['emerging'])}
+
+DECLINING TERMS:
+{rows(term_trends['declining'])}
+
+BURSTING TERMS (unusually frequent in the listed years):
+{rows(term_trends['bursts'])}
+
+Describe the trends these statistics show. Merge related terms and ignore generic ones.
+
+Return JSON:
+{{
+  "trends": ["trend1", "trend2", "trend3"],
+  "recent_focus": ["focus1", "focus2"],
+  "evolution": "How the field has evolved"
+}}"""
+        
+        response = self.llm.call(prompt, max_tokens=self.llm.output_limit("ResearchIntelligence", 1024), stage="ResearchIntelligence")
+        trends_data = self.llm.extract_json(response)
+        if isinstance(trends_data, dict) and trends_data.get("trends"):
+            summary.update({key: trends_data[key] for key in ("trends", "recent_focus", "evolution") if key in trends_data})
+        return summary
+    
+    @traced()
     def identify_research_gaps(self, papers: List[Paper], themes: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Identify specific, scored research gaps"""
         if not papers:
@@ -256,7 +331,7 @@ Return JSON array:
   }}
 ]"""
         
-        response = self.llm.call(prompt, max_tokens=2048)
+        response = self.llm.call(prompt, max_tokens=self.llm.output_limit("ResearchIntelligence", 2048), stage="ResearchIntelligence")
         gaps = self.llm.extract_json(response)
         
         if not gaps or not isinstance(gaps, list):
@@ -264,8 +339,24 @@ Return JSON array:
         
         return gaps
     
+    @traced()
     def generate_field_context(self, topic: str) -> str:
-        """Generate domain knowledge context for agents"""
+        """Generate domain knowledge context for agents, reusing stored context for the same or a near-identical topic"""
+        if self.context_store is not None:
+            cached = self.context_store.lookup(topic)
+            metrics.record_cache("field_context", cached is not None)
+            if cached:
+                context, matched_topic, similarity = cached
+                print(f"✓ Reusing field context for '{matched_topic}' (similarity {similarity:.2f})")
+                return context
+        
+        response = self._generate_field_context(topic)
+        if self.context_store is not None and len(response) >= 200 and not response.startswith("Error:"):
+            self.context_store.put(topic, response)
+        return response
+    
+    def _generate_field_context(self, topic: str) -> str:
+        """LLM calls behind generate_field_context()"""
         prompt = f"""You are a domain expert in "{topic}". Provide a comprehensive field context including:
 
 1. **Key Players**: Important researchers, labs, institutions in this field
@@ -280,7 +371,7 @@ Be specific and reference real names, papers, and institutions when possible.
 
 Format as a structured field context document."""
         
-        response = self.llm.call(prompt, max_tokens=1536)
+        response = self.llm.call(prompt, max_tokens=self.llm.output_limit("ResearchIntelligence", 1536), stage="ResearchIntelligence")
         
         # If response is too short, enhance it
         if len(response) < 200:
@@ -293,7 +384,7 @@ Format as a structured field context document."""
 - Recent trends (2023-2024)
 
 Be specific with names and details."""
-            response = self.llm.call(enhanced_prompt, max_tokens=1536)
+            response = self.llm.call(enhanced_prompt, max_tokens=self.llm.output_limit("ResearchIntelligence", 1536), stage="ResearchIntelligence")
         
         return response if response else f"Field context for {topic}: Active research area with ongoing developments."
     
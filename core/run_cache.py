@@ -0,0 +1,167 @@
+"""
+Process-wide cache of completed research runs.
+
+The Streamlit app serves many sessions from one process. Runs are keyed by
+(topic, paper count, sources, model); a finished run is reused by any
+session asking the same question, and concurrent identical requests wait on
+the single run already in progress instead of starting their own. Entries
+expire after a TTL and the least recently used are evicted to stay within an
+entry count and an approximate memory budget.
+"""
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+from .text import normalize_topic
+from . import metrics
+
+
+def run_key(topic: str, num_papers: int, sources: Optional[Iterable[str]], model: str) -> Tuple:
+    """Cache key for a run; topic spelling variants ("LLMs" / "llm") share a key"""
+    return (normalize_topic(topic), int(num_papers), tuple(sorted(sources)) if sources else None, model)
+
+
+def approx_size(value: Any) -> int:
+    """Approximate memory footprint of a result, in bytes"""
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return 0
+
+
+class _InFlight:
+    """A run in progress that other requests for the same key wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[Exception] = None
+        # Set when the leader was interrupted (rerun, stop, Ctrl-C) rather than failing
+        self.abandoned = False
+
+
+class RunCache:
+    """
+    LRU cache of run results with in-flight deduplication.
+
+    Args:
+        max_entries: Most results kept
+        max_bytes: Approximate memory budget for kept results
+        ttl_seconds: Age after which a result is recomputed
+    """
+
+    def __init__(self, max_entries: int = 32, max_bytes: int = 256 * 1024 * 1024,
+                 ttl_seconds: float = 6 * 3600):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Dict[str, Any]]" = OrderedDict()
+        self._in_flight: Dict[Hashable, _InFlight] = {}
+        self.bytes = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Cached result for key, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.time() - entry["created"] > self.ttl_seconds:
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry["value"]
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any],
+                       cache_if: Callable[[Any], bool] = lambda value: True,
+                       on_wait: Optional[Callable[[], None]] = None) -> Tuple[Any, bool]:
+        """
+        Cached result for key, computing it once if missing.
+
+        Concurrent callers with the same key wait for the first caller's
+        computation. Its exceptions propagate to every waiting caller and are
+        not cached; results failing cache_if (e.g. partial runs) are returned
+        but not kept. If the first caller is interrupted instead (a Streamlit
+        rerun or stop, KeyboardInterrupt), that interruption stays in its own
+        thread and one of the waiting callers computes the result.
+
+        Args:
+            key: Result key, see run_key()
+            compute: Produces the result
+            cache_if: Whether a result may be kept
+            on_wait: Called before waiting on another caller's computation
+
+        Returns:
+            (result, True when it came from the cache or another caller's run)
+        """
+        waited = False
+        while True:
+            value = self.get(key)
+            if value is not None:
+                metrics.record_cache("run_result", True)
+                return value, True
+
+            with self._lock:
+                flight = self._in_flight.get(key)
+                leader = flight is None
+                if leader:
+                    flight = self._in_flight[key] = _InFlight()
+            if leader:
+                break
+
+            if not waited:
+                metrics.record_cache("run_result", True)
+                if on_wait:
+                    on_wait()
+                waited = True
+            flight.done.wait()
+            if flight.abandoned:
+                continue  # Compute it here (or wait on whoever got there first)
+            if flight.error is not None:
+                raise flight.error
+            return flight.value, True
+
+        metrics.record_cache("run_result", False)
+        try:
+            flight.value = compute()
+            if flight.value is not None and cache_if(flight.value):
+                self.put(key, flight.value)
+            return flight.value, False
+        except Exception as e:
+            flight.error = e
+            raise
+        except BaseException:
+            # Session-specific control flow must not be raised in other sessions
+            flight.abandoned = True
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            flight.done.set()
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store a result, evicting least recently used entries over the limits"""
+        size = approx_size(value)
+        if size > self.max_bytes:
+            print(f"⚠️  Run result too large to cache ({size / 1e6:.1f} MB)")
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = {"value": value, "size": size, "created": time.time()}
+            self.bytes += size
+            while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _drop(self, key: Hashable) -> None:
+        """Remove an entry (callers hold the lock)"""
+        self.bytes -= self._entries.pop(key)["size"]
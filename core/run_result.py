@@ -0,0 +1,305 @@
+"""
+Compact storage for a completed research run.
+
+A run used to live in session state as papers, enhanced papers (a second
+copy of every paper), insights and a conversation log that embeds the
+insight lists again. RunResult keeps each entity once: the papers plus only
+the fields enhanced papers add, one insight table, and a log whose insight
+lists are references into that table. Full views are rebuilt on first access
+and reused until the result is spilled.
+
+Idle results can be spilled to disk as a compressed pickle and are reloaded
+transparently on their next access, so a process serving many sessions only
+keeps the runs in active use in memory.
+"""
+import json
+import os
+import pickle
+import threading
+import time
+import uuid
+import weakref
+import zlib
+from dataclasses import asdict, fields, is_dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from .arxiv import Paper
+from .multi_platform import EnhancedPaper
+
+INSIGHT_REFS = "__insight_refs__"
+
+# Conversation log fields holding insight lists
+_LOG_INSIGHT_FIELDS = ("insights", "validated_insights")
+_PAPER_FIELDS = tuple(f.name for f in fields(Paper))
+_ENHANCED_EXTRAS = tuple(f for f in fields(EnhancedPaper) if f.name not in _PAPER_FIELDS)
+
+# Every live result, for the idle sweep; results drop out when garbage collected
+_LIVE: "weakref.WeakSet[RunResult]" = weakref.WeakSet()
+
+
+def _insight_key(insight: Any) -> str:
+    """Content key, so equal insights copied between pipeline stages are stored once"""
+    try:
+        return json.dumps(insight, sort_keys=True, default=str)
+    except (TypeError, ValueError):
+        return f"id:{id(insight)}"
+
+
+def _as_dict(item: Any) -> Any:
+    return asdict(item) if is_dataclass(item) else item
+
+
+def _remove_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class RunResult:
+    """
+    One run's papers, insights, conversation log, trace, research intelligence and token usage.
+
+    Each result gets a unique run_id (kept through pickling and spills).
+
+    Args:
+        topic: Research topic
+        papers: Papers in relevance order
+        enhanced_papers: Multi-platform EnhancedPapers aligned with papers, if any
+        insights: Final (validated) insights
+        conversation_log: Agent conversation log
+        trace: Run trace spans as dicts
+        research_intelligence: Field-level analysis
+        timed_out: Whether the run hit its deadline
+        usage: Run token usage (ResearchAgent.get_usage_summary()): per stage,
+            including those outside the conversation log, and in total
+    """
+
+    def __init__(self, topic: str, papers: Sequence[Any], enhanced_papers: Optional[Sequence[Any]] = None,
+                 insights: Optional[Sequence[Any]] = None, conversation_log: Optional[Sequence[Dict[str, Any]]] = None,
+                 trace: Optional[List[Dict[str, Any]]] = None, research_intelligence: Any = None,
+                 timed_out: bool = False, usage: Optional[Dict[str, Any]] = None):
+        self.topic = topic
+        self.timed_out = timed_out
+        self.run_id = uuid.uuid4().hex
+        self._init_runtime()
+        self._state: Optional[Dict[str, Any]] = self._pack(
+            papers, enhanced_papers, insights, conversation_log, trace, research_intelligence, usage)
+
+    def _init_runtime(self) -> None:
+        self._lock = threading.RLock()
+        self._views: Dict[str, Any] = {}
+        self._spill_path: Optional[str] = None
+        self._state = None
+        self.last_access = time.time()
+        _LIVE.add(self)
+
+    @staticmethod
+    def _pack(papers, enhanced_papers, insights, conversation_log, trace, research_intelligence, usage) -> Dict[str, Any]:
+        table: List[Any] = []
+        position: Dict[str, int] = {}
+
+        def refs(items: Sequence[Any]) -> List[int]:
+            out = []
+            for item in items:
+                key = _insight_key(item)
+                if key not in position:
+                    position[key] = len(table)
+                    table.append(item)
+                out.append(position[key])
+            return out
+
+        papers = list(papers or [])
+        enhanced_extras = enhanced = None
+        if enhanced_papers:
+            aligned = len(enhanced_papers) == len(papers) and all(
+                isinstance(e, EnhancedPaper) and e.title == p.title for e, p in zip(enhanced_papers, papers))
+            if aligned:
+                # Only the fields EnhancedPaper adds, and only where they differ from the defaults
+                enhanced_extras = [{f.name: getattr(e, f.name) for f in _ENHANCED_EXTRAS
+                                    if getattr(e, f.name) != f.default} for e in enhanced_papers]
+            else:
+                enhanced = list(enhanced_papers)
+
+        log = [
+            {name: ({INSIGHT_REFS: refs(value)} if name in _LOG_INSIGHT_FIELDS and isinstance(value, list) else value)
+             for name, value in entry.items()} if isinstance(entry, dict) else entry
+            for entry in (conversation_log or [])
+        ]
+        return {
+            "papers": papers,
+            "enhanced_extras": enhanced_extras,
+            "enhanced": enhanced,
+            "insights": refs(insights or []),
+            "insight_table": table,
+            "log": log,
+            "trace": list(trace or []),
+            "research_intelligence": research_intelligence,
+            "usage": usage,
+        }
+
+    def _data(self) -> Dict[str, Any]:
+        """Packed state, reloaded from the spill file if needed"""
+        with self._lock:
+            self.last_access = time.time()
+            if self._state is None:
+                with open(self._spill_path, "rb") as f:
+                    self._state = pickle.loads(zlib.decompress(f.read()))
+            return self._state
+
+    def derived(self, name: str, build: Callable[[], Any]) -> Any:
+        """
+        Value computed from this result once and kept with it (dropped on spill).
+
+        Views and per-result indexes live here rather than in session state, so
+        spilling a result frees everything built from it.
+        """
+        with self._lock:
+            self._data()
+            if name not in self._views:
+                self._views[name] = build()
+            return self._views[name]
+
+    @property
+    def papers(self) -> List[Any]:
+        return self._data()["papers"]
+
+    @property
+    def enhanced_papers(self) -> Optional[List[Any]]:
+        """EnhancedPapers aligned with papers (multi-platform runs), else None"""
+        def build():
+            state = self._data()
+            if state["enhanced_extras"] is None:
+                return state["enhanced"]
+            return [EnhancedPaper(**{name: getattr(p, name) for name in _PAPER_FIELDS}, **extras)
+                    for p, extras in zip(state["papers"], state["enhanced_extras"])]
+        return self.derived("enhanced_papers", build)
+
+    @property
+    def insights(self) -> List[Any]:
+        def build():
+            state = self._data()
+            return [state["insight_table"][i] for i in state["insights"]]
+        return self.derived("insights", build)
+
+    @property
+    def conversation_log(self) -> List[Dict[str, Any]]:
+        """Log with insight references resolved back to the insight dicts"""
+        def build():
+            table = self._data()["insight_table"]
+            return [
+                {name: ([table[i] for i in value[INSIGHT_REFS]] if isinstance(value, dict) and INSIGHT_REFS in value
+                        else value)
+                 for name, value in entry.items()} if isinstance(entry, dict) else entry
+                for entry in self._data()["log"]
+            ]
+        return self.derived("conversation_log", build)
+
+    @property
+    def trace(self) -> List[Dict[str, Any]]:
+        return self._data()["trace"]
+
+    @property
+    def research_intelligence(self) -> Any:
+        return self._data()["research_intelligence"]
+
+    @property
+    def usage(self) -> Optional[Dict[str, Any]]:
+        """Run token usage ({"stages", "total", "budget_actions"}), if recorded"""
+        return self._data().get("usage")
+
+    @property
+    def spilled(self) -> bool:
+        return self._state is None
+
+    def spill(self, directory: str) -> bool:
+        """
+        Write the result to directory and drop it from memory.
+
+        The state never changes after construction, so the file is written
+        once and reused by later spills; it is removed when the result is
+        garbage collected.
+
+        Returns:
+            True if memory was released
+        """
+        with self._lock:
+            if self._state is None or not self._state["papers"]:
+                return False
+            if self._spill_path is None:
+                try:
+                    os.makedirs(directory, exist_ok=True)
+                    path = os.path.join(directory, f"run_{uuid.uuid4().hex}.pkl.z")
+                    with open(f"{path}.tmp", "wb") as f:
+                        f.write(zlib.compress(pickle.dumps(self._state, protocol=pickle.HIGHEST_PROTOCOL)))
+                    os.replace(f"{path}.tmp", path)
+                except (OSError, pickle.PicklingError) as e:
+                    print(f"⚠️  Could not spill run result: {e}")
+                    return False
+                self._spill_path = path
+                weakref.finalize(self, _remove_file, path)
+            self._state = None
+            self._views.clear()
+            return True
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable packed form: papers once, the log still referencing the insight table"""
+        state = self._data()
+        return {
+            "run_id": self.run_id,
+            "topic": self.topic,
+            "timed_out": self.timed_out,
+            **state,
+            "papers": [_as_dict(p) for p in state["papers"]],
+            "enhanced": [_as_dict(e) for e in state["enhanced"]] if state["enhanced"] is not None else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RunResult":
+        """Rebuild a result saved with to_dict()"""
+        result = cls.__new__(cls)
+        result.run_id = data["run_id"]
+        result.topic = data["topic"]
+        result.timed_out = data.get("timed_out", False)
+        result._init_runtime()
+        paper_fields = set(_PAPER_FIELDS)
+        enhanced = data.get("enhanced")
+        result._state = {
+            "papers": [Paper(**p) if isinstance(p, dict) and set(p) == paper_fields else p for p in data["papers"]],
+            "enhanced_extras": data.get("enhanced_extras"),
+            "enhanced": [EnhancedPaper(**e) if isinstance(e, dict) else e for e in enhanced] if enhanced is not None else None,
+            "insights": data.get("insights", []),
+            "insight_table": data.get("insight_table", []),
+            "log": data.get("log", []),
+            "trace": data.get("trace", []),
+            "research_intelligence": data.get("research_intelligence"),
+            "usage": data.get("usage"),
+        }
+        return result
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"run_id": self.run_id, "topic": self.topic, "timed_out": self.timed_out, "state": self._data()}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.run_id = state["run_id"]
+        self.topic = state["topic"]
+        self.timed_out = state["timed_out"]
+        self._init_runtime()
+        self._state = state["state"]
+
+
+def spill_idle(directory: str, idle_seconds: float) -> int:
+    """Spill every result not accessed for idle_seconds; returns how many were spilled"""
+    now = time.time()
+    spilled = sum(1 for result in list(_LIVE)
+                  if now - result.last_access > idle_seconds and not result.spilled and result.spill(directory))
+    if spilled:
+        print(f"💾 Spilled {spilled} idle run result(s) to {directory}")
+    return spilled
+
+
+def spill_settings_from_env() -> Optional[Tuple[str, float]]:
+    """(directory, idle seconds) from RUN_SPILL_DIR / RUN_SPILL_IDLE_SECONDS (None when disabled)"""
+    directory = os.getenv("RUN_SPILL_DIR", "")
+    if not directory or directory.lower() == "off":
+        return None
+    return directory, float(os.getenv("RUN_SPILL_IDLE_SECONDS", "600") or 600)
@@ -0,0 +1,121 @@
+"""
+Diversity-aware paper sampling.
+
+Large paper sets are sampled before they go into LLM prompts. Instead of
+random papers, the sample keeps the most relevant papers and adds one
+representative per topical cluster (spherical k-means on TF-IDF vectors),
+chosen by maximal marginal relevance and preferring publication years the
+sample does not cover yet. Sampling is deterministic for a given seed.
+"""
+import math
+from collections import Counter
+from typing import List, Optional
+import numpy as np
+from .arxiv import Paper
+from .keyphrases import candidate_phrases
+
+
+def tfidf_matrix(papers: List[Paper], max_features: int = 512) -> np.ndarray:
+    """L2-normalized TF-IDF rows (papers x most frequent terms), float32"""
+    documents = [Counter(candidate_phrases(f"{p.title}. {p.abstract}", max_words=2)) for p in papers]
+    df: Counter = Counter()
+    for counts in documents:
+        df.update(counts.keys())
+    # Terms in one paper cannot relate papers; terms in most papers cannot separate them
+    limit = 0.5 * len(papers)
+    vocabulary = [t for t, n in sorted(df.items(), key=lambda item: (-item[1], item[0])) if 2 <= n <= limit]
+    index = {term: i for i, term in enumerate(vocabulary[:max_features])}
+
+    matrix = np.zeros((len(papers), len(index)), dtype=np.float32)
+    for row, counts in enumerate(documents):
+        for term, count in counts.items():
+            column = index.get(term)
+            if column is not None:
+                matrix[row, column] = (1 + math.log(count)) * math.log(len(papers) / df[term])
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms > 0, norms, 1)
+
+
+def kmeans(vectors: np.ndarray, k: int, seed: int = 0, iterations: int = 15) -> np.ndarray:
+    """Spherical k-means (cosine) with k-means++ seeding; returns cluster labels"""
+    n = len(vectors)
+    k = min(k, n)
+    if k <= 1:
+        return np.zeros(n, dtype=np.int64)
+    rng = np.random.default_rng(seed)
+    centroids = [vectors[rng.integers(n)]]
+    distance = 1 - vectors @ centroids[0]
+    for _ in range(1, k):
+        weights = np.clip(distance, 0, None)
+        total = weights.sum()
+        choice = rng.choice(n, p=weights / total) if total > 0 else rng.integers(n)
+        centroids.append(vectors[choice])
+        distance = np.minimum(distance, 1 - vectors @ vectors[choice])
+    centroids = np.array(centroids)
+
+    labels = np.full(n, -1, dtype=np.int64)
+    for _ in range(iterations):
+        new_labels = np.argmax(vectors @ centroids.T, axis=1)
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        for c in range(k):
+            members = vectors[labels == c]
+            if len(members):
+                centroid = members.sum(axis=0)
+                norm = np.linalg.norm(centroid)
+                centroids[c] = centroid / norm if norm > 0 else centroid
+    return labels
+
+
+def diverse_sample(papers: List[Paper], size: int = 30, keep_top: int = 10, seed: int = 0,
+                   diversity: float = 0.5, vectors: Optional[np.ndarray] = None) -> List[Paper]:
+    """
+    Relevant, non-redundant sample of papers covering the set's topics and years.
+
+    Args:
+        papers: Papers ordered by relevance (most relevant first)
+        size: Papers to return
+        keep_top: Most relevant papers always included
+        seed: Clustering seed
+        diversity: MMR trade-off between relevance (0) and novelty (1)
+        vectors: Precomputed tfidf_matrix(papers)
+
+    Returns:
+        Sampled papers, the kept top papers first, then one per cluster
+    """
+    if len(papers) <= size:
+        return list(papers)
+    vectors = tfidf_matrix(papers) if vectors is None else vectors
+    n = len(papers)
+    keep_top = min(keep_top, size)
+    relevance = 1 - np.arange(n) / n
+    labels = kmeans(vectors, size - keep_top, seed=seed)
+
+    selected = list(range(keep_top))
+    chosen = np.zeros(n, dtype=bool)
+    chosen[selected] = True
+    # Highest similarity of each paper to anything already selected
+    redundancy = (vectors @ vectors[selected].T).max(axis=1) if selected else np.zeros(n)
+    years = {papers[i].year for i in selected}
+
+    def pick(candidates: np.ndarray) -> None:
+        nonlocal redundancy
+        new_year = np.array([papers[i].year not in years for i in candidates], dtype=float)
+        score = (1 - diversity) * relevance[candidates] - diversity * redundancy[candidates] + 0.1 * new_year
+        best = int(candidates[np.argmax(score)])
+        selected.append(best)
+        chosen[best] = True
+        years.add(papers[best].year)
+        redundancy = np.maximum(redundancy, vectors @ vectors[best])
+
+    # Largest clusters first, so the biggest topics are covered if slots run out
+    for cluster in np.argsort(-np.bincount(labels), kind="stable"):
+        if len(selected) >= size:
+            break
+        candidates = np.flatnonzero((labels == cluster) & ~chosen)
+        if len(candidates):
+            pick(candidates)
+    while len(selected) < size:
+        pick(np.flatnonzero(~chosen))
+    return [papers[i] for i in selected]
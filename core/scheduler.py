@@ -0,0 +1,368 @@
+"""
+Background refresh scheduler for the topic watchlist.
+
+Each cycle takes the due topics from the watchlist (core.watchlist) and runs
+incremental refreshes (ResearchAgent.refresh_topic) for them, highest
+priority first, on a small worker pool. Finished runs are saved to the run
+history, where the app's "Past Runs" picker shows them.
+
+All refreshes in the process share one LLM backend and one HTTP session,
+each behind a token-bucket rate limit, so the limits hold however many
+topics are due. Overlapping work is coalesced:
+
+- topics with the same words and sources ("LLM code generation" and "code
+  generation LLMs") are refreshed once, as the highest-priority one, with
+  the largest paper count among them, and the run is saved under each
+  topic; a matching topic that is not due yet is pulled into that refresh
+  rather than repeating the search later;
+- identical GET requests within a cycle (the same search issued by several
+  topics, or by several insights' validation checks) go out once and share
+  the response.
+
+Usage:
+    python -m core.scheduler add "graph neural networks" --every 12 --priority 1
+    python -m core.scheduler list
+    python -m core.scheduler run            # poll forever
+    python -m core.scheduler run --once     # refresh what is due, then exit
+"""
+import argparse
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, FrozenSet, Iterator, List, Optional, Tuple
+from .backends import Generation, LLMBackend, create_backend
+from .watchlist import Watchlist, WatchedTopic, watchlist_from_env
+
+
+class RateLimiter:
+    """
+    Token bucket shared across threads.
+
+    Args:
+        per_minute: Sustained rate (0 or less disables the limit)
+        burst: Requests allowed back to back after an idle period
+    """
+
+    def __init__(self, per_minute: float, burst: int = 1):
+        self.rate = per_minute / 60.0
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, waiting as needed; returns the seconds waited"""
+        if self.rate <= 0:
+            return 0.0
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class RateLimitedBackend(LLMBackend):
+    """LLM backend that takes a token from a shared limiter before each request"""
+
+    def __init__(self, backend: LLMBackend, limiter: RateLimiter):
+        self.backend = backend
+        self.limiter = limiter
+        self.name = backend.name
+
+    def __getattr__(self, name: str) -> Any:
+        # model_name and other backend details
+        return getattr(self.backend, name)
+
+    def generate(self, prompt: str, max_tokens: int, timeout: float) -> Generation:
+        self.limiter.acquire()
+        return self.backend.generate(prompt, max_tokens, timeout)
+
+    def stream(self, prompt: str, max_tokens: int, timeout: float) -> Iterator[Generation]:
+        self.limiter.acquire()
+        yield from self.backend.stream(prompt, max_tokens, timeout)
+
+    def cache_prefix(self, prefix: str, ttl_seconds: int) -> bool:
+        self.limiter.acquire()
+        return self.backend.cache_prefix(prefix, ttl_seconds)
+
+    def release_prefix(self, prefix: Optional[str] = None) -> None:
+        self.backend.release_prefix(prefix)
+
+
+class RateLimitedSession:
+    """
+    requests-style session that rate-limits GETs and sends each distinct one once.
+
+    Successful responses are kept by URL and parameters; a request already
+    in flight in another thread is waited for rather than repeated. Use a
+    new session (sharing the underlying one) per scheduler cycle so results
+    are not reused across refreshes.
+
+    Args:
+        session: Underlying session (requests.Session, CassetteSession, ...)
+        limiter: Shared HTTP rate limiter
+    """
+
+    def __init__(self, session: Any, limiter: RateLimiter):
+        self.session = session
+        self.limiter = limiter
+        self.requests = 0
+        self.coalesced = 0
+        self._responses: Dict[Tuple[str, str], Any] = {}
+        self._key_locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name: str) -> Any:
+        # headers and other session attributes
+        return getattr(self.session, name)
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None, **kwargs) -> Any:
+        key = (url, repr(sorted((params or {}).items())))
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            if key in self._responses:
+                self.coalesced += 1
+                return self._responses[key]
+            self.limiter.acquire()
+            response = self.session.get(url, params=params, **kwargs)
+            self.requests += 1
+            if getattr(response, "status_code", 0) == 200:
+                self._responses[key] = response
+            return response
+
+
+def _search_key(topic: WatchedTopic) -> Tuple[FrozenSet[str], Tuple[str, ...]]:
+    """Topics with the same normalized words and sources run the same search"""
+    return frozenset(topic.key.split()), tuple(topic.sources or ())
+
+
+def coalesce(due: List[WatchedTopic], watched: Optional[List[WatchedTopic]] = None) -> List[List[WatchedTopic]]:
+    """
+    Group due topics that run the same search, keeping priority order.
+
+    Topics with the same set of normalized words and the same sources are
+    one refresh; topics that merely look alike ("large language models for
+    code" and "... for math") are not. Watched topics that are not due yet
+    join a group they match. Groups are ordered by their highest priority,
+    then by how long they are overdue.
+    """
+    groups: Dict[Tuple[FrozenSet[str], Tuple[str, ...]], List[WatchedTopic]] = {}
+    for topic in due:
+        groups.setdefault(_search_key(topic), []).append(topic)
+    members = {t.key for g in groups.values() for t in g}
+    for topic in watched or []:
+        group = groups.get(_search_key(topic))
+        if group is not None and topic.key not in members:
+            group.append(topic)
+            members.add(topic.key)
+    return sorted(groups.values(), key=lambda g: (-max(t.priority for t in g), min(t.next_run for t in g)))
+
+
+class RefreshScheduler:
+    """
+    Runs due watchlist refreshes under global LLM and HTTP rate limits.
+
+    Args:
+        watchlist: Topics and their schedules
+        history: RunHistory the refreshed runs are read from and saved to
+        llm_per_minute: LLM requests per minute across all refreshes
+        http_per_minute: Search requests per minute across all refreshes
+        workers: Refreshes run concurrently
+        max_per_cycle: Refreshes started per cycle (None for all due); the
+            rest stay due and go first next cycle
+        backend: LLM backend to share (default: the one selected by LLM_BACKEND)
+        http_session: Underlying HTTP session (default: HTTP_CASSETTE or requests)
+        agent_factory: Builds the agent for a topic from (topic, llm, session);
+            defaults to an incremental ResearchAgent
+    """
+
+    def __init__(self, watchlist: Watchlist, history: Any, llm_per_minute: float = 30,
+                 http_per_minute: float = 60, workers: int = 2, max_per_cycle: Optional[int] = None,
+                 backend: Optional[LLMBackend] = None, http_session: Optional[Any] = None,
+                 agent_factory: Optional[Callable[[WatchedTopic, Any, Any], Any]] = None):
+        self.watchlist = watchlist
+        self.history = history
+        self.workers = max(1, workers)
+        self.max_per_cycle = max_per_cycle
+        self.llm_limiter = RateLimiter(llm_per_minute)
+        self.http_limiter = RateLimiter(http_per_minute, burst=3)
+        self._backend = backend
+        self._http_session = http_session
+        self.agent_factory = agent_factory or self._default_agent
+
+    @property
+    def backend(self) -> LLMBackend:
+        """Shared rate-limited backend, created on first use"""
+        if not isinstance(self._backend, RateLimitedBackend):
+            self._backend = RateLimitedBackend(self._backend or create_backend(), self.llm_limiter)
+        return self._backend
+
+    @property
+    def http_session(self) -> Any:
+        if self._http_session is None:
+            from .cassette import session_from_env  # Loads requests; deferred to keep imports fast
+            self._http_session = session_from_env()
+            if self._http_session is None:
+                import requests
+                self._http_session = requests.Session()
+        return self._http_session
+
+    @staticmethod
+    def _default_agent(topic: WatchedTopic, llm: Any, session: Any) -> Any:
+        from .research import ResearchAgent
+        return ResearchAgent(use_multi_platform=bool(topic.sources),
+                             enabled_sources=set(topic.sources) if topic.sources else None,
+                             validation_batch_size=3, llm=llm, http_session=session)
+
+    def _refresh(self, group: List[WatchedTopic], session: RateLimitedSession) -> Optional[Any]:
+        from .llm import LLM
+        lead = max(group, key=lambda t: (t.priority, t.num_papers))
+        num_papers = max(t.num_papers for t in group)
+        shared = f" (shared with {', '.join(t.topic for t in group if t is not lead)})" if len(group) > 1 else ""
+        print(f"🔁 Refreshing '{lead.topic}'{shared}...")
+        try:
+            agent = self.agent_factory(lead, LLM(backend=self.backend), session)
+            result = agent.refresh_topic(lead.topic, num_papers, history=self.history)
+        except Exception as e:
+            print(f"❌ Refresh of '{lead.topic}' failed: {e}")
+            now = time.time()
+            for topic in group:
+                if topic.next_run <= now:  # Topics pulled in early keep their schedule
+                    self.watchlist.mark_failed(topic.topic, now)
+            return None
+        self.watchlist.mark_run(lead.topic, result.run_id)
+        for topic in group:
+            if topic is not lead:
+                run_id = self._save_as(result, topic)
+                if run_id:
+                    self.watchlist.mark_run(topic.topic, run_id)
+        print(f"✅ '{lead.topic}': {len(result.papers)} papers, {len(result.insights)} insights")
+        return result
+
+    def _save_as(self, result: Any, topic: WatchedTopic) -> Optional[str]:
+        """
+        Store a coalesced refresh under another topic of its group.
+
+        The topic's own history (and its next incremental refresh) then
+        continues from this run. Returns the stored run id, or None when
+        nothing was stored, in which case the topic stays due.
+        """
+        if self.history is None or not result.papers:
+            return None
+        from .run_result import RunResult
+        copy = RunResult.from_dict({**result.to_dict(), "run_id": uuid.uuid4().hex, "topic": topic.topic})
+        return self.history.save(copy, model=f"{self.backend.name}:{getattr(self.backend, 'model_name', '')}",
+                                 sources=topic.sources)
+
+    def run_once(self, now: Optional[float] = None) -> List[Any]:
+        """
+        Refresh every due topic (up to max_per_cycle groups).
+
+        Returns:
+            RunResults of the successful refreshes, in priority order
+        """
+        groups = coalesce(self.watchlist.due(now), self.watchlist.topics())
+        if self.max_per_cycle is not None:
+            groups = groups[:self.max_per_cycle]
+        if not groups:
+            return []
+        session = RateLimitedSession(self.http_session, self.http_limiter)
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            # Submitted in priority order, so higher-priority refreshes start first
+            results = list(pool.map(lambda group: self._refresh(group, session), groups))
+        if session.coalesced:
+            print(f"🔗 {session.coalesced} duplicate search request(s) coalesced ({session.requests} sent)")
+        return [r for r in results if r is not None]
+
+    def run_forever(self, poll_seconds: float = 60, stop: Optional[threading.Event] = None) -> None:
+        """Run cycles until stop is set, sleeping until the next refresh is due (at most poll_seconds)"""
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            self.run_once()
+            next_due = self.watchlist.next_due()
+            wait = poll_seconds if next_due is None else min(poll_seconds, max(1.0, next_due - time.time()))
+            stop.wait(wait)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Topic watchlist and background refresh scheduler")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="Watch a topic (or update its settings)")
+    add.add_argument("topic")
+    add.add_argument("--every", type=float, default=24.0, help="Refresh interval in hours")
+    add.add_argument("--papers", type=int, default=20, help="Papers to search for")
+    add.add_argument("--priority", type=int, default=0, help="Higher refreshes first")
+    add.add_argument("--sources", nargs="*", help="Multi-platform sources (default: arXiv only)")
+
+    remove = commands.add_parser("remove", help="Stop watching a topic")
+    remove.add_argument("topic")
+
+    commands.add_parser("list", help="Show watched topics and their schedule")
+
+    run = commands.add_parser("run", help="Refresh due topics")
+    run.add_argument("--once", action="store_true", help="Run one cycle and exit")
+    run.add_argument("--poll", type=float, default=60, help="Maximum seconds between cycles")
+    run.add_argument("--workers", type=int, default=2, help="Concurrent refreshes")
+    run.add_argument("--max-per-cycle", type=int, help="Refreshes started per cycle")
+    run.add_argument("--llm-per-minute", type=float, default=30, help="LLM request limit (0: unlimited)")
+    run.add_argument("--http-per-minute", type=float, default=60, help="Search request limit (0: unlimited)")
+    args = parser.parse_args(argv)
+
+    watchlist = watchlist_from_env()
+    if watchlist is None:
+        print("❌ Watchlist is disabled (WATCHLIST=off)")
+        return 1
+
+    if args.command == "add":
+        entry = watchlist.add(args.topic, args.every, args.papers, args.priority, args.sources)
+        if entry is None:
+            print("❌ Topic is empty")
+            return 1
+        print(f"👁️  Watching '{entry.topic}' every {entry.interval_hours:g}h, "
+              f"next refresh {time.strftime('%Y-%m-%d %H:%M', time.localtime(entry.next_run))}")
+        return 0
+    if args.command == "remove":
+        removed = watchlist.remove(args.topic)
+        print(f"🗑️  Stopped watching '{args.topic}'" if removed else f"⚠️  '{args.topic}' is not watched")
+        return 0 if removed else 1
+    if args.command == "list":
+        topics = watchlist.topics()
+        if not topics:
+            print("No watched topics")
+        for t in topics:
+            last = time.strftime("%Y-%m-%d %H:%M", time.localtime(t.last_run)) if t.last_run else "never"
+            print(f"{t.topic:40s} every {t.interval_hours:5g}h  priority {t.priority:2d}  {t.num_papers:3d} papers  "
+                  f"next {time.strftime('%Y-%m-%d %H:%M', time.localtime(t.next_run))}  last {last}")
+        return 0
+
+    from .history import history_from_env
+    history = history_from_env()
+    if history is None:
+        print("⚠️  Run history is disabled (RUN_HISTORY=off): refreshes will not be stored for the app")
+    scheduler = RefreshScheduler(watchlist, history, llm_per_minute=args.llm_per_minute,
+                                 http_per_minute=args.http_per_minute, workers=args.workers,
+                                 max_per_cycle=args.max_per_cycle)
+    if args.once:
+        scheduler.run_once()
+        return 0
+    print(f"⏰ Scheduler started: {len(watchlist.topics())} watched topic(s)")
+    try:
+        scheduler.run_forever(args.poll)
+    except KeyboardInterrupt:
+        print("\n👋 Scheduler stopped")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
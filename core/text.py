@@ -0,0 +1,58 @@
+"""
+Small text utilities shared by the local (LLM-free) analysis modules.
+
+Topic normalization and word-level similarity for matching topics that
+name the same field.
+"""
+import re
+from functools import lru_cache
+from typing import Tuple
+
+# Words that do not change which field a topic names
+TOPIC_STOPWORDS = frozenset({
+    "a", "an", "the", "of", "for", "in", "on", "to", "with", "from", "and", "by", "via", "using", "based",
+})
+# Generic heads: "transformer models" is the same field as "transformers"
+GENERIC_HEADS = frozenset({"model", "method", "approach", "technique", "system", "algorithm", "framework"})
+
+
+@lru_cache(maxsize=65536)
+def singularize(word: str) -> str:
+    """Crude English plural stripping, enough to match "transformers" with "transformer" """
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 4 and word.endswith("sses"):
+        return word[:-2]
+    if len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+def normalize_topic(topic: str) -> str:
+    """Lowercase, drop punctuation and plurals, collapse whitespace"""
+    words = re.findall(r"[a-z0-9]+", topic.lower())
+    return " ".join(singularize(w) for w in words)
+
+
+def topic_words(topic: str) -> Tuple[str, ...]:
+    """Content words of a normalized topic, in order, without stopwords and generic heads"""
+    words = [w for w in normalize_topic(topic).split() if w not in TOPIC_STOPWORDS]
+    content = [w for w in words if w not in GENERIC_HEADS]
+    return tuple(content or words)
+
+
+def topic_similarity(a: str, b: str) -> float:
+    """
+    Jaccard similarity of two topics' content words, or 0 when their head words differ.
+
+    The head is the last content word. Reference pairs: "transformers" /
+    "transformer models" 1.0; "reinforcement learning from human feedback" /
+    "... with human feedback" 1.0; "deep reinforcement learning" /
+    "reinforcement learning" 0.67; "large language models for code" / "... for
+    math" and "large language models" / "... for code" 0.0 (different heads).
+    """
+    words_a, words_b = topic_words(a), topic_words(b)
+    if not words_a or not words_b or words_a[-1] != words_b[-1]:
+        return 0.0
+    set_a, set_b = set(words_a), set(words_b)
+    return len(set_a & set_b) / len(set_a | set_b)
@@ -0,0 +1,112 @@
+"""
+Multi-pattern title matching.
+
+An Aho-Corasick automaton over lowercased paper titles finds every title
+occurring in a text in a single pass over the text, however many papers
+there are. Used to link insights to the papers (and authors) they cite.
+"""
+from collections import deque
+from functools import lru_cache
+from typing import Any, Dict, List, Sequence, Set, Tuple
+
+
+class TitleMatcher:
+    """
+    Aho-Corasick automaton over a fixed set of patterns (case-insensitive).
+
+    Args:
+        patterns: Strings to find; empty patterns never match
+    """
+
+    def __init__(self, patterns: Sequence[str]):
+        self.patterns = list(patterns)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        for index, pattern in enumerate(self.patterns):
+            pattern = pattern.lower()
+            if not pattern:
+                continue
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = next_state
+            self._out[state].append(index)
+
+        # Failure links in breadth-first order; outputs inherit the fallback state's
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._out[next_state] = self._out[next_state] + self._out[self._fail[next_state]]
+
+    def find(self, text: str) -> Set[int]:
+        """Indices of the patterns occurring anywhere in text"""
+        found: Set[int] = set()
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for char in text.lower():
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+
+@lru_cache(maxsize=16)
+def matcher_for(titles: Tuple[str, ...]) -> TitleMatcher:
+    """Automaton for a paper set, built once and reused across reruns"""
+    return TitleMatcher(titles)
+
+
+def _field(item: Any, name: str, default: Any) -> Any:
+    return item.get(name, default) if isinstance(item, dict) else getattr(item, name, default)
+
+
+def link_authors_to_insights(papers: Sequence[Any], insights: Sequence[Dict[str, Any]],
+                             fields: Tuple[str, ...] = ("gap", "observation", "validation_evidence")
+                             ) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Authors of papers whose title appears in an insight's text.
+
+    Args:
+        papers: Paper dataclasses or dicts
+        insights: Insight dicts
+        fields: Insight fields searched for titles
+
+    Returns:
+        Author name -> insights citing one of their papers, in insight order
+    """
+    if not papers or not insights:
+        return {}
+    titles = tuple(_field(p, "title", "") or "" for p in papers)
+    matcher = matcher_for(titles)
+    paper_authors = [[a for a in (_field(p, "authors", []) or []) if a and a.strip()] for p in papers]
+    # Authors are reported in first-seen order across the papers
+    author_rank: Dict[str, int] = {}
+    for authors in paper_authors:
+        for author in authors:
+            author_rank.setdefault(author, len(author_rank))
+
+    author_insights: Dict[str, List[Dict[str, Any]]] = {}
+    for insight in insights:
+        text = " ".join(str(insight.get(name, "") or "") for name in fields)
+        linked = set()
+        for paper_index in sorted(matcher.find(text)):
+            linked.update(paper_authors[paper_index])
+        for author in sorted(linked, key=author_rank.__getitem__):
+            author_insights.setdefault(author, []).append(insight)
+    return author_insights
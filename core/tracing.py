@@ -0,0 +1,236 @@
+"""
+Lightweight tracing for the research pipeline.
+
+Spans are nested timing records with attributes. The current span is held
+in a context variable, so nesting follows the call stack; work handed to
+thread pools keeps its parent when submitted through propagate(). Finished
+spans can be exported as JSONL or as OpenTelemetry OTLP/JSON.
+
+Set TRACE_JSONL to append every finished run to a JSONL file, and
+OTEL_EXPORTER_OTLP_ENDPOINT to post runs to an OTLP/HTTP collector.
+"""
+import contextvars
+import functools
+import json
+import os
+import secrets
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Optional, Any, List, Dict, Callable, Iterator
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar("current_span", default=None)
+
+
+@dataclass
+class Span:
+    """A timed operation within a trace"""
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str] = None
+    start: float = field(default_factory=time.time)
+    end: Optional[float] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    status: str = "ok"
+    error: str = ""
+    thread: str = field(default_factory=lambda: threading.current_thread().name)
+
+    @property
+    def duration(self) -> float:
+        return ((self.end or time.time()) - self.start)
+
+    def set(self, **attributes: Any) -> None:
+        """Add or update span attributes"""
+        self.attributes.update(attributes)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Span":
+        """Rebuild a span from to_dict() output (e.g. a trace kept in session state)"""
+        return cls(**{k: data[k] for k in cls.__dataclass_fields__ if k in data})
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": self.start,
+            "end": self.end,
+            "duration": round(self.duration, 6),
+            "attributes": self.attributes,
+            "status": self.status,
+            "error": self.error,
+            "thread": self.thread,
+        }
+
+
+class Tracer:
+    """
+    Collects finished spans.
+
+    Args:
+        max_spans: Finished spans kept in memory (oldest are dropped)
+    """
+
+    def __init__(self, max_spans: int = 20000):
+        self._lock = threading.Lock()
+        self._finished = deque(maxlen=max_spans)
+
+    def start_span(self, name: str, parent: Optional[Span] = None, **attributes: Any) -> Span:
+        """Create a span under parent (or the current span) without activating it"""
+        parent = parent or _current_span.get()
+        return Span(
+            name=name,
+            trace_id=parent.trace_id if parent else secrets.token_hex(16),
+            span_id=secrets.token_hex(8),
+            parent_id=parent.span_id if parent else None,
+            attributes=dict(attributes),
+        )
+
+    def finish(self, span: Span, error: Optional[BaseException] = None) -> None:
+        """Close a span and record it"""
+        span.end = time.time()
+        if error is not None:
+            span.status = "error"
+            span.error = f"{type(error).__name__}: {error}"
+        with self._lock:
+            self._finished.append(span)
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span]:
+        """Run a block inside a new span that becomes the current span"""
+        span = self.start_span(name, **attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            self.finish(span, e)
+            raise
+        else:
+            self.finish(span)
+        finally:
+            _current_span.reset(token)
+
+    def spans(self, trace_id: Optional[str] = None) -> List[Span]:
+        """Finished spans, optionally for one trace, in start order"""
+        with self._lock:
+            spans = [s for s in self._finished if trace_id is None or s.trace_id == trace_id]
+        return sorted(spans, key=lambda s: s.start)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._finished.clear()
+
+
+tracer = Tracer()
+
+
+def span(name: str, **attributes: Any):
+    """Context manager for a span on the default tracer"""
+    return tracer.span(name, **attributes)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """
+    Decorator running a function inside a span.
+
+    The span is named name or Class.method; list results set a
+    "results" attribute with their length.
+    """
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with tracer.span(span_name) as s:
+                result = func(*args, **kwargs)
+                if isinstance(result, list):
+                    s.set(results=len(result))
+                return result
+        return wrapper
+    return decorator
+
+
+def propagate(func: Callable) -> Callable:
+    """Bind func to a copy of the current context so spans in worker threads keep their parent"""
+    context = contextvars.copy_context()
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return context.run(func, *args, **kwargs)
+    return wrapper
+
+
+def export_jsonl(spans: List[Span], path: str) -> None:
+    """Append spans to a JSONL file, one span per line"""
+    with open(path, "a", encoding="utf-8") as f:
+        for s in spans:
+            f.write(json.dumps(s.to_dict(), default=str) + "\n")
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp(spans: List[Span], service_name: str = "airesearcher") -> Dict[str, Any]:
+    """Convert spans to an OTLP/JSON ExportTraceServiceRequest"""
+    otlp_spans = []
+    for s in spans:
+        item = {
+            "traceId": s.trace_id,
+            "spanId": s.span_id,
+            "name": s.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(int(s.start * 1e9)),
+            "endTimeUnixNano": str(int((s.end or s.start) * 1e9)),
+            "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in s.attributes.items()],
+            "status": {"code": 2, "message": s.error} if s.status == "error" else {"code": 1},
+        }
+        if s.parent_id:
+            item["parentSpanId"] = s.parent_id
+        otlp_spans.append(item)
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": service_name}}]},
+            "scopeSpans": [{"scope": {"name": "airesearcher.tracing"}, "spans": otlp_spans}],
+        }]
+    }
+
+
+def export_otlp_http(spans: List[Span], endpoint: str, timeout: float = 5) -> bool:
+    """POST spans to an OTLP/HTTP collector (e.g. http://localhost:4318)"""
+    import requests
+    url = endpoint.rstrip("/")
+    if not url.endswith("/v1/traces"):
+        url += "/v1/traces"
+    try:
+        response = requests.post(url, json=to_otlp(spans), timeout=timeout)
+        return response.status_code < 300
+    except Exception as e:
+        print(f"⚠️  Trace export failed: {e}")
+        return False
+
+
+def export_from_env(spans: List[Span]) -> None:
+    """Export a finished run to the destinations configured in the environment"""
+    if not spans:
+        return
+    jsonl_path = os.getenv("TRACE_JSONL")
+    if jsonl_path:
+        export_jsonl(spans, jsonl_path)
+    endpoint = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT")
+    if endpoint:
+        export_otlp_http(spans, endpoint)
@@ -0,0 +1,194 @@
+"""
+Local temporal trend detection.
+
+Builds a term-by-year document count matrix over every paper with NumPy and
+scores each term for growth (share of recent vs. older papers mentioning
+it, plus the least-squares slope of its yearly share) and for bursts, using
+Kleinberg's two-state batched burst model solved for all terms at once.
+"""
+import math
+from typing import List, Dict, Any, Tuple
+import numpy as np
+from .arxiv import Paper
+from .keyphrases import candidate_phrases
+
+
+def term_year_matrix(papers: List[Paper], max_words: int = 2,
+                     min_docs: int = 2) -> Tuple[List[str], np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Document counts of each term per year.
+
+    Returns:
+        (terms, years, counts[term, year], papers per year)
+    """
+    dated = [p for p in papers if p.year]
+    years = np.array(sorted({p.year for p in dated}), dtype=np.int64)
+    if len(years) == 0:
+        return [], years, np.zeros((0, 0), dtype=np.int64), np.zeros(0, dtype=np.int64)
+    year_index = {int(y): i for i, y in enumerate(years)}
+
+    vocabulary: Dict[str, int] = {}
+    term_ids: List[int] = []
+    year_ids: List[int] = []
+    for paper in dated:
+        column = year_index[paper.year]
+        for phrase in set(candidate_phrases(f"{paper.title}. {paper.abstract}", max_words)):
+            term_ids.append(vocabulary.setdefault(phrase, len(vocabulary)))
+            year_ids.append(column)
+
+    counts = np.zeros((len(vocabulary), len(years)), dtype=np.int64)
+    np.add.at(counts, (np.array(term_ids, dtype=np.int64), np.array(year_ids, dtype=np.int64)), 1)
+    docs_per_year = np.bincount([year_index[p.year] for p in dated], minlength=len(years))
+
+    keep = counts.sum(axis=1) >= min_docs
+    terms = [term for term, i in sorted(vocabulary.items(), key=lambda item: item[1]) if keep[i]]
+    return terms, years, counts[keep], docs_per_year
+
+
+def burst_states(counts: np.ndarray, docs_per_year: np.ndarray, s: float = 2.0,
+                 gamma: float = 1.0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Kleinberg two-state burst detection for every term at once.
+
+    Each year's document count for a term is modelled as binomial with the
+    term's base rate (state 0) or s times that rate (state 1); entering the
+    burst state costs gamma * ln(years). The Viterbi path is found for all
+    terms in one pass over the years.
+
+    Returns:
+        (bursting[term, year] booleans, burst weight per term)
+    """
+    n_terms, n_years = counts.shape
+    if n_terms == 0 or n_years == 0:
+        return np.zeros(counts.shape, dtype=bool), np.zeros(n_terms)
+
+    d = np.maximum(docs_per_year, 1).astype(float)
+    p0 = np.clip(counts.sum(axis=1) / d.sum(), 1e-6, 0.5)[:, None]
+    p1 = np.minimum(p0 * s, 0.9999)
+    r = counts.astype(float)
+    cost0 = -(r * np.log(p0) + (d - r) * np.log1p(-p0))
+    cost1 = -(r * np.log(p1) + (d - r) * np.log1p(-p1))
+    tau = gamma * math.log(max(n_years, 2))
+
+    total0 = cost0[:, 0].copy()
+    total1 = tau + cost1[:, 0]
+    from_burst0 = np.zeros((n_terms, n_years), dtype=bool)  # state-0 path came from state 1
+    from_burst1 = np.zeros((n_terms, n_years), dtype=bool)  # state-1 path came from state 1
+    for t in range(1, n_years):
+        stay0, leave1 = total0, total1
+        enter1, stay1 = total0 + tau, total1
+        from_burst0[:, t] = leave1 < stay0
+        from_burst1[:, t] = stay1 <= enter1
+        total0 = np.minimum(stay0, leave1) + cost0[:, t]
+        total1 = np.minimum(enter1, stay1) + cost1[:, t]
+
+    bursting = np.zeros((n_terms, n_years), dtype=bool)
+    state = total1 < total0
+    for t in range(n_years - 1, -1, -1):
+        bursting[:, t] = state
+        state = np.where(state, from_burst1[:, t], from_burst0[:, t])
+
+    weight = np.where(bursting, cost0 - cost1, 0.0).sum(axis=1)
+    return bursting, weight
+
+
+def detect_trends(papers: List[Paper], recent_years: int = 2, top_k: int = 10,
+                  min_docs: int = 3, min_growth: float = 0.5) -> Dict[str, Any]:
+    """
+    Emerging, declining and bursting terms with their statistics.
+
+    Args:
+        papers: Papers with publication years
+        recent_years: Years (counted back from the latest) that form the recent window
+        top_k: Terms returned per list
+        min_docs: Minimum papers mentioning a term
+        min_growth: Minimum |log2 share ratio| for an emerging or declining term
+
+    Returns:
+        Dict with "emerging", "declining" and "bursts" (lists of term
+        statistics), "year_distribution" and "papers"
+    """
+    terms, years, counts, docs_per_year = term_year_matrix(papers, min_docs=min_docs)
+    result: Dict[str, Any] = {
+        "emerging": [], "declining": [], "bursts": [],
+        "year_distribution": {int(y): int(n) for y, n in zip(years, docs_per_year)},
+        "papers": int(docs_per_year.sum()),
+    }
+    if not terms or len(years) < 2:
+        return result
+
+    recent = years > years.max() - recent_years
+    recent_docs = max(int(docs_per_year[recent].sum()), 1)
+    older_docs = max(int(docs_per_year[~recent].sum()), 1)
+    recent_count = counts[:, recent].sum(axis=1)
+    older_count = counts[:, ~recent].sum(axis=1)
+    # Additive smoothing keeps unseen-in-one-window terms finite
+    recent_share = (recent_count + 0.5) / (recent_docs + 1)
+    older_share = (older_count + 0.5) / (older_docs + 1)
+    growth = np.log2(recent_share / older_share)
+
+    share = counts / np.maximum(docs_per_year, 1)
+    x = (years - years.mean()).astype(float)
+    slope = share @ x / max(float(x @ x), 1e-9)
+
+    bursting, burst_weight = burst_states(counts, docs_per_year)
+
+    def stats(i: int) -> Dict[str, Any]:
+        burst_years = years[bursting[i]]
+        return {
+            "term": terms[i],
+            "papers": int(counts[i].sum()),
+            "recent_share": round(float(recent_share[i]), 4),
+            "older_share": round(float(older_share[i]), 4),
+            "growth": round(float(growth[i]), 3),
+            "slope": round(float(slope[i]), 5),
+            "burst_score": round(float(burst_weight[i]), 3),
+            "burst_years": [int(burst_years.min()), int(burst_years.max())] if len(burst_years) else [],
+        }
+
+    def select(order: np.ndarray, keep: np.ndarray) -> List[Dict[str, Any]]:
+        # Skip terms overlapping an already chosen one ("recurrent" vs "recurrent network")
+        chosen: List[int] = []
+        for i in order:
+            if not keep[i]:
+                continue
+            words = set(terms[i].split())
+            if any(words <= set(terms[j].split()) or set(terms[j].split()) <= words for j in chosen):
+                continue
+            chosen.append(i)
+            if len(chosen) == top_k:
+                break
+        return [stats(i) for i in chosen]
+
+    # Weight growth by evidence so a term seen twice cannot top the list
+    score = growth * np.log1p(counts.sum(axis=1))
+    result["emerging"] = select(np.argsort(-score), growth >= min_growth)
+    result["declining"] = select(np.argsort(score), (growth <= -min_growth) & (older_count >= min_docs))
+    result["bursts"] = select(np.argsort(-burst_weight), burst_weight > 0)
+    return result
+
+
+def summarize_trends(trends: Dict[str, Any], limit: int = 5) -> Dict[str, Any]:
+    """Trend data in the shape of ResearchIntelligence.analyze_temporal_trends"""
+    def describe(item: Dict[str, Any]) -> str:
+        return f"{item['term']} ({item['recent_share']:.0%} of recent papers vs {item['older_share']:.0%} before)"
+
+    emerging = trends["emerging"][:limit]
+    declining = trends["declining"][:limit]
+    latest = max(trends["year_distribution"]) if trends["year_distribution"] else None
+    active_bursts = [b["term"] for b in trends["bursts"] if b["burst_years"] and b["burst_years"][1] == latest]
+
+    if emerging or declining:
+        rising = ", ".join(item["term"] for item in emerging[:3]) or "no clear risers"
+        falling = ", ".join(item["term"] for item in declining[:3]) or "no clear decliners"
+        evolution = f"Rising: {rising}. Declining: {falling}."
+    else:
+        evolution = "Cannot determine evolution with available data"
+    return {
+        "trends": [describe(item) for item in emerging] or ["Insufficient data for trend analysis"],
+        "recent_focus": active_bursts[:limit],
+        "declining": [describe(item) for item in declining],
+        "evolution": evolution,
+        "year_distribution": trends["year_distribution"],
+        "term_trends": trends,
+    }
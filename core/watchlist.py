@@ -0,0 +1,221 @@
+"""
+Watchlist of topics refreshed on a schedule.
+
+Each watched topic has a refresh interval, a paper count and a priority.
+Topics are keyed by their normalized form, so "Transformer Models" and
+"transformer model" are one entry. The watchlist is a JSON file shared by
+the UI (which adds topics) and the scheduler process (which refreshes them,
+see core.scheduler); every change re-reads and rewrites the file under an
+exclusive lock on a sibling .lock file, so neither side overwrites the
+other's updates.
+
+Load is spread over time: a new topic's first refresh gets a stable offset
+within the spread window, and each later refresh is shifted by a small
+stable jitter, so topics added together do not stay in lockstep.
+
+WATCHLIST sets the file path ("off" disables it).
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, fields
+from typing import Dict, List, Optional
+from .text import normalize_topic
+
+try:
+    import fcntl
+    FILE_LOCK_AVAILABLE = True
+except ImportError:  # Windows: only threads of one process are serialized
+    FILE_LOCK_AVAILABLE = False
+
+DEFAULT_WATCHLIST_PATH = os.path.join(os.path.expanduser("~"), ".cache", "airesearcher", "watchlist.json")
+
+
+def _phase(key: str) -> float:
+    """Stable value in [0, 1) for a topic key"""
+    return int(hashlib.sha1(key.encode("utf-8")).hexdigest()[:8], 16) / 16 ** 8
+
+
+@dataclass
+class WatchedTopic:
+    """A topic on the watchlist and its schedule (times are epoch seconds)"""
+    topic: str
+    interval_hours: float = 24.0
+    num_papers: int = 20
+    priority: int = 0  # Higher runs first
+    sources: Optional[List[str]] = None  # Multi-platform sources; None searches arXiv only
+    next_run: float = 0.0
+    last_run: Optional[float] = None
+    last_run_id: Optional[str] = None
+    failures: int = 0
+
+    @property
+    def key(self) -> str:
+        return normalize_topic(self.topic)
+
+    @property
+    def interval_seconds(self) -> float:
+        return max(60.0, self.interval_hours * 3600)
+
+    def overdue(self, now: float) -> float:
+        """Seconds past next_run (negative when not yet due)"""
+        return now - self.next_run
+
+
+class Watchlist:
+    """
+    Watched topics backed by a JSON file.
+
+    Args:
+        path: Watchlist file
+        spread_seconds: Window over which first refreshes of new topics are spread
+        jitter: Fraction of the interval by which later refreshes are shifted
+        retry_seconds: Delay before retrying a failed refresh (doubles per failure,
+            capped at the topic's interval)
+    """
+
+    def __init__(self, path: str = DEFAULT_WATCHLIST_PATH, spread_seconds: float = 3600,
+                 jitter: float = 0.05, retry_seconds: float = 900):
+        self.path = path
+        self.spread_seconds = spread_seconds
+        self.jitter = jitter
+        self.retry_seconds = retry_seconds
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _locked(self):
+        """Hold the watchlist lock across threads and processes (UI sessions and the scheduler)"""
+        with self._lock:
+            lock_file = None
+            if FILE_LOCK_AVAILABLE:
+                try:
+                    os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                    lock_file = open(f"{self.path}.lock", "a")
+                except OSError as e:
+                    print(f"⚠️  Could not lock watchlist: {e}")
+            if lock_file is None:
+                yield
+                return
+            with lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read(self) -> Dict[str, WatchedTopic]:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                entries = json.load(f).get("topics", {})
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Could not read watchlist {self.path}: {e}")
+            return {}
+        known = {f.name for f in fields(WatchedTopic)}
+        return {key: WatchedTopic(**{k: v for k, v in entry.items() if k in known}) for key, entry in entries.items()}
+
+    def _write(self, topics: Dict[str, WatchedTopic]) -> None:
+        """Write the watchlist atomically (callers hold the lock)"""
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"topics": {key: asdict(t) for key, t in topics.items()}}, f, indent=1)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"⚠️  Could not save watchlist: {e}")
+
+    def topics(self) -> List[WatchedTopic]:
+        """All watched topics, soonest due first"""
+        with self._locked():
+            return sorted(self._read().values(), key=lambda t: t.next_run)
+
+    def get(self, topic: str) -> Optional[WatchedTopic]:
+        with self._locked():
+            return self._read().get(normalize_topic(topic))
+
+    def add(self, topic: str, interval_hours: float = 24.0, num_papers: int = 20, priority: int = 0,
+            sources: Optional[List[str]] = None, now: Optional[float] = None) -> Optional[WatchedTopic]:
+        """
+        Watch a topic, or update the settings of a watched one.
+
+        A new topic is first refreshed at a stable offset within
+        spread_seconds (or its interval, if shorter); an existing one keeps
+        its schedule.
+
+        Returns:
+            The watched topic, or None if the topic is empty
+        """
+        key = normalize_topic(topic)
+        if not key:
+            return None
+        now = time.time() if now is None else now
+        with self._locked():
+            topics = self._read()
+            entry = topics.get(key)
+            if entry is None:
+                entry = WatchedTopic(topic.strip(), interval_hours, num_papers, priority,
+                                     sorted(sources) if sources else None)
+                entry.next_run = now + _phase(key) * min(self.spread_seconds, entry.interval_seconds)
+            else:
+                entry.interval_hours, entry.num_papers, entry.priority = interval_hours, num_papers, priority
+                entry.sources = sorted(sources) if sources else None
+            topics[key] = entry
+            self._write(topics)
+            return entry
+
+    def remove(self, topic: str) -> bool:
+        with self._locked():
+            topics = self._read()
+            if topics.pop(normalize_topic(topic), None) is None:
+                return False
+            self._write(topics)
+            return True
+
+    def due(self, now: Optional[float] = None) -> List[WatchedTopic]:
+        """Topics whose refresh is due: highest priority first, then most overdue"""
+        now = time.time() if now is None else now
+        return sorted((t for t in self.topics() if t.next_run <= now), key=lambda t: (-t.priority, t.next_run))
+
+    def next_due(self) -> Optional[float]:
+        """Time of the earliest scheduled refresh, if any"""
+        topics = self.topics()
+        return topics[0].next_run if topics else None
+
+    def mark_run(self, topic: str, run_id: Optional[str] = None, when: Optional[float] = None) -> None:
+        """Record a successful refresh and schedule the next one an interval (± jitter) later"""
+        when = time.time() if when is None else when
+        key = normalize_topic(topic)
+        with self._locked():
+            topics = self._read()
+            entry = topics.get(key)
+            if entry is None:  # Removed while refreshing
+                return
+            shift = (2 * _phase(f"{key}:{when:.0f}") - 1) * self.jitter
+            entry.last_run, entry.last_run_id, entry.failures = when, run_id or entry.last_run_id, 0
+            entry.next_run = when + entry.interval_seconds * (1 + shift)
+            self._write(topics)
+
+    def mark_failed(self, topic: str, when: Optional[float] = None) -> None:
+        """Record a failed refresh and retry with exponential backoff"""
+        when = time.time() if when is None else when
+        with self._locked():
+            topics = self._read()
+            entry = topics.get(normalize_topic(topic))
+            if entry is None:
+                return
+            entry.failures += 1
+            entry.next_run = when + min(entry.interval_seconds, self.retry_seconds * 2 ** (entry.failures - 1))
+            self._write(topics)
+
+
+def watchlist_from_env() -> Optional[Watchlist]:
+    """Watchlist configured by WATCHLIST (None when disabled)"""
+    path = os.getenv("WATCHLIST", DEFAULT_WATCHLIST_PATH)
+    if not path or path.lower() == "off":
+        return None
+    return Watchlist(path)
@@ -5,8 +5,26 @@ Provides an interactive demonstration of the multi-agent pipeline
 for generating research insights from academic papers.
 """
 from core.research import ResearchAgent
+from core.history import RunHistory, history_from_env
+from core.run_result import RunResult
+from typing import Optional
 import json
 
+
+def choose_past_run(history: Optional[RunHistory]) -> Optional[RunResult]:
+    """Offer stored runs; returns the chosen one, or None for a new run"""
+    past_runs = history.list_runs(limit=10) if history is not None else []
+    if not past_runs:
+        return None
+    print("🕘 Past runs:")
+    for i, summary in enumerate(past_runs, 1):
+        print(f"  {i}. {summary.label}")
+    choice = input("\nReload a past run (number) or press Enter for a new run: ").strip()
+    if not choice.isdigit() or not 1 <= int(choice) <= len(past_runs):
+        return None
+    return history.load(past_runs[int(choice) - 1].run_id)
+
+
 def main():
     print("""
 ╔═══════════════════════════════════════════════════════════════════╗
@@ -15,40 +33,52 @@ def main():
 ╚═══════════════════════════════════════════════════════════════════╝
     """)
 
-    # Configuration
-    topic = input("Enter research topic (or press Enter for 'transformer models'): ").strip()
-    if not topic:
-        topic = "transformer models"
-
-    num_papers = input("Number of papers (default 3): ").strip()
-    num_papers = int(num_papers) if num_papers else 3
-
-    print(f"\n{'='*70}")
-    print(f"Topic: {topic}")
-    print(f"Papers: {num_papers}")
-    print(f"{'='*70}\n")
-
-    # Initialize agent
-    agent = ResearchAgent()
-
-    # Search papers
-    print("📚 Step 1: Searching papers...\n")
-    papers = agent.search_papers(topic, num_papers)
-
-    if not papers:
-        print("❌ No papers found. Try a different topic.")
-        return
-
-    print(f"\n✓ Found {len(papers)} papers:")
-    for i, paper in enumerate(papers, 1):
-        print(f"  {i}. {paper.title[:80]}...")
-
-    # Generate insights
-    print(f"\n{'='*70}")
-    print("🤖 Step 2: Running 4-Agent Pipeline...")
-    print(f"{'='*70}\n")
-
-    insights = agent.generate_insights(papers)
+    history = history_from_env()
+    run = choose_past_run(history)
+    if run:
+        # Reloaded from history: no search or LLM calls
+        topic, papers, insights, conversation_log = run.topic, run.papers, run.insights, run.conversation_log
+        print(f"\n✓ Reloaded '{topic}': {len(papers)} papers, {len(insights)} insights")
+    else:
+        # Configuration
+        topic = input("Enter research topic (or press Enter for 'transformer models'): ").strip()
+        if not topic:
+            topic = "transformer models"
+
+        num_papers = input("Number of papers (default 3): ").strip()
+        num_papers = int(num_papers) if num_papers else 3
+
+        print(f"\n{'='*70}")
+        print(f"Topic: {topic}")
+        print(f"Papers: {num_papers}")
+        print(f"{'='*70}\n")
+
+        # Initialize agent
+        agent = ResearchAgent()
+
+        # Search papers
+        print("📚 Step 1: Searching papers...\n")
+        papers = agent.search_papers(topic, num_papers)
+
+        if not papers:
+            print("❌ No papers found. Try a different topic.")
+            return
+
+        print(f"\n✓ Found {len(papers)} papers:")
+        for i, paper in enumerate(papers, 1):
+            print(f"  {i}. {paper.title[:80]}...")
+
+        # Generate insights
+        print(f"\n{'='*70}")
+        print("🤖 Step 2: Running 4-Agent Pipeline...")
+        print(f"{'='*70}\n")
+
+        insights = agent.generate_insights(papers)
+        conversation_log = agent.get_conversation_log()
+        if history is not None:
+            history.save(RunResult(topic, papers, None, insights, conversation_log,
+                                   trace=agent.get_trace(), research_intelligence=agent.get_research_intelligence(),
+                                   usage=agent.get_usage_summary()))
 
     # Display results
     print(f"\n{'='*70}")
@@ -101,7 +131,7 @@ def main():
     print("🔄 Agent Conversation Log")
     print(f"{'='*70}\n")
 
-    for log in agent.get_conversation_log():
+    for log in conversation_log:
         print(f"🤖 {log['agent']}:")
         print(f"   Action:   {log['action']}")
         print(f"   Result:   {log['output_summary']}")
@@ -116,7 +146,7 @@ def main():
                 "topic": topic,
                 "papers": [{"title": p.title, "url": p.url} for p in papers],
                 "insights": insights,
-                "conversation_log": agent.get_conversation_log()
+                "conversation_log": conversation_log
             }, f, indent=2)
         print(f"✓ Saved to {filename}")
 